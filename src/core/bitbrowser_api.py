@@ -7,9 +7,11 @@
 """
 
 import json
+import asyncio
 import time
 import logging
 import requests
+import threading
 from typing import Dict, List, Optional, Tuple
 from functools import wraps
 from selenium import webdriver
@@ -19,6 +21,8 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException
 
+from .cdp_driver import CDPDriver
+
 
 def retry_on_api_error(max_retries=5, delay=1):
     """重试装饰器，处理各种API错误"""
@@ -63,37 +67,97 @@ def retry_on_api_error(max_retries=5, delay=1):
     return decorator
 
 
+def create_api_session(timeout: int = 30, pool_size: int = 1) -> requests.Session:
+    """
+    创建访问比特浏览器本地API的会话（保持连接、绕过代理）
+
+    Args:
+        timeout: 请求超时时间（秒）
+        pool_size: 连接池大小
+
+    Returns:
+        requests会话
+    """
+    session = requests.Session()
+    session.timeout = timeout
+
+    # 绕过代理设置，直接连接本地API
+    session.proxies = {
+        'http': None,
+        'https': None
+    }
+
+    # 设置连接池参数，提高稳定性
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=max(1, pool_size),
+        max_retries=0  # 禁用内置重试，使用我们自己的重试机制
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def build_window_payload(window_name: str, group_id: str = None) -> Dict:
+    """
+    生成创建浏览器窗口的请求参数（窗口名称、不使用代理、固定的浏览器指纹）
+
+    Args:
+        window_name: 窗口名称
+        group_id: 分组ID（可选）
+
+    Returns:
+        /browser/update 接口的请求参数
+    """
+    payload = {
+        "name": window_name,
+        "remark": "Vinted库存管理系统专用窗口",
+        "proxyMethod": 2,  # 不使用代理
+        "proxyType": "noproxy",
+        "browserFingerPrint": {
+            "coreVersion": "112",
+            "ostype": "PC",
+            "os": "Mac",
+            "osVersion": "10.15",
+            "userAgent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/112.0.0.0 Safari/537.36",
+            "resolution": "1920x1080",
+            "language": "zh-CN,zh;q=0.9,en;q=0.8",
+            "timeZone": "Asia/Shanghai",
+            "webRTC": "proxy",
+            "canvas": "noise",
+            "webGL": "noise"
+        }
+    }
+    if group_id:
+        payload["groupId"] = group_id
+    return payload
+
+
 class BitBrowserAPI:
     """比特浏览器API客户端"""
     
-    def __init__(self, api_url: str = "http://127.0.0.1:54345", timeout: int = 30):
+    def __init__(self, api_url: str = "http://127.0.0.1:54345", timeout: int = 30,
+                 cache_ttl: float = 30.0, pool_size: int = 1):
         """
         初始化比特浏览器API客户端
 
         Args:
             api_url: API服务地址
             timeout: 请求超时时间（秒）
+            cache_ttl: 浏览器列表缓存有效期（秒），0表示不缓存
+            pool_size: 连接池大小（多个线程共用同一个客户端时调大）
         """
         self.api_url = api_url.rstrip('/')
         self.timeout = timeout
+        self.cache_ttl = cache_ttl
         self.logger = logging.getLogger(__name__)
-        self.session = requests.Session()
-        self.session.timeout = timeout
 
-        # 绕过代理设置，直接连接本地API
-        self.session.proxies = {
-            'http': None,
-            'https': None
-        }
-
-        # 设置连接池参数，提高稳定性
-        adapter = requests.adapters.HTTPAdapter(
-            pool_connections=1,
-            pool_maxsize=1,
-            max_retries=0  # 禁用内置重试，使用我们自己的重试机制
-        )
-        self.session.mount('http://', adapter)
-        self.session.mount('https://', adapter)
+        # 浏览器列表缓存，按ID索引
+        self._cache_lock = threading.Lock()
+        self._browser_list: Optional[List[Dict]] = None
+        self._browser_index: Dict[str, Dict] = {}
+        self._cache_time = 0.0
+        self.session = create_api_session(timeout, pool_size)
         
     @retry_on_api_error(max_retries=5, delay=1)
     def test_connection(self) -> Tuple[bool, str]:
@@ -103,23 +167,17 @@ class BitBrowserAPI:
         Returns:
             (是否连接成功, 状态消息)
         """
+        # 缓存有效期内刚成功请求过列表，说明连接正常
+        if self._cache_is_fresh():
+            return True, "API连接成功"
+
         try:
-            # 比特浏览器使用 POST 方法，需要传递参数
-            payload = {
-                "page": 0,  # 比特浏览器从0开始计页
-                "pageSize": 10
-            }
-            response = self.session.post(f"{self.api_url}/browser/list", json=payload, timeout=10)
-            response.raise_for_status()  # 抛出HTTP错误
-
-            if response.status_code == 200:
-                data = response.json()
-                if data.get('success', False):
-                    return True, "API连接成功"
-                else:
-                    return True, f"API连接成功，但返回: {data.get('msg', '未知消息')}"
+            # 直接请求完整列表，结果写入缓存，后续查找窗口不再重复请求
+            data = self._request_browser_list()
+            if data.get('success', False):
+                return True, "API连接成功"
             else:
-                return False, f"API响应错误: {response.status_code}"
+                return True, f"API连接成功，但返回: {data.get('msg', '未知消息')}"
         except requests.exceptions.HTTPError as e:
             if e.response.status_code == 503:
                 return False, "BitBrowser服务暂时不可用(503)，已重试多次仍失败"
@@ -249,32 +307,86 @@ class BitBrowserAPI:
 
         return "\n".join(guide)
     
+    def _cache_is_fresh(self) -> bool:
+        """浏览器列表缓存是否仍在有效期内"""
+        with self._cache_lock:
+            return self._browser_list is not None and time.time() - self._cache_time < self.cache_ttl
+
+    def _request_browser_list(self) -> Dict:
+        """
+        请求浏览器列表接口，成功时更新缓存
+
+        Returns:
+            接口返回的JSON数据
+        """
+        payload = {
+            "page": 0,  # 比特浏览器从0开始计页
+            "pageSize": 100  # 获取更多浏览器窗口
+        }
+        response = self.session.post(f"{self.api_url}/browser/list", json=payload, timeout=15)
+        response.raise_for_status()  # 抛出HTTP错误
+        data = response.json()
+        if data.get('success', False):
+            browsers = data.get('data', {}).get('list', []) or []
+            with self._cache_lock:
+                self._browser_list = browsers
+                self._browser_index = {b.get('id'): b for b in browsers if isinstance(b, dict) and b.get('id')}
+                self._cache_time = time.time()
+        return data
+
+    def invalidate_cache(self):
+        """清空浏览器列表缓存（窗口增删后调用）"""
+        with self._cache_lock:
+            self._browser_list = None
+            self._browser_index = {}
+            self._cache_time = 0.0
+
     @retry_on_api_error(max_retries=5, delay=1)
-    def get_browser_list(self) -> List[Dict]:
+    def get_browser_list(self, use_cache: bool = True) -> List[Dict]:
         """
         获取浏览器窗口列表
 
+        Args:
+            use_cache: 是否使用有效期内的缓存
+
         Returns:
             浏览器窗口信息列表
         """
+        if use_cache and self._cache_is_fresh():
+            with self._cache_lock:
+                return list(self._browser_list)
+
         try:
-            payload = {
-                "page": 0,  # 比特浏览器从0开始计页
-                "pageSize": 100  # 获取更多浏览器窗口
-            }
-            response = self.session.post(f"{self.api_url}/browser/list", json=payload, timeout=15)
-            response.raise_for_status()  # 抛出HTTP错误
-            response.raise_for_status()
-            data = response.json()
+            data = self._request_browser_list()
             if data.get('success', False):
-                return data.get('data', {}).get('list', [])
+                return data.get('data', {}).get('list', []) or []
             else:
                 self.logger.error(f"获取浏览器列表失败: {data.get('msg', '未知错误')}")
                 return []
         except Exception as e:
             self.logger.error(f"获取浏览器列表失败: {str(e)}")
             return []
-    
+
+    def get_browser_by_id(self, browser_id: str) -> Optional[Dict]:
+        """
+        根据ID查找浏览器窗口（优先使用缓存，缓存中没有时刷新一次）
+
+        Args:
+            browser_id: 浏览器ID
+
+        Returns:
+            窗口信息，未找到返回None
+        """
+        if self._cache_is_fresh():
+            with self._cache_lock:
+                browser = self._browser_index.get(browser_id)
+            if browser is not None:
+                return browser
+
+        self.get_browser_list(use_cache=False)
+        with self._cache_lock:
+            return self._browser_index.get(browser_id)
+
     def create_browser_window(self, window_name: str, group_id: str = None) -> Optional[Dict]:
         """
         创建新的浏览器窗口
@@ -287,29 +399,7 @@ class BitBrowserAPI:
             创建的窗口信息，失败返回None
         """
         try:
-            payload = {
-                "name": window_name,
-                "remark": "Vinted库存管理系统专用窗口",
-                "proxyMethod": 2,  # 不使用代理
-                "proxyType": "noproxy",  # 添加代理类型
-                "browserFingerPrint": {
-                    "coreVersion": "112",
-                    "ostype": "PC",
-                    "os": "Mac",
-                    "osVersion": "10.15",
-                    "userAgent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/112.0.0.0 Safari/537.36",
-                    "resolution": "1920x1080",
-                    "language": "zh-CN,zh;q=0.9,en;q=0.8",
-                    "timeZone": "Asia/Shanghai",
-                    "webRTC": "proxy",
-                    "canvas": "noise",
-                    "webGL": "noise"
-                }
-            }
-
-            if group_id:
-                payload["groupId"] = group_id
-
+            payload = build_window_payload(window_name, group_id)
             response = self.session.post(
                 f"{self.api_url}/browser/update",
                 json=payload
@@ -319,6 +409,7 @@ class BitBrowserAPI:
 
             if data.get('success'):
                 self.logger.info(f"成功创建浏览器窗口: {window_name}")
+                self.invalidate_cache()
                 return data.get('data')
             else:
                 self.logger.error(f"创建窗口失败: {data.get('msg', '未知错误')}")
@@ -408,21 +499,31 @@ class BitBrowserAPI:
 class BitBrowserManager:
     """比特浏览器管理器"""
     
-    def __init__(self, config: Dict):
+    def __init__(self, config: Dict, api: BitBrowserAPI = None):
         """
         初始化浏览器管理器
         
         Args:
             config: 配置信息
+            api: 共享的API客户端（多个窗口共用浏览器列表缓存），为None时新建
         """
         self.config = config
-        self.api = BitBrowserAPI(
+        self.api = api or BitBrowserAPI(
             api_url=config.get('api_url', 'http://127.0.0.1:54345'),
-            timeout=config.get('timeout', 30)
+            timeout=config.get('timeout', 30),
+            cache_ttl=config.get('list_cache_ttl', 30)
         )
         self.logger = logging.getLogger(__name__)
         self.driver = None
         self.browser_info = None
+        # 打开窗口后等待调试端口就绪的最长时间（秒）
+        self.startup_timeout = config.get('startup_timeout', 20)
+        # 最近一次打开窗口到调试端口就绪的实际耗时（秒）
+        self.startup_time = None
+        # 驱动后端：chromedriver（Selenium WebDriver）或 cdp（直接发送CDP命令）
+        self.driver_backend = config.get('driver_backend', 'chromedriver')
+        # 页面加载策略：eager在DOM解析完成后返回，不等待第三方脚本拖慢的load事件
+        self.page_load_strategy = config.get('page_load_strategy', 'eager')
         
     def initialize(self, window_id: str) -> Tuple[bool, str]:
         """
@@ -441,12 +542,7 @@ class BitBrowserManager:
                 return False, message
 
             # 验证窗口ID是否存在
-            browser_list = self.api.get_browser_list()
-            browser_info = None
-            for browser in browser_list:
-                if browser.get('id') == window_id:
-                    browser_info = browser
-                    break
+            browser_info = self.api.get_browser_by_id(window_id)
 
             if not browser_info:
                 return False, f"未找到窗口ID: {window_id}"
@@ -458,11 +554,25 @@ class BitBrowserManager:
                 return False, "打开浏览器窗口失败"
 
             self.logger.info(f"浏览器窗口打开成功，响应数据: {open_result}")
+            return self.attach(window_id, browser_info, open_result)
+
+        except Exception as e:
+            self.logger.error(f"浏览器环境初始化失败: {str(e)}")
+            return False, f"初始化失败: {str(e)}"
 
-            # 等待浏览器完全启动
-            self.logger.info("等待浏览器完全启动...")
-            time.sleep(3)
+    def attach(self, window_id: str, browser_info: Dict, open_result: Dict) -> Tuple[bool, str]:
+        """
+        连接已打开的浏览器窗口：等待调试端口就绪后创建WebDriver
+
+        Args:
+            window_id: 窗口ID
+            browser_info: 窗口信息
+            open_result: 打开窗口接口返回的数据（包含调试地址和驱动路径）
 
+        Returns:
+            (是否成功, 状态消息)
+        """
+        try:
             # 连接到WebDriver
             debug_port = open_result.get('http')
             if not debug_port:
@@ -486,16 +596,19 @@ class BitBrowserManager:
 
             self.logger.info(f"使用调试地址: {debugger_address}")
 
-            # 验证调试端口是否可访问
-            try:
-                import requests
-                test_url = f"http://{debugger_address}/json"
-                response = requests.get(test_url, timeout=5)
-                if response.status_code != 200:
-                    return False, f"调试端口不可访问，状态码: {response.status_code}"
-                self.logger.info(f"调试端口验证成功: {test_url}")
-            except Exception as e:
-                return False, f"调试端口连接失败: {str(e)}"
+            # 轮询调试端口直到出现页面目标，代替固定等待
+            ready, message = self._wait_for_debugger(debugger_address)
+            if not ready:
+                return False, message
+
+            self.browser_info = browser_info
+
+            # CDP后端直接连接调试websocket，不启动chromedriver进程
+            if self.driver_backend == 'cdp':
+                self.logger.info("正在通过CDP连接浏览器...")
+                self.driver = CDPDriver(debugger_address, page_load_strategy=self.page_load_strategy)
+                self.logger.info(f"浏览器环境初始化成功: {window_id}")
+                return True, "浏览器环境初始化成功"
 
             # 获取正确的ChromeDriver路径
             driver_path = open_result.get('driver')
@@ -508,6 +621,7 @@ class BitBrowserManager:
             # 创建Chrome选项
             chrome_options = Options()
             chrome_options.add_experimental_option("debuggerAddress", debugger_address)
+            chrome_options.page_load_strategy = self.page_load_strategy
             chrome_options.add_argument("--no-sandbox")
             chrome_options.add_argument("--disable-dev-shm-usage")
 
@@ -519,7 +633,6 @@ class BitBrowserManager:
                 self.driver = webdriver.Chrome(service=service, options=chrome_options)
             else:
                 self.driver = webdriver.Chrome(options=chrome_options)
-            self.browser_info = browser_info
 
             self.logger.info(f"浏览器环境初始化成功: {window_id}")
             return True, "浏览器环境初始化成功"
@@ -528,32 +641,75 @@ class BitBrowserManager:
             self.logger.error(f"浏览器环境初始化失败: {str(e)}")
             return False, f"初始化失败: {str(e)}"
     
+    def _wait_for_debugger(self, debugger_address: str) -> Tuple[bool, str]:
+        """
+        轮询调试端口的 /json 接口，直到列出页面目标或超过启动期限
+
+        Args:
+            debugger_address: 调试地址，如 127.0.0.1:9222
+
+        Returns:
+            (是否就绪, 状态消息)
+        """
+        url = f"http://{debugger_address}/json"
+        started = time.time()
+        deadline = started + self.startup_timeout
+        interval = 0.1
+        last_error = "未列出页面目标"
+
+        while True:
+            try:
+                response = self.api.session.get(url, timeout=max(0.5, min(2.0, deadline - time.time())))
+                if response.status_code == 200:
+                    targets = response.json()
+                    if any(target.get('type') == 'page' for target in targets if isinstance(target, dict)):
+                        self.startup_time = time.time() - started
+                        self.logger.info(f"调试端口就绪: {url}，耗时 {self.startup_time:.2f} 秒")
+                        return True, "调试端口就绪"
+                else:
+                    last_error = f"状态码: {response.status_code}"
+            except Exception as e:
+                last_error = str(e)
+
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                self.logger.error(f"调试端口在 {self.startup_timeout} 秒内未就绪: {url}，最后错误: {last_error}")
+                return False, f"调试端口连接失败: {last_error}"
+
+            # 短间隔退避，快的机器几乎不用等待
+            time.sleep(min(interval, remaining))
+            interval = min(interval * 1.5, 1.0)
+
     def get_driver(self) -> Optional[webdriver.Chrome]:
         """获取WebDriver实例"""
         return self.driver
     
+    def quit_driver(self):
+        """快速退出WebDriver（不关闭比特浏览器窗口）"""
+        if self.driver:
+            try:
+                # 设置短超时，快速退出
+                self.driver.set_page_load_timeout(1)
+                self.driver.quit()
+            except:
+                # 如果正常退出失败，强制终止
+                try:
+                    import signal
+                    import psutil
+                    # 尝试强制终止浏览器进程
+                    for proc in psutil.process_iter(['pid', 'name']):
+                        if 'chrome' in proc.info['name'].lower():
+                            proc.terminate()
+                except:
+                    pass
+            finally:
+                self.driver = None
+
     def cleanup(self):
         """清理资源 - 快速清理"""
         try:
             # 快速关闭WebDriver
-            if self.driver:
-                try:
-                    # 设置短超时，快速退出
-                    self.driver.set_page_load_timeout(1)
-                    self.driver.quit()
-                except:
-                    # 如果正常退出失败，强制终止
-                    try:
-                        import signal
-                        import psutil
-                        # 尝试强制终止浏览器进程
-                        for proc in psutil.process_iter(['pid', 'name']):
-                            if 'chrome' in proc.info['name'].lower():
-                                proc.terminate()
-                    except:
-                        pass
-                finally:
-                    self.driver = None
+            self.quit_driver()
 
             # 快速关闭浏览器窗口
             if self.browser_info:
@@ -565,10 +721,9 @@ class BitBrowserManager:
                 except Exception as e:
                     self.logger.warning(f"使用API关闭浏览器失败: {e}")
                     try:
-                        # 备用方法：直接发送HTTP请求
-                        import requests
-                        response = requests.post(
-                            f"{self.api.base_url}/browser/close",
+                        # 备用方法：用同一个会话直接发送HTTP请求，缩短超时
+                        response = self.api.session.post(
+                            f"{self.api.api_url}/browser/close",
                             json={"id": self.browser_info['id']},
                             timeout=3  # 3秒超时
                         )
@@ -589,3 +744,195 @@ class BitBrowserManager:
     def is_ready(self) -> bool:
         """检查浏览器是否就绪"""
         return self.driver is not None and self.browser_info is not None
+
+    def is_alive(self) -> bool:
+        """
+        检查WebDriver会话是否仍然可用（一次轻量的WebDriver调用，不加载页面）
+
+        Returns:
+            会话是否可用
+        """
+        if not self.is_ready():
+            return False
+        try:
+            self.driver.current_url
+            return True
+        except Exception as e:
+            self.logger.warning(f"浏览器会话已失效: {str(e)}")
+            return False
+
+
+class BitBrowserPool:
+    """
+    比特浏览器多窗口池，每个窗口由一个BitBrowserManager管理，窗口和WebDriver连接在多轮之间保持
+
+    打开和关闭窗口的API请求由一个事件循环通过AsyncBitBrowserAPI并发发送（失败时不阻塞地退避重试），
+    连接WebDriver等阻塞操作放到线程中执行。
+    """
+
+    def __init__(self, config: Dict, api: BitBrowserAPI = None):
+        """
+        初始化多窗口池
+
+        Args:
+            config: 配置信息
+            api: 共享的API客户端，为None时新建
+        """
+        self.config = config
+        self.logger = logging.getLogger(__name__)
+        self.managers: Dict[str, BitBrowserManager] = {}
+        # 同时打开/关闭的窗口数量上限
+        self.max_parallel = max(1, int(config.get('max_parallel_startup', 10)))
+        # 所有窗口共用一个API客户端，一个缓存有效期内只请求一次浏览器列表
+        self.api = api or BitBrowserAPI(
+            api_url=config.get('api_url', 'http://127.0.0.1:54345'),
+            timeout=config.get('timeout', 30),
+            cache_ttl=config.get('list_cache_ttl', 30),
+            pool_size=self.max_parallel
+        )
+        # 异步客户端与同步客户端共用同一个保持连接的会话
+        from .bitbrowser_async import AsyncBitBrowserAPI
+        self.async_api = AsyncBitBrowserAPI(
+            api_url=self.api.api_url,
+            timeout=self.api.timeout,
+            pool_size=self.max_parallel,
+            max_retries=config.get('retry_count', 5),
+            session=self.api.session
+        )
+
+    async def _open_windows(self, window_ids: List[str]) -> List[Tuple[str, Optional[BitBrowserManager], str]]:
+        """
+        在一个事件循环中并发打开并连接一批窗口
+
+        Args:
+            window_ids: 窗口ID列表
+
+        Returns:
+            [(窗口ID, 管理器或None, 状态消息)]
+        """
+        browsers = {browser.get('id'): browser for browser in await self.async_api.get_browser_list()}
+        # 连接WebDriver在线程中执行，同时连接的窗口数不超过上限
+        attach_limit = asyncio.Semaphore(self.max_parallel)
+
+        async def open_window(window_id: str):
+            browser_info = browsers.get(window_id)
+            if not browser_info:
+                return window_id, None, f"未找到窗口ID: {window_id}"
+
+            open_result = await self.async_api.open_browser(window_id)
+            if not open_result:
+                return window_id, None, "打开浏览器窗口失败"
+
+            manager = BitBrowserManager(self.config, self.api)
+            async with attach_limit:
+                success, message = await asyncio.to_thread(manager.attach, window_id, browser_info, open_result)
+            if success:
+                return window_id, manager, message
+
+            await asyncio.to_thread(manager.quit_driver)
+            manager.browser_info = None
+            await self.async_api.close_browser(window_id)
+            return window_id, None, message
+
+        return await asyncio.gather(*(open_window(window_id) for window_id in window_ids))
+
+    async def _close_windows(self, managers: Dict[str, BitBrowserManager]):
+        """在一个事件循环中并发关闭一批窗口"""
+        async def release(window_id: str, manager: BitBrowserManager):
+            try:
+                await asyncio.to_thread(manager.quit_driver)
+                browser_info, manager.browser_info = manager.browser_info, None
+                if browser_info:
+                    await self.async_api.close_browser(browser_info['id'])
+            except Exception as e:
+                self.logger.error(f"清理窗口 {window_id} 失败: {str(e)}")
+
+        await asyncio.gather(*(release(window_id, manager) for window_id, manager in managers.items()))
+
+    def _release_managers(self, managers: Dict[str, BitBrowserManager]):
+        """并发关闭一批窗口"""
+        if managers:
+            asyncio.run(self._close_windows(managers))
+
+    def initialize(self, window_ids: List[str]) -> Tuple[bool, str]:
+        """
+        准备本轮需要的浏览器窗口：复用仍然可用的会话，只重新打开已失效或新增的窗口，
+        需要打开的窗口并发打开，部分窗口失败不影响其余窗口
+
+        Args:
+            window_ids: 窗口ID列表
+
+        Returns:
+            (是否至少有一个窗口成功, 状态消息)
+        """
+        started = time.time()
+
+        # 本轮不再使用的窗口和会话已失效的窗口一起关闭
+        to_release = {wid: m for wid, m in self.managers.items() if wid not in window_ids}
+        to_open = []
+        reused = 0
+        for window_id in window_ids:
+            manager = self.managers.get(window_id)
+            if manager is not None and manager.is_alive():
+                reused += 1
+                continue
+            if manager is not None:
+                self.logger.info(f"窗口 {window_id} 会话已失效，重新打开")
+                to_release[window_id] = manager
+            to_open.append(window_id)
+
+        for window_id in to_release:
+            self.managers.pop(window_id, None)
+        self._release_managers(to_release)
+
+        errors = []
+        startup_times = []
+        if to_open:
+            for window_id, manager, message in asyncio.run(self._open_windows(to_open)):
+                if manager is not None:
+                    self.managers[window_id] = manager
+                    if manager.startup_time is not None:
+                        startup_times.append(manager.startup_time)
+                else:
+                    self.logger.warning(f"窗口 {window_id} 初始化失败: {message}")
+                    errors.append(f"{window_id}: {message}")
+
+        if not self.managers:
+            return False, f"所有窗口初始化失败: {'; '.join(errors)}"
+
+        message = f"{len(self.managers)}/{len(window_ids)} 个窗口初始化成功（复用 {reused} 个）"
+        self.logger.info(f"{message}，耗时 {time.time() - started:.2f} 秒")
+        if startup_times:
+            self.logger.info(
+                f"新打开 {len(startup_times)} 个窗口，调试端口就绪平均 {sum(startup_times) / len(startup_times):.2f} 秒，"
+                f"最长 {max(startup_times):.2f} 秒"
+            )
+        return True, message
+
+    def release(self, window_id: str):
+        """
+        关闭并移除单个窗口
+
+        Args:
+            window_id: 窗口ID
+        """
+        manager = self.managers.pop(window_id, None)
+        if manager is not None:
+            self._release_managers({window_id: manager})
+
+    def get_drivers(self) -> Dict[str, webdriver.Chrome]:
+        """获取已就绪窗口的WebDriver，按窗口ID索引"""
+        return {
+            window_id: manager.get_driver()
+            for window_id, manager in self.managers.items()
+            if manager.is_ready()
+        }
+
+    def cleanup(self):
+        """并发关闭池中所有窗口（停止查询或退出程序时调用）"""
+        managers, self.managers = self.managers, {}
+        self._release_managers(managers)
+
+    def is_ready(self) -> bool:
+        """检查是否至少有一个窗口就绪"""
+        return any(manager.is_ready() for manager in self.managers.values())
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+比特浏览器异步API客户端
+
+接口与BitBrowserAPI一致，但在asyncio事件循环中使用：HTTP请求在线程中通过共享的
+保持连接会话发送，重试等待使用asyncio.sleep，不会阻塞事件循环，
+一个事件循环即可同时驱动多个窗口的打开和关闭（BitBrowserPool用它并发打开和关闭窗口）。
+"""
+
+import asyncio
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+from .bitbrowser_api import create_api_session, build_window_payload
+
+
+# 可重试的HTTP状态码（与retry_on_api_error一致）
+RETRYABLE_STATUS_CODES = (500, 502, 503, 504)
+
+
+class AsyncBitBrowserAPI:
+    """比特浏览器异步API客户端"""
+
+    def __init__(self, api_url: str = "http://127.0.0.1:54345", timeout: int = 30,
+                 pool_size: int = 10, max_retries: int = 5, retry_delay: float = 1.0,
+                 session: requests.Session = None):
+        """
+        初始化异步API客户端
+
+        Args:
+            api_url: API服务地址
+            timeout: 请求超时时间（秒）
+            pool_size: 连接池大小，也是同时进行的请求数上限
+            max_retries: 最大尝试次数
+            retry_delay: 重试基础等待时间（秒）
+            session: 共用的保持连接会话（如BitBrowserAPI.session），为None时新建
+        """
+        self.api_url = api_url.rstrip('/')
+        self.timeout = timeout
+        self.pool_size = max(1, pool_size)
+        self.max_retries = max(1, max_retries)
+        self.retry_delay = retry_delay
+        self.logger = logging.getLogger(__name__)
+
+        self._owns_session = session is None
+        self.session = session or create_api_session(timeout, pool_size)
+        # 并发请求数不超过连接池大小，保证连接都能复用；
+        # 信号量属于创建它的事件循环，在首次请求时于当前事件循环中创建
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """关闭连接池（共用的会话由创建方关闭）"""
+        if self._owns_session:
+            self.session.close()
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """获取当前事件循环的并发请求信号量（每个事件循环创建一次）"""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.pool_size)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    def _retry_wait(self, error: Exception, attempt: int) -> Optional[float]:
+        """
+        判断错误是否可重试
+
+        Returns:
+            重试前的等待时间（秒），不可重试时返回None
+        """
+        if isinstance(error, requests.exceptions.HTTPError):
+            response = error.response
+            if response is not None and response.status_code in RETRYABLE_STATUS_CODES:
+                return self.retry_delay * (2 ** attempt)  # 指数退避
+            return None
+        if isinstance(error, (requests.exceptions.ProxyError,
+                              requests.exceptions.ConnectionError,
+                              requests.exceptions.Timeout)):
+            return self.retry_delay * (attempt + 1)
+        return None
+
+    async def _post(self, path: str, payload: Dict, timeout: float = None) -> Dict:
+        """
+        发送POST请求，失败时不阻塞地退避重试
+
+        Args:
+            path: 接口路径，如 /browser/list
+            payload: 请求参数
+            timeout: 请求超时时间（秒）
+
+        Returns:
+            接口返回的JSON数据
+        """
+        url = f"{self.api_url}{path}"
+        for attempt in range(self.max_retries):
+            try:
+                async with self._get_semaphore():
+                    response = await asyncio.to_thread(
+                        self.session.post, url, json=payload, timeout=timeout or self.timeout
+                    )
+                response.raise_for_status()
+                return response.json()
+            except Exception as e:
+                wait = self._retry_wait(e, attempt)
+                if wait is None or attempt >= self.max_retries - 1:
+                    raise
+                self.logger.debug(f"请求 {path} 失败，{wait:.1f} 秒后重试: {str(e)}")
+                await asyncio.sleep(wait)
+
+    async def test_connection(self) -> Tuple[bool, str]:
+        """
+        测试API连接状态
+
+        Returns:
+            (是否连接成功, 状态消息)
+        """
+        try:
+            data = await self._post("/browser/list", {"page": 0, "pageSize": 1}, timeout=10)
+            if data.get('success', False):
+                return True, "API连接成功"
+            return True, f"API连接成功，但返回: {data.get('msg', '未知消息')}"
+        except requests.exceptions.HTTPError as e:
+            return False, f"API HTTP错误: {e.response.status_code}"
+        except requests.exceptions.ConnectionError:
+            return False, "无法连接到比特浏览器API，请确保比特浏览器已启动且端口54345可用"
+        except requests.exceptions.Timeout:
+            return False, "API连接超时，已重试多次仍失败，请检查网络连接"
+        except Exception as e:
+            return False, f"连接测试失败: {str(e)}"
+
+    async def get_browser_list(self) -> List[Dict]:
+        """
+        获取浏览器窗口列表
+
+        Returns:
+            浏览器窗口信息列表
+        """
+        try:
+            data = await self._post("/browser/list", {"page": 0, "pageSize": 100}, timeout=15)
+            if data.get('success', False):
+                return data.get('data', {}).get('list', []) or []
+            self.logger.error(f"获取浏览器列表失败: {data.get('msg', '未知错误')}")
+            return []
+        except Exception as e:
+            self.logger.error(f"获取浏览器列表失败: {str(e)}")
+            return []
+
+    async def create_browser_window(self, window_name: str, group_id: str = None) -> Optional[Dict]:
+        """
+        创建新的浏览器窗口
+
+        Args:
+            window_name: 窗口名称
+            group_id: 分组ID（可选）
+
+        Returns:
+            创建的窗口信息，失败返回None
+        """
+        payload = build_window_payload(window_name, group_id)
+        try:
+            data = await self._post("/browser/update", payload)
+            if data.get('success'):
+                self.logger.info(f"成功创建浏览器窗口: {window_name}")
+                return data.get('data')
+            self.logger.error(f"创建窗口失败: {data.get('msg', '未知错误')}")
+            return None
+        except Exception as e:
+            self.logger.error(f"创建浏览器窗口失败: {str(e)}")
+            return None
+
+    async def open_browser(self, browser_id: str) -> Optional[Dict]:
+        """
+        打开指定的浏览器窗口
+
+        Args:
+            browser_id: 浏览器ID
+
+        Returns:
+            打开结果信息（包含调试地址和驱动路径），失败返回None
+        """
+        try:
+            data = await self._post("/browser/open", {"id": browser_id})
+            if data.get('success'):
+                self.logger.info(f"成功打开浏览器窗口: {browser_id}")
+                return data.get('data')
+            self.logger.error(f"打开窗口失败: {data.get('msg', '未知错误')}")
+            return None
+        except Exception as e:
+            self.logger.error(f"打开浏览器窗口失败: {str(e)}")
+            return None
+
+    async def close_browser(self, browser_id: str) -> bool:
+        """
+        关闭指定的浏览器窗口
+
+        Args:
+            browser_id: 浏览器ID
+
+        Returns:
+            是否成功关闭
+        """
+        try:
+            data = await self._post("/browser/close", {"id": browser_id})
+            if data.get('success'):
+                self.logger.info(f"成功关闭浏览器窗口: {browser_id}")
+                return True
+            self.logger.error(f"关闭窗口失败: {data.get('msg', '未知错误')}")
+            return False
+        except Exception as e:
+            self.logger.error(f"关闭浏览器窗口失败: {str(e)}")
+            return False
+
+    async def open_browsers(self, browser_ids: List[str]) -> Dict[str, Optional[Dict]]:
+        """
+        同时打开多个浏览器窗口
+
+        Args:
+            browser_ids: 浏览器ID列表
+
+        Returns:
+            {浏览器ID: 打开结果信息或None}
+        """
+        results = await asyncio.gather(*(self.open_browser(browser_id) for browser_id in browser_ids))
+        return dict(zip(browser_ids, results))
+
+    async def close_browsers(self, browser_ids: List[str]) -> Dict[str, bool]:
+        """
+        同时关闭多个浏览器窗口
+
+        Args:
+            browser_ids: 浏览器ID列表
+
+        Returns:
+            {浏览器ID: 是否成功关闭}
+        """
+        results = await asyncio.gather(*(self.close_browser(browser_id) for browser_id in browser_ids))
+        return dict(zip(browser_ids, results))
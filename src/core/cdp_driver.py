@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Chrome DevTools Protocol 驱动模块
+
+不启动chromedriver进程，直接通过浏览器的调试websocket发送CDP命令。
+实现了VintedScraper、TabPool、PageReadiness和InBrowserApiClient用到的
+Selenium接口子集（get、execute_script、find_elements、标签页切换等），
+可以直接替换webdriver.Chrome使用。
+"""
+
+import json
+import time
+import logging
+import threading
+from itertools import count
+from typing import Any, Dict, List, Optional
+
+import requests
+import websocket
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import (
+    JavascriptException, NoSuchElementException, NoSuchWindowException,
+    TimeoutException, WebDriverException
+)
+
+
+# 在根节点（document或元素）上按Selenium定位方式查找元素
+_FIND_ELEMENTS_SCRIPT = """
+function(by, value) {
+    var root = this;
+    if (by === 'xpath') {
+        var result = document.evaluate(value, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        var nodes = [];
+        for (var i = 0; i < result.snapshotLength; i++) {
+            if (result.snapshotItem(i).nodeType === 1) nodes.push(result.snapshotItem(i));
+        }
+        return nodes;
+    }
+    var selector = value;
+    if (by === 'id') selector = '#' + CSS.escape(value);
+    else if (by === 'class name') selector = '.' + CSS.escape(value);
+    else if (by === 'name') selector = '[name="' + CSS.escape(value) + '"]';
+    else if (by === 'link text' || by === 'partial link text') {
+        return Array.prototype.filter.call(root.querySelectorAll('a'), function(a) {
+            var text = (a.innerText || '').trim();
+            return by === 'link text' ? text === value : text.indexOf(value) !== -1;
+        });
+    }
+    return Array.prototype.slice.call(root.querySelectorAll(selector));
+}
+"""
+
+# 与Selenium一致：优先返回元素属性（如href返回绝对地址），没有时返回HTML特性
+_GET_ATTRIBUTE_SCRIPT = """
+function(name) {
+    var value = this[name];
+    if (value === undefined || value === null || typeof value === 'object' || typeof value === 'function') {
+        return this.getAttribute(name);
+    }
+    if (value === false) return null;
+    return String(value);
+}
+"""
+
+# 导航前在旧页面上打的标记，新页面加载后标记自然消失
+_MARK_NAVIGATION_SCRIPT = "window.__cdpNavigationPending = true;"
+# 各页面加载策略下get()返回的条件（与WebDriver的pageLoadStrategy一致）
+_LOAD_CONDITIONS = {
+    'normal': "!window.__cdpNavigationPending && document.readyState === 'complete'",
+    'eager': "!window.__cdpNavigationPending && document.readyState !== 'loading'",
+}
+
+
+class CDPElement:
+    """页面元素，对应WebElement的常用接口"""
+
+    def __init__(self, driver: 'CDPDriver', session_id: str, object_id: str):
+        self._driver = driver
+        self._session_id = session_id
+        self._object_id = object_id
+
+    def _call(self, function: str, *args) -> Any:
+        return self._driver._call_function_on(self._session_id, self._object_id, function, args)
+
+    @property
+    def text(self) -> str:
+        """元素的可见文本"""
+        return self._call("function() { return this.innerText || ''; }") or ''
+
+    @property
+    def tag_name(self) -> str:
+        """元素的标签名（小写）"""
+        return (self._call("function() { return this.tagName; }") or '').lower()
+
+    def get_attribute(self, name: str) -> Optional[str]:
+        """获取元素属性"""
+        return self._call(_GET_ATTRIBUTE_SCRIPT, name)
+
+    def is_displayed(self) -> bool:
+        """元素是否可见"""
+        return bool(self._call("function() { return !!(this.offsetWidth || this.offsetHeight || this.getClientRects().length); }"))
+
+    def find_elements(self, by: str = By.ID, value: str = None) -> List['CDPElement']:
+        """在元素内查找子元素"""
+        return self._driver._find_elements(self._session_id, by, value, self._object_id)
+
+    def find_element(self, by: str = By.ID, value: str = None) -> 'CDPElement':
+        """在元素内查找第一个子元素"""
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise NoSuchElementException(f"未找到元素: {by}={value}")
+        return elements[0]
+
+
+class _SwitchTo:
+    """对应driver.switch_to的标签页切换接口"""
+
+    def __init__(self, driver: 'CDPDriver'):
+        self._driver = driver
+
+    def window(self, handle: str):
+        """切换到指定标签页"""
+        self._driver._attach(handle)
+
+    def new_window(self, type_hint: str = 'tab'):
+        """打开新标签页并切换过去"""
+        result = self._driver._send("Target.createTarget", {"url": "about:blank", "newWindow": type_hint == 'window'})
+        self._driver._attach(result['targetId'])
+
+
+class CDPDriver:
+    """通过调试websocket直接发送CDP命令的浏览器驱动"""
+
+    def __init__(self, debugger_address: str, page_load_timeout: float = 30,
+                 script_timeout: float = 30, command_timeout: float = 30,
+                 page_load_strategy: str = 'normal'):
+        """
+        连接到已运行浏览器的调试端口
+
+        Args:
+            debugger_address: 调试地址，如 127.0.0.1:9222
+            page_load_timeout: 页面加载超时时间（秒）
+            script_timeout: 异步脚本超时时间（秒）
+            command_timeout: 单条CDP命令的超时时间（秒）
+            page_load_strategy: 页面加载策略，normal=等待load事件，eager=DOM解析完成，none=不等待
+        """
+        self.debugger_address = debugger_address
+        self.page_load_strategy = page_load_strategy
+        self.page_load_timeout = page_load_timeout
+        self.script_timeout = script_timeout
+        self.command_timeout = command_timeout
+        self.logger = logging.getLogger(__name__)
+
+        self._ids = count(1)
+        # 多个线程（采集线程、健康检查）共用一个连接，命令串行收发
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, str] = {}  # {target_id: session_id}
+        self._target_id: Optional[str] = None
+        self.switch_to = _SwitchTo(self)
+
+        version = requests.get(f"http://{debugger_address}/json/version", timeout=5,
+                               proxies={'http': None, 'https': None}).json()
+        # 使用浏览器级连接，所有标签页通过flat会话复用同一个websocket
+        self._ws = websocket.create_connection(
+            version['webSocketDebuggerUrl'], timeout=command_timeout,
+            suppress_origin=True, enable_multithread=True
+        )
+
+        pages = self.window_handles
+        if not pages:
+            self.switch_to.new_window('tab')
+        else:
+            self._attach(pages[0])
+        self.logger.info(f"已通过CDP连接到浏览器: {debugger_address}")
+
+    # ------------------------------------------------------------------
+    # CDP收发
+    # ------------------------------------------------------------------
+    def _send(self, method: str, params: Dict = None, session_id: str = None, timeout: float = None) -> Dict:
+        """
+        发送一条CDP命令并等待对应的返回
+
+        Args:
+            method: 命令名，如 Page.navigate
+            params: 命令参数
+            session_id: 标签页会话ID，为None时发给浏览器
+            timeout: 等待返回的超时时间（秒）
+
+        Returns:
+            命令返回结果
+        """
+        if self._ws is None:
+            raise WebDriverException("CDP连接已关闭")
+
+        message_id = next(self._ids)
+        message = {"id": message_id, "method": method, "params": params or {}}
+        if session_id:
+            message["sessionId"] = session_id
+
+        deadline = time.time() + (timeout or self.command_timeout)
+        with self._lock:
+            try:
+                self._ws.send(json.dumps(message))
+                while True:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        raise TimeoutException(f"CDP命令超时: {method}")
+                    self._ws.settimeout(remaining)
+                    response = json.loads(self._ws.recv())
+                    # 事件通知和超时命令的残留返回直接丢弃
+                    if response.get("id") == message_id:
+                        break
+            except websocket.WebSocketTimeoutException:
+                raise TimeoutException(f"CDP命令超时: {method}")
+            except (websocket.WebSocketException, OSError) as e:
+                raise WebDriverException(f"CDP连接失败: {str(e)}")
+
+        if "error" in response:
+            error = response["error"]
+            if 'No target' in error.get('message', '') or 'No session' in error.get('message', ''):
+                raise NoSuchWindowException(error.get('message'))
+            raise WebDriverException(f"{method} 失败: {error.get('message')}")
+        return response.get("result", {})
+
+    def _attach(self, target_id: str):
+        """附加到标签页并设为当前标签页"""
+        if target_id not in self._sessions:
+            result = self._send("Target.attachToTarget", {"targetId": target_id, "flatten": True})
+            self._sessions[target_id] = result['sessionId']
+        self._target_id = target_id
+
+    @property
+    def _session_id(self) -> str:
+        if self._target_id is None:
+            raise NoSuchWindowException("当前没有选中的标签页")
+        return self._sessions[self._target_id]
+
+    def execute_cdp_cmd(self, cmd: str, cmd_args: Dict = None) -> Dict:
+        """在当前标签页上执行CDP命令（与Chrome驱动的同名接口一致）"""
+        return self._send(cmd, cmd_args, self._session_id)
+
+    # ------------------------------------------------------------------
+    # 脚本执行
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _check_exception(result: Dict):
+        details = result.get("exceptionDetails")
+        if details:
+            exception = details.get("exception", {})
+            raise JavascriptException(exception.get("description") or details.get("text", "脚本执行失败"))
+
+    def _evaluate(self, expression: str, await_promise: bool = False, timeout: float = None,
+                  return_by_value: bool = True, session_id: str = None) -> Any:
+        result = self._send("Runtime.evaluate", {
+            "expression": expression,
+            "returnByValue": return_by_value,
+            "awaitPromise": await_promise,
+            "userGesture": True
+        }, session_id or self._session_id, timeout)
+        self._check_exception(result)
+        remote = result.get("result", {})
+        return remote.get("value") if return_by_value else remote
+
+    def _call_function_on(self, session_id: str, object_id: str, function: str, args=(),
+                          return_by_value: bool = True) -> Any:
+        result = self._send("Runtime.callFunctionOn", {
+            "functionDeclaration": function,
+            "objectId": object_id,
+            "arguments": [{"value": arg} for arg in args],
+            "returnByValue": return_by_value
+        }, session_id)
+        self._check_exception(result)
+        remote = result.get("result", {})
+        return remote.get("value") if return_by_value else remote
+
+    def execute_script(self, script: str, *args) -> Any:
+        """
+        执行同步脚本，参数和返回值需可JSON序列化
+
+        Args:
+            script: 脚本内容（可使用arguments和return）
+            *args: 脚本参数
+
+        Returns:
+            脚本返回值
+        """
+        expression = f"(function() {{ {script}\n}}).apply(window, {json.dumps(list(args))})"
+        return self._evaluate(expression)
+
+    def execute_async_script(self, script: str, *args) -> Any:
+        """
+        执行异步脚本，最后一个参数是回调函数
+
+        Args:
+            script: 脚本内容
+            *args: 脚本参数
+
+        Returns:
+            传给回调函数的值
+        """
+        expression = (
+            "new Promise(function(resolve) {"
+            f" (function() {{ {script}\n}}).apply(window, {json.dumps(list(args))}.concat([resolve]));"
+            " })"
+        )
+        try:
+            return self._evaluate(expression, await_promise=True, timeout=self.script_timeout)
+        except TimeoutException:
+            raise TimeoutException(f"异步脚本在 {self.script_timeout} 秒内未返回")
+
+    # ------------------------------------------------------------------
+    # 页面
+    # ------------------------------------------------------------------
+    def get(self, url: str):
+        """
+        在当前标签页中打开URL，按页面加载策略等待
+
+        Args:
+            url: 目标URL
+        """
+        session_id = self._session_id
+        try:
+            self._evaluate(_MARK_NAVIGATION_SCRIPT, session_id=session_id)
+        except WebDriverException:
+            pass
+
+        result = self._send("Page.navigate", {"url": url}, session_id, self.page_load_timeout)
+        if result.get("errorText"):
+            raise WebDriverException(f"页面加载失败: {result['errorText']}")
+        # 同文档导航（如锚点跳转）没有loaderId，不需要等待加载
+        condition = _LOAD_CONDITIONS.get(self.page_load_strategy)
+        if not result.get("loaderId") or condition is None:
+            return
+
+        deadline = time.time() + self.page_load_timeout
+        while time.time() < deadline:
+            try:
+                if self._evaluate(condition, session_id=session_id):
+                    return
+            except WebDriverException:
+                # 导航过程中执行上下文被销毁，继续轮询
+                pass
+            time.sleep(0.05)
+        raise TimeoutException(f"页面在 {self.page_load_timeout} 秒内未加载完成: {url}")
+
+    @property
+    def current_url(self) -> str:
+        """当前页面地址"""
+        return self._evaluate("location.href")
+
+    @property
+    def title(self) -> str:
+        """当前页面标题"""
+        return self._evaluate("document.title")
+
+    @property
+    def page_source(self) -> str:
+        """当前页面HTML"""
+        return self._evaluate("document.documentElement ? document.documentElement.outerHTML : ''")
+
+    def set_page_load_timeout(self, time_to_wait: float):
+        """设置页面加载超时时间（秒）"""
+        self.page_load_timeout = time_to_wait
+
+    def set_script_timeout(self, time_to_wait: float):
+        """设置异步脚本超时时间（秒）"""
+        self.script_timeout = time_to_wait
+
+    def implicitly_wait(self, time_to_wait: float):
+        """不支持隐式等待，查找元素总是立即返回"""
+        pass
+
+    # ------------------------------------------------------------------
+    # 元素
+    # ------------------------------------------------------------------
+    def _find_elements(self, session_id: str, by: str, value: str, root_object_id: str = None) -> List[CDPElement]:
+        if root_object_id is None:
+            remote = self._evaluate("document", return_by_value=False, session_id=session_id)
+            root_object_id = remote.get("objectId")
+
+        array = self._call_function_on(session_id, root_object_id, _FIND_ELEMENTS_SCRIPT, (by, value),
+                                       return_by_value=False)
+        array_id = array.get("objectId")
+        if not array_id:
+            return []
+
+        properties = self._send("Runtime.getProperties", {"objectId": array_id, "ownProperties": True},
+                                session_id).get("result", [])
+        elements = [
+            (int(prop["name"]), CDPElement(self, session_id, prop["value"]["objectId"]))
+            for prop in properties
+            if prop.get("name", "").isdigit() and prop.get("value", {}).get("objectId")
+        ]
+        self._send("Runtime.releaseObject", {"objectId": array_id}, session_id)
+        return [element for _, element in sorted(elements, key=lambda item: item[0])]
+
+    def find_elements(self, by: str = By.ID, value: str = None) -> List[CDPElement]:
+        """
+        查找页面中的元素
+
+        Args:
+            by: 定位方式（By.CSS_SELECTOR、By.TAG_NAME、By.XPATH等）
+            value: 定位值
+
+        Returns:
+            元素列表
+        """
+        return self._find_elements(self._session_id, by, value)
+
+    def find_element(self, by: str = By.ID, value: str = None) -> CDPElement:
+        """查找页面中的第一个元素，没有时抛出NoSuchElementException"""
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise NoSuchElementException(f"未找到元素: {by}={value}")
+        return elements[0]
+
+    # ------------------------------------------------------------------
+    # 标签页
+    # ------------------------------------------------------------------
+    @property
+    def current_window_handle(self) -> str:
+        """当前标签页句柄（即CDP目标ID）"""
+        if self._target_id is None:
+            raise NoSuchWindowException("当前没有选中的标签页")
+        return self._target_id
+
+    @property
+    def window_handles(self) -> List[str]:
+        """所有标签页句柄"""
+        targets = self._send("Target.getTargets").get("targetInfos", [])
+        return [target["targetId"] for target in targets if target.get("type") == "page"]
+
+    def close(self):
+        """关闭当前标签页（之后需要切换到其他标签页）"""
+        target_id = self.current_window_handle
+        self._send("Target.closeTarget", {"targetId": target_id})
+        self._sessions.pop(target_id, None)
+        self._target_id = None
+
+        # closeTarget不等待标签页真正关闭，与Selenium一致等到标签页消失再返回
+        deadline = time.time() + self.command_timeout
+        while target_id in self.window_handles and time.time() < deadline:
+            time.sleep(0.05)
+
+    def quit(self):
+        """断开CDP连接，浏览器窗口本身由比特浏览器API关闭"""
+        if self._ws is not None:
+            try:
+                self._ws.close()
+            except Exception:
+                pass
+            self._ws = None
+        self._sessions = {}
+        self._target_id = None
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+窗口熔断模块
+
+某个浏览器窗口遇到验证页面、登录页面或连续出现错误页面时断开：冷却期内不再用这个窗口加载页面，
+冷却结束后只放行一次检查作为试探，成功则恢复，再次失败则冷却时间加倍。
+"""
+
+import time
+import logging
+import threading
+from typing import Dict
+
+
+# 熔断状态
+STATE_CLOSED = "closed"        # 正常
+STATE_OPEN = "open"            # 冷却中，不放行
+STATE_HALF_OPEN = "half_open"  # 冷却结束，放行一次试探
+
+
+class CircuitBreaker:
+    """单个浏览器窗口的熔断器（线程安全）"""
+
+    def __init__(self, name: str = "浏览器窗口", base_cooldown: float = 60.0, max_cooldown: float = 900.0,
+                 failure_threshold: int = 3):
+        """
+        初始化熔断器
+
+        Args:
+            name: 名称（用于日志）
+            base_cooldown: 第一次断开的冷却时间（秒），之后每次连续断开加倍
+            max_cooldown: 冷却时间上限（秒）
+            failure_threshold: 连续多少次错误页面后断开
+        """
+        self.logger = logging.getLogger(__name__)
+        self.name = name
+        self.base_cooldown = max(0.0, base_cooldown)
+        self.max_cooldown = max(self.base_cooldown, max_cooldown)
+        self.failure_threshold = max(1, failure_threshold)
+
+        self._lock = threading.Lock()
+        self._state = STATE_CLOSED
+        self._open_until = 0.0
+        # 连续断开次数（决定冷却时间），恢复后清零
+        self._trips = 0
+        self._failures = 0
+        # 半开状态下是否已放行试探（试探结果出来前不再放行）
+        self._probing = False
+        self.last_reason = ""
+        self.total_trips = 0
+
+    @property
+    def state(self) -> str:
+        """当前状态（冷却结束后自动变为半开）"""
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == STATE_OPEN and time.monotonic() >= self._open_until:
+            self._state = STATE_HALF_OPEN
+        return self._state
+
+    def allow(self) -> bool:
+        """
+        是否可以用这个窗口检查
+
+        半开状态下只放行一次试探，直到 record_success/record_failure 给出试探结果。
+
+        Returns:
+            正常或放行试探时返回True，冷却中或试探进行中返回False
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == STATE_CLOSED:
+                return True
+            if state == STATE_HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def remaining(self) -> float:
+        """
+        冷却剩余时间
+
+        Returns:
+            剩余秒数，未断开时为0
+        """
+        with self._lock:
+            if self._current_state() != STATE_OPEN:
+                return 0.0
+            return max(0.0, self._open_until - time.monotonic())
+
+    def trip(self, reason: str = ""):
+        """
+        断开熔断器，冷却时间按连续断开次数指数增长
+
+        Args:
+            reason: 断开原因
+        """
+        with self._lock:
+            self._trips += 1
+            self.total_trips += 1
+            self._failures = 0
+            self._probing = False
+            cooldown = min(self.max_cooldown, self.base_cooldown * (2 ** (self._trips - 1)))
+            self._state = STATE_OPEN
+            self._open_until = time.monotonic() + cooldown
+            self.last_reason = reason
+        self.logger.warning(f"{self.name} 暂停 {cooldown:.0f} 秒: {reason}")
+
+    def record_success(self):
+        """一次正常检查：恢复并清零计数"""
+        with self._lock:
+            recovered = self._state == STATE_HALF_OPEN
+            self._state = STATE_CLOSED
+            self._trips = 0
+            self._failures = 0
+            self._probing = False
+        if recovered:
+            self.logger.info(f"{self.name} 试探成功，恢复检查")
+
+    def record_failure(self, reason: str = ""):
+        """
+        一次错误页面：试探失败或连续错误达到阈值时断开
+
+        Args:
+            reason: 错误原因
+        """
+        with self._lock:
+            self._failures += 1
+            should_trip = self._current_state() == STATE_HALF_OPEN or self._failures >= self.failure_threshold
+        if should_trip:
+            self.trip(reason)
+
+    def get_stats(self) -> Dict:
+        """
+        获取熔断统计
+
+        Returns:
+            当前状态、累计断开次数、冷却剩余时间、最近一次断开原因
+        """
+        with self._lock:
+            state = self._current_state()
+            return {
+                'state': state,
+                'trips': self.total_trips,
+                'remaining': max(0.0, self._open_until - time.monotonic()) if state == STATE_OPEN else 0.0,
+                'last_reason': self.last_reason,
+            }
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+库存检查记录存储模块
+
+把每次用户库存检查的结果写入本地SQLite数据库（WAL模式），
+重启后历史记录仍然保留，可用于轮次之间的对比。
+"""
+
+import time
+import uuid
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Iterable
+
+
+def get_default_observation_db_file() -> str:
+    """
+    获取默认的检查记录数据库路径
+
+    Returns:
+        数据库文件路径
+    """
+    return str(Path.home() / ".vinted_inventory" / "observations.db")
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS observations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    round_id TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    username TEXT,
+    admin_id TEXT,
+    admin_name TEXT,
+    status TEXT NOT NULL,
+    item_count INTEGER NOT NULL DEFAULT 0,
+    error_message TEXT,
+    checked_at REAL NOT NULL,
+    duration REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_observations_user ON observations (user_id, checked_at);
+CREATE INDEX IF NOT EXISTS idx_observations_round ON observations (round_id);
+"""
+
+_COLUMNS = (
+    'round_id', 'user_id', 'username', 'admin_id', 'admin_name',
+    'status', 'item_count', 'error_message', 'checked_at', 'duration'
+)
+
+
+class ObservationStore:
+    """库存检查记录存储，写入先缓存再批量提交"""
+
+    def __init__(self, db_file: Optional[str] = None, batch_size: int = 500):
+        """
+        初始化记录存储
+
+        Args:
+            db_file: 数据库文件路径，默认为用户目录下的文件
+            batch_size: 缓存多少条记录后自动提交一次
+        """
+        self.logger = logging.getLogger(__name__)
+        self.db_file = Path(db_file or get_default_observation_db_file())
+        self.batch_size = max(1, batch_size)
+
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        # 多个采集线程共用一个连接，由锁保证串行访问
+        self._conn = sqlite3.connect(str(self.db_file), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+        self._lock = threading.Lock()
+        self._buffer: List[tuple] = []
+        self.round_id = ""
+
+    def start_round(self) -> str:
+        """
+        开始新的一轮检查
+
+        Returns:
+            本轮ID
+        """
+        self.flush()
+        self.round_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        return self.round_id
+
+    def record(self, user, checked_at: float = None):
+        """
+        记录一次用户库存检查结果（先写入缓存）
+
+        Args:
+            user: 已检查的用户信息（UserInfo）
+            checked_at: 检查时间戳，默认为当前时间
+        """
+        row = (
+            self.round_id,
+            user.user_id,
+            user.username,
+            user.admin_id,
+            user.admin_name,
+            user.status,
+            user.item_count or 0,
+            user.error_message,
+            checked_at if checked_at is not None else time.time(),
+            user.check_duration or 0.0
+        )
+        with self._lock:
+            self._buffer.append(row)
+            should_flush = len(self._buffer) >= self.batch_size
+        if should_flush:
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        在一个事务中提交所有缓存的记录
+
+        Returns:
+            提交的记录数量
+        """
+        with self._lock:
+            if not self._buffer:
+                return 0
+            rows, self._buffer = self._buffer, []
+            try:
+                with self._conn:
+                    self._conn.executemany(
+                        f"INSERT INTO observations ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})",
+                        rows
+                    )
+            except sqlite3.Error as e:
+                self.logger.error(f"保存检查记录失败: {str(e)}")
+                return 0
+
+        self.logger.debug(f"已保存 {len(rows)} 条检查记录")
+        return len(rows)
+
+    def _query(self, sql: str, params: Iterable = ()) -> List[Dict]:
+        """执行查询并以字典列表返回"""
+        with self._lock:
+            cursor = self._conn.execute(sql, tuple(params))
+            names = [column[0] for column in cursor.description]
+            return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+    def get_latest(self, exclude_round: str = None) -> Dict[str, Dict]:
+        """
+        获取每个用户最近一次的检查记录
+
+        Args:
+            exclude_round: 排除的轮次ID（通常是正在进行的本轮）
+
+        Returns:
+            {user_id: 记录}
+        """
+        self.flush()
+        rows = self._query(
+            """
+            SELECT o.* FROM observations o
+            JOIN (
+                SELECT user_id, MAX(id) AS max_id FROM observations
+                WHERE round_id != ? GROUP BY user_id
+            ) latest ON o.id = latest.max_id
+            """,
+            (exclude_round or "",)
+        )
+        return {row['user_id']: row for row in rows}
+
+    def get_latest_by_admin(self, exclude_round: str = None) -> List[Dict]:
+        """
+        获取每个用户在每个管理员下最近一次的有效检查记录（出错的记录不计）
+
+        Args:
+            exclude_round: 排除的轮次ID（通常是正在进行的本轮）
+
+        Returns:
+            记录列表，同一用户被多个管理员关注时每个管理员一条
+        """
+        self.flush()
+        return self._query(
+            """
+            SELECT o.* FROM observations o
+            JOIN (
+                SELECT MAX(id) AS max_id FROM observations
+                WHERE round_id != ? AND status IN ('has_inventory', 'no_inventory')
+                GROUP BY user_id, admin_id, admin_name
+            ) latest ON o.id = latest.max_id
+            """,
+            (exclude_round or "",)
+        )
+
+    def get_last_round(self, exclude_round: str = None) -> List[Dict]:
+        """
+        获取最近一轮的全部检查记录
+
+        Args:
+            exclude_round: 排除的轮次ID（通常是正在进行的本轮）
+
+        Returns:
+            记录列表
+        """
+        self.flush()
+        return self._query(
+            """
+            SELECT * FROM observations WHERE round_id = (
+                SELECT round_id FROM observations WHERE round_id != ? ORDER BY id DESC LIMIT 1
+            )
+            """,
+            (exclude_round or "",)
+        )
+
+    def get_history(self, user_id: str, limit: int = 50) -> List[Dict]:
+        """
+        获取单个用户的检查历史（最新的在前）
+
+        Args:
+            user_id: 用户ID
+            limit: 最多返回的记录数
+
+        Returns:
+            记录列表
+        """
+        self.flush()
+        return self._query(
+            "SELECT * FROM observations WHERE user_id = ? ORDER BY checked_at DESC, id DESC LIMIT ?",
+            (user_id, limit)
+        )
+
+    def close(self):
+        """提交剩余记录并关闭数据库"""
+        self.flush()
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+页面就绪检测模块
+
+用具体的页面信号代替固定的sleep：目标元素出现、网络空闲、DOM变化静止。
+每种信号有独立的超时时间，并记录每次等待的实际耗时。
+"""
+
+import time
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import WebDriverException
+
+
+# 在页面中安装 MutationObserver 和 PerformanceObserver，返回距离最后一次DOM变化/资源加载的毫秒数
+_IDLE_PROBE_SCRIPT = """
+var w = window;
+if (!w.__vintedReadiness) {
+    var state = {lastMutation: performance.now(), lastResource: 0};
+    var entries = performance.getEntriesByType('resource');
+    for (var i = 0; i < entries.length; i++) {
+        state.lastResource = Math.max(state.lastResource, entries[i].responseEnd);
+    }
+    try {
+        new MutationObserver(function () { state.lastMutation = performance.now(); })
+            .observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+    } catch (e) {}
+    try {
+        new PerformanceObserver(function () { state.lastResource = performance.now(); })
+            .observe({entryTypes: ['resource']});
+    } catch (e) {}
+    w.__vintedReadiness = state;
+}
+var s = w.__vintedReadiness;
+var now = performance.now();
+return {
+    dom_idle_ms: now - s.lastMutation,
+    network_idle_ms: now - s.lastResource,
+    ready_state: document.readyState
+};
+"""
+
+
+@dataclass
+class ReadinessTiming:
+    """单次就绪等待记录"""
+    signal: str
+    elapsed: float
+    satisfied: bool
+    detail: str = ""
+
+
+class PageReadiness:
+    """基于页面信号的就绪等待器"""
+
+    def __init__(self, driver: webdriver.Chrome, config: Dict):
+        """
+        初始化就绪等待器
+
+        Args:
+            driver: WebDriver实例
+            config: 配置信息
+        """
+        self.driver = driver
+        self.logger = logging.getLogger(__name__)
+        self.poll_interval = config.get('readiness_poll_interval', 0.1)
+
+        # 每种信号的超时时间（秒）
+        self.timeouts = {
+            'selector': config.get('selector_wait_timeout', config.get('element_wait_timeout', 10)),
+            'network_idle': config.get('network_idle_timeout', 5),
+            'dom_quiet': config.get('dom_quiet_timeout', 3),
+        }
+        # 判定为空闲所需的静止时长（毫秒）
+        self.network_idle_ms = config.get('network_idle_ms', 500)
+        self.dom_quiet_ms = config.get('dom_quiet_ms', 300)
+
+        self.timings = deque(maxlen=200)
+        self._stats: Dict[str, Dict] = {}
+
+    def _record(self, signal: str, started: float, satisfied: bool, detail: str = "") -> ReadinessTiming:
+        """记录一次等待结果"""
+        timing = ReadinessTiming(signal, time.time() - started, satisfied, detail)
+        self.timings.append(timing)
+
+        stats = self._stats.setdefault(signal, {'count': 0, 'total_time': 0.0, 'max_time': 0.0, 'timeouts': 0})
+        stats['count'] += 1
+        stats['total_time'] += timing.elapsed
+        stats['max_time'] = max(stats['max_time'], timing.elapsed)
+        if not satisfied:
+            stats['timeouts'] += 1
+
+        self.logger.debug(f"就绪信号 {signal}: {'满足' if satisfied else '超时'}，耗时 {timing.elapsed:.2f} 秒 {detail}")
+        return timing
+
+    def wait_for_selector(self, selectors: List[str], timeout: float = None) -> Optional[str]:
+        """
+        等待任意一个CSS选择器出现
+
+        Args:
+            selectors: CSS选择器列表
+            timeout: 超时时间（秒），默认使用selector信号的超时时间
+
+        Returns:
+            首个出现的选择器，超时返回None
+        """
+        timeout = self.timeouts['selector'] if timeout is None else timeout
+        started = time.time()
+        deadline = started + timeout
+
+        while True:
+            for selector in selectors:
+                try:
+                    if self.driver.find_elements(By.CSS_SELECTOR, selector):
+                        self._record('selector', started, True, selector)
+                        return selector
+                except WebDriverException:
+                    # 页面切换过程中查找可能失败，继续轮询
+                    pass
+            if time.time() >= deadline:
+                self._record('selector', started, False, ", ".join(selectors))
+                return None
+            time.sleep(self.poll_interval)
+
+    def _wait_idle(self, signal: str, key: str, idle_ms: float, timeout: float) -> bool:
+        """轮询页面空闲探针直到指定指标静止足够长的时间"""
+        started = time.time()
+        deadline = started + timeout
+
+        while True:
+            try:
+                probe = self.driver.execute_script(_IDLE_PROBE_SCRIPT)
+            except WebDriverException:
+                probe = None
+
+            if probe is not None and not isinstance(probe, dict):
+                # 当前驱动无法返回探针结果，无法判断该信号，不做等待
+                self._record(signal, started, False, "unsupported")
+                return False
+
+            if probe and probe.get(key, 0) >= idle_ms:
+                self._record(signal, started, True)
+                return True
+
+            if time.time() >= deadline:
+                self._record(signal, started, False)
+                return False
+            time.sleep(self.poll_interval)
+
+    def wait_for_network_idle(self, timeout: float = None) -> bool:
+        """
+        等待网络空闲（一段时间内没有新的资源请求完成）
+
+        Args:
+            timeout: 超时时间（秒）
+
+        Returns:
+            是否在超时前达到空闲
+        """
+        timeout = self.timeouts['network_idle'] if timeout is None else timeout
+        return self._wait_idle('network_idle', 'network_idle_ms', self.network_idle_ms, timeout)
+
+    def wait_for_dom_quiet(self, timeout: float = None) -> bool:
+        """
+        等待DOM变化静止（滚动后懒加载内容渲染完成）
+
+        Args:
+            timeout: 超时时间（秒）
+
+        Returns:
+            是否在超时前达到静止
+        """
+        timeout = self.timeouts['dom_quiet'] if timeout is None else timeout
+        return self._wait_idle('dom_quiet', 'dom_idle_ms', self.dom_quiet_ms, timeout)
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """
+        获取各信号的等待统计
+
+        Returns:
+            {信号: {'count', 'avg_time', 'max_time', 'timeouts'}}
+        """
+        return {
+            signal: {
+                'count': stats['count'],
+                'avg_time': stats['total_time'] / stats['count'] if stats['count'] else 0.0,
+                'max_time': stats['max_time'],
+                'timeouts': stats['timeouts'],
+            }
+            for signal, stats in self._stats.items()
+        }
+
+    def reset_stats(self):
+        """清空等待统计"""
+        self.timings.clear()
+        self._stats.clear()
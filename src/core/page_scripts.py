@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+页面注入脚本
+
+通过一次execute_script调用在页面内完成整页数据提取，返回紧凑的JSON结果，
+避免逐个元素的WebDriver往返。
+"""
+
+
+# 关注列表页面提取
+# 参数: arguments[0] 没有关注任何人的提示文本列表（小写）
+#       arguments[1] 从链接文本提取用户名时需要跳过的文本列表（小写）
+# 返回: {no_following_message, username_count, has_container, members: [{user_id, href, username}]}
+FOLLOWING_EXTRACT_SCRIPT = r"""
+var noFollowingMessages = arguments[0] || [];
+var skipWords = arguments[1] || [];
+
+var bodyText = ((document.body && document.body.innerText) || '').toLowerCase();
+var noFollowingMessage = null;
+for (var i = 0; i < noFollowingMessages.length; i++) {
+    if (bodyText.indexOf(noFollowingMessages[i]) !== -1) {
+        noFollowingMessage = noFollowingMessages[i];
+        break;
+    }
+}
+
+var container = document.querySelector('div.followed-users__body');
+var links = (container || document).querySelectorAll("a[href*='/member/']");
+var members = [];
+var seen = {};
+
+function pickUsername(link) {
+    var el = link.querySelector("[data-testid='profile-username']")
+        || link.querySelector(".user-name, .username, [data-testid='username']");
+    var name = el ? (el.innerText || el.textContent || '').trim() : '';
+    if (name) {
+        return name;
+    }
+    var lines = (link.innerText || '').split('\n');
+    for (var j = 0; j < lines.length; j++) {
+        var line = lines[j].trim();
+        if (!line) {
+            continue;
+        }
+        var lower = line.toLowerCase();
+        var skip = false;
+        for (var k = 0; k < skipWords.length; k++) {
+            if (lower.indexOf(skipWords[k]) !== -1) {
+                skip = true;
+                break;
+            }
+        }
+        if (!skip) {
+            return line;
+        }
+    }
+    return '';
+}
+
+for (var n = 0; n < links.length; n++) {
+    var href = links[n].href || '';
+    if (href.indexOf('/general/') !== -1) {
+        continue;
+    }
+    var match = href.match(/\/member\/(\d+)/);
+    if (!match || seen[match[1]]) {
+        continue;
+    }
+    seen[match[1]] = true;
+    members.push({user_id: match[1], href: href, username: pickUsername(links[n])});
+}
+
+return {
+    no_following_message: noFollowingMessage,
+    username_count: document.querySelectorAll("[data-testid='profile-username']").length,
+    has_container: !!container,
+    members: members
+};
+"""
+
+
+# 用户商店页面库存探测
+# 参数: arguments[0] 空状态选择器列表
+#       arguments[1] 商品元素选择器列表（按优先级）
+#       arguments[2] 最多返回的商品文本数量
+# 返回: {empty_state, header_count, grid_count, selector, item_texts}
+INVENTORY_PROBE_SCRIPT = r"""
+var emptySelectors = arguments[0] || [];
+var itemSelectors = arguments[1] || [];
+var maxItems = arguments[2] || 20;
+
+var emptyState = false;
+for (var i = 0; i < emptySelectors.length; i++) {
+    if (document.querySelector(emptySelectors[i])) {
+        emptyState = true;
+        break;
+    }
+}
+
+var headerCount = null;
+var bodyText = ((document.body && document.body.innerText) || '').toLowerCase();
+var countMatch = bodyText.match(/(\d+)\s+items?/);
+if (countMatch) {
+    headerCount = parseInt(countMatch[1], 10);
+}
+
+var gridCount = 0;
+var usedSelector = null;
+var itemTexts = [];
+for (var j = 0; j < itemSelectors.length; j++) {
+    var items = document.querySelectorAll(itemSelectors[j]);
+    if (items.length) {
+        gridCount = items.length;
+        usedSelector = itemSelectors[j];
+        for (var k = 0; k < items.length && k < maxItems; k++) {
+            itemTexts.push((items[k].innerText || '').trim());
+        }
+        break;
+    }
+}
+
+return {
+    empty_state: emptyState,
+    header_count: headerCount,
+    grid_count: gridCount,
+    selector: usedSelector,
+    item_texts: itemTexts
+};
+"""
+
+
+# 验证/登录/错误页面探测（只读取标题、路径、少量文本和导航状态码，开销很小）
+# 参数: arguments[0] 验证页面特征选择器列表
+#       arguments[1] 验证页面特征文本列表（小写）
+#       arguments[2] 登录页面路径前缀列表
+# 返回: {kind, reason, status}，kind为challenge/login/error，正常页面为null
+BLOCK_PAGE_PROBE_SCRIPT = r"""
+var challengeSelectors = arguments[0] || [];
+var challengeTexts = arguments[1] || [];
+var loginPaths = arguments[2] || [];
+
+var nav = performance.getEntriesByType('navigation')[0];
+var status = (nav && nav.responseStatus) || 0;
+
+for (var i = 0; i < challengeSelectors.length; i++) {
+    if (document.querySelector(challengeSelectors[i])) {
+        return {kind: 'challenge', reason: challengeSelectors[i], status: status};
+    }
+}
+
+// 验证页面内容很少，只在短页面中查找特征文本，避免商品标题误判
+var bodyText = (document.body && document.body.innerText) || '';
+var text = (document.title || '').toLowerCase();
+if (bodyText.length < 3000) {
+    text += '\n' + bodyText.toLowerCase();
+}
+for (var j = 0; j < challengeTexts.length; j++) {
+    if (text.indexOf(challengeTexts[j]) !== -1) {
+        return {kind: 'challenge', reason: challengeTexts[j], status: status};
+    }
+}
+
+var path = location.pathname.toLowerCase();
+for (var k = 0; k < loginPaths.length; k++) {
+    if (path.indexOf(loginPaths[k]) === 0) {
+        return {kind: 'login', reason: location.pathname, status: status};
+    }
+}
+
+if (status === 403 || status === 429) {
+    return {kind: 'challenge', reason: 'HTTP ' + status, status: status};
+}
+if (status >= 400) {
+    return {kind: 'error', reason: 'HTTP ' + status, status: status};
+}
+return {kind: null, reason: null, status: status};
+"""
+
+
+# 在当前页面的登录会话中请求JSON接口（配合execute_async_script使用）
+# 参数: arguments[0] 请求URL
+#       arguments[1] 超时时间（毫秒）
+# 返回: {ok, status, body, error}
+FETCH_JSON_SCRIPT = r"""
+var url = arguments[0];
+var timeoutMs = arguments[1] || 10000;
+var done = arguments[arguments.length - 1];
+
+var controller = window.AbortController ? new AbortController() : null;
+var timer = setTimeout(function () {
+    if (controller) {
+        controller.abort();
+    }
+}, timeoutMs);
+
+fetch(url, {
+    credentials: 'include',
+    headers: {'Accept': 'application/json'},
+    signal: controller ? controller.signal : undefined
+}).then(function (response) {
+    return response.text().then(function (text) {
+        clearTimeout(timer);
+        done({ok: response.ok, status: response.status, body: text});
+    });
+}).catch(function (error) {
+    clearTimeout(timer);
+    done({ok: false, status: 0, error: String(error)});
+});
+"""
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+自适应请求限速模块
+
+同一域名的所有采集线程共用一个限速器，按AIMD调整请求速率：
+页面加载正常时每次检查后小幅提高速率，加载缓慢、出错或遇到验证页面时速率减半，
+两次请求的开始时间至少间隔 1/速率 秒。
+"""
+
+import time
+import logging
+import threading
+from typing import Dict, Tuple
+
+
+# 检查结果类型
+OUTCOME_OK = "ok"                # 正常
+OUTCOME_SLOW = "slow"            # 页面加载缓慢
+OUTCOME_ERROR = "error"          # 检查出错
+OUTCOME_CHALLENGE = "challenge"  # 遇到验证/拦截页面
+
+_BACKOFF_OUTCOMES = (OUTCOME_SLOW, OUTCOME_ERROR, OUTCOME_CHALLENGE)
+
+
+class AdaptiveRateLimiter:
+    """按AIMD调整速率的请求限速器（线程安全）"""
+
+    def __init__(self, initial_rate: float = 1.0, min_rate: float = 0.1, max_rate: float = 5.0,
+                 increase: float = 0.05, decrease: float = 0.5):
+        """
+        初始化限速器
+
+        Args:
+            initial_rate: 初始速率（次/秒）
+            min_rate: 最低速率（次/秒）
+            max_rate: 最高速率（次/秒）
+            increase: 每次正常检查后增加的速率（次/秒）
+            decrease: 退避时速率乘以的系数（0-1）
+        """
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        # 下一次请求最早可以开始的时间
+        self._next_slot = 0.0
+        self.configure(initial_rate, min_rate, max_rate, increase, decrease)
+
+    def configure(self, initial_rate: float, min_rate: float, max_rate: float,
+                  increase: float, decrease: float):
+        """
+        应用新的限速参数，速率从新的初始速率重新开始收敛
+
+        Args:
+            initial_rate: 初始速率（次/秒）
+            min_rate: 最低速率（次/秒）
+            max_rate: 最高速率（次/秒）
+            increase: 每次正常检查后增加的速率（次/秒）
+            decrease: 退避时速率乘以的系数（0-1）
+        """
+        with self._lock:
+            self.min_rate = max(0.001, min_rate)
+            self.max_rate = max(self.min_rate, max_rate)
+            self.increase = increase
+            self.decrease = min(max(decrease, 0.01), 1.0)
+            self._rate = min(max(initial_rate, self.min_rate), self.max_rate)
+        self.reset_stats()
+
+    @property
+    def rate(self) -> float:
+        """当前速率（次/秒）"""
+        with self._lock:
+            return self._rate
+
+    @property
+    def interval(self) -> float:
+        """当前两次请求之间的最小间隔（秒）"""
+        with self._lock:
+            return 1.0 / self._rate
+
+    def reset_stats(self):
+        """清空本轮统计（速率本身保留，下一轮从收敛后的速率继续）"""
+        with self._lock:
+            self._stats = {
+                'requests': 0,
+                'backoffs': 0,
+                'waited': 0.0,
+                'min_rate': self._rate,
+                'max_rate': self._rate,
+            }
+
+    def acquire(self) -> float:
+        """
+        等待到下一次请求可以开始的时间
+
+        多个线程同时调用时按顺序分配时间，互不重叠。
+
+        Returns:
+            实际等待的时间（秒）
+        """
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_slot)
+            self._next_slot = start + 1.0 / self._rate
+            wait = start - now
+            self._stats['requests'] += 1
+            self._stats['waited'] += wait
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def record(self, outcome: str):
+        """
+        根据一次检查的结果调整速率
+
+        Args:
+            outcome: 检查结果类型（OUTCOME_OK/SLOW/ERROR/CHALLENGE）
+        """
+        with self._lock:
+            previous = self._rate
+            if outcome in _BACKOFF_OUTCOMES:
+                self._rate = max(self.min_rate, self._rate * self.decrease)
+                self._stats['backoffs'] += 1
+                # 已分配的时间按新速率推后，立即生效
+                self._next_slot = max(self._next_slot, time.monotonic() + 1.0 / self._rate)
+            else:
+                self._rate = min(self.max_rate, self._rate + self.increase)
+            self._stats['min_rate'] = min(self._stats['min_rate'], self._rate)
+            self._stats['max_rate'] = max(self._stats['max_rate'], self._rate)
+            rate = self._rate
+
+        if outcome in _BACKOFF_OUTCOMES:
+            self.logger.info(f"请求退避（{outcome}）: 速率 {previous:.2f} -> {rate:.2f} 次/秒")
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        获取限速统计
+
+        Returns:
+            当前速率、本轮请求次数、退避次数、累计等待时间、本轮速率范围
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['rate'] = self._rate
+        return stats
+
+
+# 域名 -> (创建或上次调整时的限速参数, 限速器)
+_limiters: Dict[str, Tuple[Dict[str, float], AdaptiveRateLimiter]] = {}
+_limiters_lock = threading.Lock()
+
+
+def _limiter_settings(config: Dict) -> Dict[str, float]:
+    """从配置中读取限速参数"""
+    delay = config.get('delay_between_requests', 1)
+    max_rate = config.get('rate_limit_max_rate', 5.0)
+    return {
+        'initial_rate': 1.0 / delay if delay > 0 else max_rate,
+        'min_rate': config.get('rate_limit_min_rate', 0.1),
+        'max_rate': max_rate,
+        'increase': config.get('rate_limit_increase', 0.05),
+        'decrease': config.get('rate_limit_decrease', 0.5),
+    }
+
+
+def get_rate_limiter(domain: str, config: Dict) -> AdaptiveRateLimiter:
+    """
+    获取某个域名共用的限速器（首次调用时按配置创建，配置变化后按新参数调整）
+
+    Args:
+        domain: 域名
+        config: 配置信息
+
+    Returns:
+        限速器
+    """
+    settings = _limiter_settings(config)
+    with _limiters_lock:
+        entry = _limiters.get(domain)
+        if entry is None:
+            limiter = AdaptiveRateLimiter(**settings)
+            _limiters[domain] = (settings, limiter)
+        else:
+            previous, limiter = entry
+            if settings != previous:
+                limiter.configure(**settings)
+                _limiters[domain] = (settings, limiter)
+                limiter.logger.info(f"{domain} 的限速参数已更新，速率从 {limiter.rate:.2f} 次/秒重新开始")
+        return limiter
+
+
+def classify_outcome(status: str, duration: float, slow_seconds: float) -> str:
+    """
+    按检查状态和耗时判断结果类型
+
+    Args:
+        status: 用户检查状态
+        duration: 检查耗时（秒）
+        slow_seconds: 超过多少秒视为加载缓慢
+
+    Returns:
+        结果类型
+    """
+    if status == "error":
+        return OUTCOME_ERROR
+    if slow_seconds and duration > slow_seconds:
+        return OUTCOME_SLOW
+    return OUTCOME_OK
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+精简模式资源拦截模块
+
+库存检查只需要商品数量，不需要商品大图、字体、统计和广告脚本。
+精简模式通过CDP的Network.setBlockedURLs拦截这些请求，本轮结束时恢复正常浏览。
+每轮开始的几个页面不拦截，作为对比基准估算节省的流量和时间。
+"""
+
+import logging
+import threading
+from typing import Dict, List, Set
+
+from selenium import webdriver
+
+
+# 默认拦截的URL模式（*为通配符）
+DEFAULT_BLOCKED_URL_PATTERNS = [
+    # 商品图片和其他图片
+    "*.jpg", "*.jpeg", "*.png", "*.webp", "*.gif", "*.avif", "*.svg", "*.ico",
+    # 字体
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    # 视频
+    "*.mp4", "*.webm",
+    # 统计和广告
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*googlesyndication.com*", "*adservice.google.*", "*facebook.net*",
+    "*connect.facebook.com*", "*hotjar.com*", "*criteo.*", "*taboola.com*",
+    "*sentry.io*", "*datadoghq.com*", "*onetrust.com*", "*cookielaw.org*",
+]
+
+# 页面加载的流量和耗时（被拦截的请求没有响应状态）
+_PAGE_COST_SCRIPT = """
+var nav = performance.getEntriesByType('navigation')[0];
+var bytes = nav ? (nav.transferSize || 0) : 0;
+var blocked = 0;
+performance.getEntriesByType('resource').forEach(function(entry) {
+    bytes += entry.transferSize || 0;
+    if (entry.responseStatus === 0 && !entry.transferSize && !entry.decodedBodySize) blocked++;
+});
+var loadMs = nav ? ((nav.loadEventEnd || performance.now()) - nav.startTime) : 0;
+return {bytes: bytes, load_ms: loadMs, blocked: blocked};
+"""
+
+# 未加入任何标签页时使用的键
+MAIN_TAB = "main"
+
+
+class ResourceBlocker:
+    """单个浏览器窗口的精简模式资源拦截"""
+
+    def __init__(self, driver: webdriver.Chrome, config: Dict):
+        """
+        初始化资源拦截
+
+        Args:
+            driver: WebDriver实例（需支持execute_cdp_cmd）
+            config: 配置信息
+        """
+        self.driver = driver
+        self.logger = logging.getLogger(__name__)
+        self.enabled = bool(config.get('lean_mode', False))
+        self.patterns: List[str] = list(config.get('lean_mode_blocked_urls') or DEFAULT_BLOCKED_URL_PATTERNS)
+        # 每轮开始不拦截的页面数，用于估算节省量
+        self.baseline_pages = max(0, int(config.get('lean_mode_baseline_pages', 2)))
+
+        self._lock = threading.Lock()
+        # 已开启拦截的标签页
+        self._applied: Set[str] = set()
+        self.reset_stats()
+
+    @property
+    def active(self) -> bool:
+        """基准页面已采集完，新加载的页面应开启拦截"""
+        return self.enabled and self._stats['normal']['pages'] >= self.baseline_pages
+
+    def reset_stats(self):
+        """清空本轮统计"""
+        with self._lock:
+            self._stats = {
+                'normal': {'pages': 0, 'bytes': 0, 'load_ms': 0.0},
+                'lean': {'pages': 0, 'bytes': 0, 'load_ms': 0.0, 'blocked': 0},
+            }
+
+    def prepare(self, tab: str = MAIN_TAB):
+        """
+        在当前标签页导航前调用：拦截已生效时为该标签页开启拦截（每个标签页只设置一次）
+
+        Args:
+            tab: 当前标签页的标识
+        """
+        if not self.active or tab in self._applied:
+            return
+        try:
+            self.driver.execute_cdp_cmd('Network.enable', {})
+            self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.patterns})
+            self._applied.add(tab)
+            self.logger.debug(f"标签页 {tab} 已开启精简模式，拦截 {len(self.patterns)} 个URL模式")
+        except Exception as e:
+            self.logger.warning(f"开启精简模式失败，继续正常加载: {str(e)}")
+            self.enabled = False
+
+    def forget_tab(self, tab: str):
+        """标签页已关闭，不再需要恢复"""
+        self._applied.discard(tab)
+
+    def record_page(self, tab: str = MAIN_TAB):
+        """
+        记录当前已加载页面的流量和耗时
+
+        Args:
+            tab: 当前标签页的标识
+        """
+        if not self.enabled:
+            return
+        try:
+            cost = self.driver.execute_script(_PAGE_COST_SCRIPT)
+        except Exception as e:
+            self.logger.debug(f"读取页面流量失败: {str(e)}")
+            return
+        if not isinstance(cost, dict):
+            return
+
+        bucket = 'lean' if tab in self._applied else 'normal'
+        with self._lock:
+            stats = self._stats[bucket]
+            stats['pages'] += 1
+            stats['bytes'] += int(cost.get('bytes') or 0)
+            stats['load_ms'] += float(cost.get('load_ms') or 0)
+            if bucket == 'lean':
+                stats['blocked'] += int(cost.get('blocked') or 0)
+
+    def restore(self):
+        """关闭拦截，恢复正常浏览（在原标签页上调用）"""
+        if not self._applied:
+            return
+        try:
+            self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': []})
+            self.driver.execute_cdp_cmd('Network.disable', {})
+            self.logger.debug("已关闭精简模式")
+        except Exception as e:
+            self.logger.warning(f"关闭精简模式失败: {str(e)}")
+        self._applied.clear()
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        获取本轮的流量和耗时统计
+
+        Returns:
+            统计信息，saved_bytes/saved_ms为相对基准页面估算的节省量（没有基准时为None）
+        """
+        with self._lock:
+            normal = dict(self._stats['normal'])
+            lean = dict(self._stats['lean'])
+
+        stats = {
+            'baseline_pages': normal['pages'],
+            'lean_pages': lean['pages'],
+            'blocked_requests': lean['blocked'],
+            'lean_bytes': lean['bytes'],
+            'avg_baseline_bytes': normal['bytes'] / normal['pages'] if normal['pages'] else None,
+            'avg_lean_bytes': lean['bytes'] / lean['pages'] if lean['pages'] else None,
+            'avg_baseline_ms': normal['load_ms'] / normal['pages'] if normal['pages'] else None,
+            'avg_lean_ms': lean['load_ms'] / lean['pages'] if lean['pages'] else None,
+            'saved_bytes': None,
+            'saved_ms': None,
+        }
+        if normal['pages'] and lean['pages']:
+            stats['saved_bytes'] = max(0.0, stats['avg_baseline_bytes'] - stats['avg_lean_bytes']) * lean['pages']
+            stats['saved_ms'] = max(0.0, stats['avg_baseline_ms'] - stats['avg_lean_ms']) * lean['pages']
+        return stats
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+轮次对比模块
+
+把本轮的每条检查结果与上一轮的状态（按user_id索引）逐条对比，
+在采集过程中直接产生出库、补货、新关注、取消关注事件。
+"""
+
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Iterable, Tuple, Union
+
+
+# 事件类型
+EVENT_WENT_EMPTY = "went_empty"      # 有库存 -> 无库存
+EVENT_RESTOCKED = "restocked"        # 无库存 -> 有库存
+EVENT_NEW_FOLLOW = "new_follow"      # 管理员新关注的用户
+EVENT_UNFOLLOWED = "unfollowed"      # 管理员不再关注的用户
+
+
+@dataclass
+class DiffEvent:
+    """轮次对比事件"""
+    kind: str
+    user_id: str
+    username: str = ""
+    profile_url: str = ""
+    admin_name: str = ""
+    admin_id: str = ""
+    previous_status: str = ""
+    status: str = ""
+
+
+def _admin_key(admin_id: str, admin_name: str) -> str:
+    """管理员标识：优先使用管理员ID"""
+    return admin_id or admin_name or ""
+
+
+class RoundDiffEngine:
+    """轮次对比引擎，每条检查结果的对比都是O(1)的字典查询"""
+
+    def __init__(self):
+        """初始化对比引擎"""
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+
+        # 上一次观察到的库存状态 {(管理员, user_id): status}
+        # 按管理员区分：同一账号被多个管理员关注时，每个管理员的待补货记录都能收到补货事件
+        self._status: Dict[Tuple[str, str], str] = {}
+        # 上一轮每个管理员的关注列表 {管理员: {user_id: 用户信息}}
+        self._follows: Dict[str, Dict[str, Dict]] = {}
+        # 本轮已提取的关注列表
+        self._current_follows: Dict[str, Dict[str, Dict]] = {}
+
+        self.events: List[DiffEvent] = []
+
+    @property
+    def has_baseline(self) -> bool:
+        """是否已有上一轮的状态可供对比"""
+        return bool(self._status or self._follows)
+
+    def seed(self, latest: Union[Dict[str, Dict], Iterable[Dict]], last_round: Iterable[Dict] = ()):
+        """
+        用历史记录初始化上一轮状态（程序重启后使用）
+
+        Args:
+            latest: 每个用户在每个管理员下最近一次的检查记录（列表，或 {user_id: 记录}）
+            last_round: 最近一轮的全部检查记录，用于恢复关注列表
+        """
+        rows = latest.values() if isinstance(latest, dict) else latest
+        with self._lock:
+            for row in rows:
+                if row.get('status') in ('has_inventory', 'no_inventory'):
+                    key = _admin_key(row.get('admin_id', ''), row.get('admin_name', ''))
+                    self._status[(key, row['user_id'])] = row['status']
+            for row in last_round:
+                key = _admin_key(row.get('admin_id', ''), row.get('admin_name', ''))
+                self._follows.setdefault(key, {})[row['user_id']] = {
+                    'username': row.get('username') or '',
+                    'profile_url': '',
+                    'admin_name': row.get('admin_name') or '',
+                    'admin_id': row.get('admin_id') or ''
+                }
+        self.logger.info(f"已加载上一轮状态: {len(self._status)} 个用户，{len(self._follows)} 个管理员的关注列表")
+
+    def begin_round(self):
+        """开始新的一轮，清空本轮的关注列表和事件"""
+        with self._lock:
+            self._current_follows = {}
+            self.events = []
+
+    def observe_follow(self, user) -> Optional[DiffEvent]:
+        """
+        记录管理员关注列表中的一个用户
+
+        Args:
+            user: 用户信息（UserInfo），需已设置admin_name/admin_id
+
+        Returns:
+            上一轮不在该管理员关注列表中时返回新关注事件
+        """
+        key = _admin_key(user.admin_id, user.admin_name)
+        with self._lock:
+            self._current_follows.setdefault(key, {})[user.user_id] = {
+                'username': user.username,
+                'profile_url': user.profile_url,
+                'admin_name': user.admin_name,
+                'admin_id': user.admin_id
+            }
+            previous = self._follows.get(key)
+            # 第一次见到该管理员时没有可对比的关注列表
+            if previous is None or user.user_id in previous:
+                return None
+            event = DiffEvent(EVENT_NEW_FOLLOW, user.user_id, user.username, user.profile_url,
+                              user.admin_name, user.admin_id, status=user.status)
+            self.events.append(event)
+            return event
+
+    def observe(self, user) -> Optional[DiffEvent]:
+        """
+        对比一条检查结果与上一次的库存状态
+
+        Args:
+            user: 已检查的用户信息（UserInfo）
+
+        Returns:
+            库存状态翻转时返回出库或补货事件
+        """
+        # 出错的检查不改变已知状态
+        if user.status not in ('has_inventory', 'no_inventory'):
+            return None
+
+        status_key = (_admin_key(user.admin_id, user.admin_name), user.user_id)
+        with self._lock:
+            previous = self._status.get(status_key)
+            self._status[status_key] = user.status
+
+            if previous == 'has_inventory' and user.status == 'no_inventory':
+                kind = EVENT_WENT_EMPTY
+            elif previous == 'no_inventory' and user.status == 'has_inventory':
+                kind = EVENT_RESTOCKED
+            else:
+                return None
+
+            event = DiffEvent(kind, user.user_id, user.username, user.profile_url,
+                              user.admin_name, user.admin_id, previous, user.status)
+            self.events.append(event)
+            return event
+
+    def finish_round(self, completed_admins: Iterable[Dict]) -> List[DiffEvent]:
+        """
+        结束本轮：对成功提取了关注列表的管理员找出取消关注的用户，并保存本轮关注列表
+
+        Args:
+            completed_admins: 本轮成功提取关注列表的管理员 [{'admin_name', 'user_id'}, ...]
+
+        Returns:
+            取消关注事件列表
+        """
+        unfollowed = []
+        with self._lock:
+            for admin_data in completed_admins:
+                key = _admin_key(admin_data.get('user_id', ''), admin_data.get('admin_name', ''))
+                current = self._current_follows.get(key, {})
+                previous = self._follows.get(key)
+                if previous is not None:
+                    for user_id, info in previous.items():
+                        if user_id not in current:
+                            unfollowed.append(DiffEvent(
+                                EVENT_UNFOLLOWED, user_id, info['username'], info['profile_url'],
+                                info['admin_name'], info['admin_id'],
+                                previous_status=self._status.get((key, user_id), '')
+                            ))
+                self._follows[key] = current
+            self.events.extend(unfollowed)
+        return unfollowed
+
+    def get_summary(self) -> Dict[str, int]:
+        """
+        获取本轮事件统计
+
+        Returns:
+            {事件类型: 数量}
+        """
+        summary = {EVENT_WENT_EMPTY: 0, EVENT_RESTOCKED: 0, EVENT_NEW_FOLLOW: 0, EVENT_UNFOLLOWED: 0}
+        for event in self.events:
+            summary[event.kind] = summary.get(event.kind, 0) + 1
+        return summary
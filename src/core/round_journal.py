@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+轮次断点记录模块
+
+一轮采集过程中，把已提取的管理员关注列表和已检查的用户逐行追加到本地JSONL文件。
+浏览器或驱动中途崩溃后，下一次采集同一组管理员时，在有效期内从第一个未检查的用户继续，
+不需要从头再跑一整轮。整轮完成后记录作废，下一轮重新开始。
+"""
+
+import json
+import time
+import logging
+import hashlib
+import threading
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+def get_default_round_journal_file() -> str:
+    """
+    获取默认的轮次断点记录文件路径
+
+    Returns:
+        记录文件路径
+    """
+    return str(Path.home() / ".vinted_inventory" / "round_journal.jsonl")
+
+
+# 可以跳过的检查结果（出错的用户继续时重新检查）
+RESUMABLE_STATUSES = ("has_inventory", "no_inventory")
+
+
+class RoundJournal:
+    """一轮采集的断点记录"""
+
+    def __init__(self, journal_file: Optional[str] = None, max_age: float = 1800):
+        """
+        初始化断点记录
+
+        Args:
+            journal_file: 记录文件路径，默认为用户目录下的文件
+            max_age: 有效期（秒），超过有效期的未完成轮次不再继续
+        """
+        self.logger = logging.getLogger(__name__)
+        self.journal_file = Path(journal_file or get_default_round_journal_file())
+        self.max_age = max_age
+
+        self.journal_file.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._file = None
+        self.round_key = ""
+        self.started_at = 0.0
+        self.resumed = False
+        # 管理员名称 -> 关注用户列表（字典形式）
+        self._admins: Dict[str, List[Dict]] = {}
+        # (管理员名称, 用户ID) -> 检查结果（字典形式）
+        self._checked: Dict[tuple, Dict] = {}
+
+    @staticmethod
+    def make_round_key(admin_urls: List[Dict]) -> str:
+        """
+        按管理员列表生成轮次标识，管理员列表变化后不会继续旧的记录
+
+        Args:
+            admin_urls: 管理员URL列表
+
+        Returns:
+            轮次标识
+        """
+        raw = json.dumps([[a.get('admin_name'), a.get('url')] for a in admin_urls], ensure_ascii=False)
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def begin(self, admin_urls: List[Dict]) -> bool:
+        """
+        开始一轮采集：有效期内有同一组管理员的未完成记录时继续，否则重新记录
+
+        Args:
+            admin_urls: 管理员URL列表
+
+        Returns:
+            是否从上次中断处继续
+        """
+        round_key = self.make_round_key(admin_urls)
+        with self._lock:
+            self._close_file()
+            header, admins, checked = self._load()
+            fresh = (
+                header is not None
+                and header.get('key') == round_key
+                and not header.get('finished')
+                and time.time() - header.get('started_at', 0) <= self.max_age
+            )
+
+            self.round_key = round_key
+            if fresh:
+                self.started_at = header['started_at']
+                self._admins = admins
+                self._checked = checked
+                self._file = open(self.journal_file, 'a', encoding='utf-8')
+            else:
+                self.started_at = time.time()
+                self._admins = {}
+                self._checked = {}
+                self._file = open(self.journal_file, 'w', encoding='utf-8')
+                self._write({'type': 'round', 'key': round_key, 'started_at': self.started_at})
+            self.resumed = fresh
+
+        if fresh:
+            self.logger.info(f"继续上次中断的轮次：已提取 {len(admins)} 个管理员，已检查 {len(checked)} 个用户")
+        return fresh
+
+    def _load(self):
+        """读取记录文件，崩溃时写了一半的最后一行直接忽略"""
+        header = None
+        admins: Dict[str, List[Dict]] = {}
+        checked: Dict[tuple, Dict] = {}
+        try:
+            if not self.journal_file.exists():
+                return None, admins, checked
+            with open(self.journal_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    kind = entry.get('type')
+                    if kind == 'round':
+                        header = entry
+                    elif kind == 'admin':
+                        admins[entry['admin_name']] = entry['users']
+                    elif kind == 'user':
+                        user = entry['user']
+                        checked[(user.get('admin_name', ''), user['user_id'])] = user
+                    elif kind == 'finished' and header is not None:
+                        header['finished'] = True
+        except Exception as e:
+            self.logger.warning(f"读取轮次断点记录失败，重新开始: {str(e)}")
+            return None, {}, {}
+        return header, admins, checked
+
+    def _write(self, entry: Dict):
+        """追加一行并立即写入文件（调用方持有锁）"""
+        if self._file is None:
+            return
+        try:
+            self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._file.flush()
+        except Exception as e:
+            self.logger.warning(f"写入轮次断点记录失败: {str(e)}")
+
+    def resolved_users(self, admin_name: str) -> Optional[List[Dict]]:
+        """
+        获取本轮已提取的管理员关注列表
+
+        Args:
+            admin_name: 管理员名称
+
+        Returns:
+            关注用户列表（字典形式），尚未提取时返回None
+        """
+        with self._lock:
+            users = self._admins.get(admin_name)
+            return [dict(user) for user in users] if users is not None else None
+
+    def record_admin(self, admin_name: str, users: List) -> None:
+        """
+        记录已提取的管理员关注列表
+
+        Args:
+            admin_name: 管理员名称
+            users: 关注用户列表（UserInfo）
+        """
+        data = [asdict(user) for user in users]
+        with self._lock:
+            self._admins[admin_name] = data
+            self._write({'type': 'admin', 'admin_name': admin_name, 'users': data})
+
+    def checked_user(self, admin_name: str, user_id: str) -> Optional[Dict]:
+        """
+        获取本轮已完成的检查结果
+
+        Args:
+            admin_name: 管理员名称
+            user_id: 用户ID
+
+        Returns:
+            检查结果（字典形式），尚未检查时返回None
+        """
+        with self._lock:
+            user = self._checked.get((admin_name, user_id))
+            return dict(user) if user is not None else None
+
+    def record_check(self, user) -> None:
+        """
+        记录已完成的检查结果（出错的结果不记录，继续时重新检查）
+
+        Args:
+            user: 已检查的用户信息（UserInfo）
+        """
+        if user.status not in RESUMABLE_STATUSES:
+            return
+        data = asdict(user)
+        with self._lock:
+            self._checked[(user.admin_name, user.user_id)] = data
+            self._write({'type': 'user', 'user': data})
+
+    def finish(self) -> None:
+        """整轮完成，下一轮重新开始"""
+        with self._lock:
+            self._write({'type': 'finished', 'finished_at': time.time()})
+            self._close_file()
+            self._admins = {}
+            self._checked = {}
+
+    def _close_file(self):
+        if self._file is not None:
+            try:
+                self._file.close()
+            except Exception:
+                pass
+            self._file = None
+
+    def close(self) -> None:
+        """关闭记录文件（未完成的轮次保留，下次继续）"""
+        with self._lock:
+            self._close_file()
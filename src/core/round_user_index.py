@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+本轮用户索引模块
+
+多个管理员关注同一个账号时，按user_id记录该账号属于哪些管理员，
+每轮只检查一次，检查结果复制给其他管理员的用户记录（汇总和提醒照常按管理员进行）。
+"""
+
+import threading
+from typing import Dict, List
+
+
+# 检查结果字段，复制给同一账号在其他管理员下的记录
+RESULT_FIELDS = ('status', 'item_count', 'items', 'error_message', 'check_duration')
+
+# 可以复用的检查结果（出错的账号在其他管理员下重新检查）
+REUSABLE_STATUSES = ("has_inventory", "no_inventory")
+
+
+class RoundUserIndex:
+    """本轮按user_id索引的用户表"""
+
+    def __init__(self):
+        """初始化用户索引"""
+        self._lock = threading.Lock()
+        # user_id -> 该账号在各管理员下的用户记录
+        self._owners: Dict[str, List] = {}
+        # user_id -> 本轮已完成的检查结果
+        self._results: Dict[str, object] = {}
+        self.reused = 0
+
+    def reset(self):
+        """开始新的一轮"""
+        with self._lock:
+            self._owners = {}
+            self._results = {}
+            self.reused = 0
+
+    def add(self, user) -> bool:
+        """
+        加入一个管理员的关注用户
+
+        Args:
+            user: 用户信息（UserInfo）
+
+        Returns:
+            是否为该账号在本轮的第一条记录
+        """
+        with self._lock:
+            owners = self._owners.setdefault(user.user_id, [])
+            owners.append(user)
+            return len(owners) == 1
+
+    def record(self, user):
+        """
+        记录检查结果（出错的结果不复用）
+
+        Args:
+            user: 已检查的用户信息
+        """
+        if user.status not in REUSABLE_STATUSES:
+            return
+        with self._lock:
+            self._results[user.user_id] = user
+
+    def apply_result(self, user) -> bool:
+        """
+        本轮已检查过该账号时，把结果复制到这条用户记录
+
+        Args:
+            user: 待检查的用户信息
+
+        Returns:
+            是否已复制检查结果
+        """
+        with self._lock:
+            result = self._results.get(user.user_id)
+            if result is None or result is user:
+                return False
+            for field in RESULT_FIELDS:
+                value = getattr(result, field)
+                setattr(user, field, list(value) if isinstance(value, list) else value)
+            self.reused += 1
+            return True
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        获取本轮的去重统计
+
+        Returns:
+            {'unique': 不重复账号数, 'shared': 被多个管理员关注的账号数, 'reused': 复用检查结果的次数}
+        """
+        with self._lock:
+            return {
+                'unique': len(self._owners),
+                'shared': sum(1 for owners in self._owners.values() if len(owners) > 1),
+                'reused': self.reused,
+            }
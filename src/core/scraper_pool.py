@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+多窗口并行采集模块
+
+每个比特浏览器窗口对应一个VintedScraper，工作线程从共享队列中领取任务，
+所有窗口的检查结果合并为一个ScrapingResult。
+"""
+
+import time
+import queue
+import logging
+import threading
+from typing import List, Dict, Optional, Callable
+
+from .vinted_scraper import VintedScraper, UserInfo, ScrapingResult, BLOCK_KIND_CHALLENGE, BLOCK_KIND_LOGIN, CHECK_SKIPPED
+from .round_user_index import RoundUserIndex
+
+
+class ScraperPool:
+    """多窗口并行采集器，对外接口与VintedScraper保持一致"""
+
+    def __init__(self, scrapers: List[VintedScraper], config: Dict):
+        """
+        初始化并行采集器
+
+        Args:
+            scrapers: 采集器列表，每个采集器绑定一个浏览器窗口
+            config: 配置信息
+        """
+        if not scrapers:
+            raise ValueError("至少需要一个采集器")
+
+        self.scrapers = scrapers
+        self.config = config
+        self.logger = logging.getLogger(__name__)
+        for i, scraper in enumerate(scrapers):
+            scraper.circuit_breaker.name = f"窗口{i + 1}"
+
+        # 回调函数
+        self.progress_callback: Optional[Callable] = None
+        self.status_callback: Optional[Callable] = None
+
+        # 结果归类和进度统计需要加锁
+        self._lock = threading.Lock()
+        self._completed = 0
+        # 本轮按user_id索引的用户，多个管理员关注的账号只检查一次
+        self.user_index = RoundUserIndex()
+
+        # 停止标志
+        self.should_stop = False
+
+    @property
+    def size(self) -> int:
+        """工作窗口数量"""
+        return len(self.scrapers)
+
+    def set_callbacks(self, progress_callback: Callable = None, status_callback: Callable = None, inventory_callback: Callable = None, restocked_callback: Callable = None):
+        """
+        设置回调函数，同时下发给每个窗口的采集器
+
+        Args:
+            progress_callback: 进度回调函数 (current, total, message)
+            status_callback: 状态回调函数 (message)
+            inventory_callback: 库存提醒回调函数 (username, admin_name)
+            restocked_callback: 补货回调函数 (username, admin_name)
+        """
+        self.progress_callback = progress_callback
+        self.status_callback = status_callback
+        for scraper in self.scrapers:
+            # 单个窗口的进度没有意义，进度由采集池统一汇总
+            scraper.set_callbacks(
+                status_callback=status_callback,
+                inventory_callback=inventory_callback,
+                restocked_callback=restocked_callback
+            )
+
+    def stop_scraping(self):
+        """停止所有窗口的采集"""
+        self.should_stop = True
+        for scraper in self.scrapers:
+            scraper.stop_scraping()
+        self.logger.info("收到停止采集信号")
+
+    def _update_progress(self, current: int, total: int, message: str = ""):
+        """更新进度"""
+        if self.progress_callback:
+            self.progress_callback(current, total, message)
+
+    def _update_status(self, message: str):
+        """更新状态"""
+        self.logger.info(message)
+        if self.status_callback:
+            self.status_callback(message)
+
+    def _shared_components(self, attr: str) -> List:
+        """获取各窗口采集器的某个组件（共享实例只返回一次）"""
+        components = []
+        for scraper in self.scrapers:
+            component = getattr(scraper, attr)
+            if component is not None and all(component is not c for c in components):
+                components.append(component)
+        return components
+
+    def _run_workers(self, task_queue: queue.Queue, handler: Callable, name: str):
+        """
+        启动与窗口数量相同的工作线程消费任务队列，全部完成后返回
+
+        队列暂时为空时工作线程不退出：其他窗口正在处理的任务可能被转回队列（遇到拦截或
+        复用结果失败），所有任务都完成（task_done）后才结束。
+
+        Args:
+            task_queue: 任务队列
+            handler: 任务处理函数 (scraper, task)
+            name: 线程名前缀
+        """
+        def all_done() -> bool:
+            with task_queue.all_tasks_done:
+                return task_queue.unfinished_tasks == 0
+
+        def worker(scraper: VintedScraper):
+            while not self.should_stop and not all_done():
+                # 熔断冷却中的窗口不领取任务，由其他窗口处理，冷却结束后再试探
+                remaining = scraper.circuit_breaker.remaining()
+                if remaining > 0:
+                    time.sleep(min(1.0, remaining))
+                    continue
+                try:
+                    task = task_queue.get(timeout=0.2)
+                except queue.Empty:
+                    continue
+                try:
+                    handler(scraper, task)
+                finally:
+                    task_queue.task_done()
+
+        threads = [
+            threading.Thread(target=worker, args=(scraper,), name=f"{name}-{i + 1}", daemon=True)
+            for i, scraper in enumerate(self.scrapers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def scrape_multiple_admins(self, admin_urls: List[Dict]) -> ScrapingResult:
+        """
+        并行采集多个管理员的关注列表和库存信息
+
+        Args:
+            admin_urls: 管理员URL列表，格式：[{'admin_name': '管理员1', 'url': 'xxx'}, ...]
+
+        Returns:
+            合并后的采集结果
+        """
+        start_time = time.time()
+        self.should_stop = False
+        for scraper in self.scrapers:
+            scraper.should_stop = False
+            scraper._reset_round_stats()
+        for store in self._shared_components('observation_store'):
+            store.start_round()
+        for engine in self._shared_components('diff_engine'):
+            engine.begin_round()
+        for journal in self._shared_components('round_journal'):
+            if journal.begin(admin_urls):
+                self._update_status("从上次中断处继续本轮采集...")
+
+        admin_summary = {}
+        users_with_inventory = []
+        users_without_inventory = []
+        users_with_errors = []
+
+        try:
+            self._update_status(f"使用 {self.size} 个窗口并行处理 {len(admin_urls)} 个管理员的关注列表...")
+
+            # 第一步：各窗口并行提取管理员关注列表
+            admin_queue = queue.Queue()
+            for admin_data in admin_urls:
+                admin_queue.put(admin_data)
+
+            def extract_admin(scraper: VintedScraper, admin_data: Dict):
+                admin_name = admin_data['admin_name']
+                admin_url = admin_data['url']
+                try:
+                    users = scraper._resolve_admin_users(admin_data, self._lock)
+                    summary = {
+                        'url': admin_url,
+                        'following_count': len(users),
+                        'users': users
+                    }
+                except Exception as e:
+                    self.logger.error(f"处理 {admin_name} 失败: {str(e)}")
+                    summary = {
+                        'url': admin_url,
+                        'following_count': 0,
+                        'error': str(e),
+                        'users': []
+                    }
+                with self._lock:
+                    admin_summary[admin_name] = summary
+
+            self._run_workers(admin_queue, extract_admin, "admin-worker")
+
+            if self.should_stop:
+                raise Exception("用户取消操作")
+
+            # 保持与输入顺序一致的汇总
+            admin_summary = {
+                admin_data['admin_name']: admin_summary[admin_data['admin_name']]
+                for admin_data in admin_urls
+                if admin_data['admin_name'] in admin_summary
+            }
+            all_users = [user for summary in admin_summary.values() for user in summary['users']]
+
+            if not all_users:
+                raise Exception("未找到任何关注用户")
+
+            # 第二步：各窗口从共享队列领取用户并检查库存
+            total = len(all_users)
+            self._completed = 0
+            self._update_status(f"开始使用 {self.size} 个窗口检查 {total} 个用户库存...")
+
+            # 本轮中断前已检查的用户直接使用记录的结果；
+            # 多个管理员关注的账号只排队一次，其余管理员等待复用检查结果
+            user_queue = queue.Queue()
+            self.user_index.reset()
+            waiting: Dict[str, List[UserInfo]] = {}
+            restored = 0
+            restorer = self.scrapers[0]
+            for user in all_users:
+                first = self.user_index.add(user)
+                if restorer._restore_checked_user(user) is not None:
+                    self.user_index.record(user)
+                    restorer._classify_user(user, users_with_inventory, users_without_inventory, users_with_errors)
+                    restored += 1
+                elif self.user_index.apply_result(user):
+                    restorer._handle_checked_user(user, users_with_inventory, users_without_inventory, users_with_errors)
+                elif first:
+                    user_queue.put(user)
+                else:
+                    waiting.setdefault(user.user_id, []).append(user)
+            self._completed = total - user_queue.qsize() - sum(len(users) for users in waiting.values())
+            if restored:
+                self.logger.info(f"已有 {restored} 个用户在本轮检查过，跳过")
+            if waiting:
+                self.logger.info(f"{len(waiting)} 个账号被多个管理员关注，每个只检查一次")
+
+            # 遇到拦截被转给其他窗口的次数
+            reroutes: Dict[int, int] = {}
+
+            def check_user(scraper: VintedScraper, user: UserInfo):
+                updated_user = scraper._check_user_safely(user)
+                scraper._report_check(updated_user)
+
+                if scraper.last_check_outcome in (BLOCK_KIND_CHALLENGE, BLOCK_KIND_LOGIN, CHECK_SKIPPED):
+                    with self._lock:
+                        attempts = reroutes.get(id(user), 0)
+                        if attempts < self.size:
+                            # 交给其他窗口重新检查（本窗口已暂停，不再领取任务）
+                            reroutes[id(user)] = attempts + 1
+                            user.status = "unknown"
+                            user.error_message = ""
+                            user_queue.put(user)
+                            self.logger.info(f"{scraper.circuit_breaker.name} 被拦截，{user.username} 转给其他窗口检查")
+                            return
+
+                # 锁内只更新索引和归类，记录、对比和提醒回调在锁外执行，不阻塞其他窗口
+                with self._lock:
+                    self.user_index.record(updated_user)
+                    resolved = [updated_user]
+
+                    # 同一账号在其他管理员下的记录复用本次结果，检查出错时交给下一个管理员重新检查
+                    shared = waiting.pop(updated_user.user_id, [])
+                    while shared and self.user_index.apply_result(shared[0]):
+                        resolved.append(shared.pop(0))
+                    if shared:
+                        user_queue.put(shared.pop(0))
+                        if shared:
+                            waiting[updated_user.user_id] = shared
+
+                    for resolved_user in resolved:
+                        scraper._classify_user(
+                            resolved_user,
+                            users_with_inventory,
+                            users_without_inventory,
+                            users_with_errors
+                        )
+                    self._completed += len(resolved)
+                    completed = self._completed
+
+                for resolved_user in resolved:
+                    scraper._process_checked_user(resolved_user)
+
+                self._update_progress(completed, total, f"检查 {updated_user.admin_name} 的用户: {updated_user.username}")
+
+                # 添加延迟避免请求过快
+                scraper._wait_between_requests()
+
+            self._run_workers(user_queue, check_user, "check-worker")
+
+            # 与上一轮对比（共享引擎只结束一次）
+            diff_events = []
+            if not self.should_stop:
+                finished = []
+                for scraper in self.scrapers:
+                    if scraper.diff_engine is not None and all(scraper.diff_engine is not e for e in finished):
+                        finished.append(scraper.diff_engine)
+                        diff_events.extend(scraper._finish_diff_round(admin_urls, admin_summary))
+                for journal in self._shared_components('round_journal'):
+                    journal.finish()
+
+            # 创建结果对象
+            scraping_time = time.time() - start_time
+            timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+
+            result = ScrapingResult(
+                admin_urls=admin_urls,
+                total_users=total,
+                users_with_inventory=users_with_inventory,
+                users_without_inventory=users_without_inventory,
+                users_with_errors=users_with_errors,
+                scraping_time=scraping_time,
+                timestamp=timestamp,
+                admin_summary=admin_summary,
+                diff_events=diff_events
+            )
+
+            self._update_status(f"采集完成！耗时 {scraping_time:.1f} 秒")
+            self._update_progress(total, total, "采集完成")
+            for scraper in self.scrapers:
+                scraper._log_round_stats()
+                scraper.selector_registry.save()
+            index_stats = self.user_index.get_stats()
+            if index_stats['shared']:
+                self.logger.info(
+                    f"本轮 {index_stats['unique']} 个账号中有 {index_stats['shared']} 个被多个管理员关注，"
+                    f"复用检查结果 {index_stats['reused']} 次"
+                )
+
+            return result
+
+        except Exception as e:
+            self.logger.error(f"多窗口并行采集过程失败: {str(e)}")
+            raise
+        finally:
+            for scraper in self.scrapers:
+                scraper.resource_blocker.restore()
+            for store in self._shared_components('observation_store'):
+                store.flush()
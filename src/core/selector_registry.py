@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+自适应选择器注册表
+
+按页面类型和域名记录每个CSS选择器的命中情况，下次优先尝试上次成功的选择器，
+连续失败的选择器排到最后。统计数据保存在用户目录下，重启后继续生效。
+"""
+
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+def get_default_selector_stats_file() -> str:
+    """
+    获取默认的选择器统计文件路径
+
+    Returns:
+        统计文件路径
+    """
+    return str(Path.home() / ".vinted_inventory" / "selector_stats.json")
+
+
+class SelectorRegistry:
+    """记录选择器命中情况并给出尝试顺序"""
+
+    def __init__(self, stats_file: Optional[str] = None, demote_after: int = 3):
+        """
+        初始化选择器注册表
+
+        Args:
+            stats_file: 统计文件路径，默认为用户目录下的文件
+            demote_after: 连续失败多少次后降级到末尾
+        """
+        self.logger = logging.getLogger(__name__)
+        self.stats_file = Path(stats_file or get_default_selector_stats_file())
+        self.demote_after = demote_after
+
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._data: Dict[str, Dict] = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        """从文件加载统计数据"""
+        try:
+            if self.stats_file.exists():
+                with open(self.stats_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if isinstance(data, dict):
+                    return data
+        except Exception as e:
+            self.logger.warning(f"加载选择器统计失败，重新开始统计: {str(e)}")
+        return {}
+
+    @staticmethod
+    def _key(page_type: str, domain: str) -> str:
+        return f"{page_type}@{domain or 'default'}"
+
+    def order(self, page_type: str, domain: str, selectors: List[str]) -> List[str]:
+        """
+        获取选择器的尝试顺序
+
+        Args:
+            page_type: 页面类型，如 following_links、inventory_items
+            domain: 页面域名
+            selectors: 代码中定义的选择器列表（默认顺序）
+
+        Returns:
+            上次成功的选择器在前、连续失败的选择器在后的列表
+        """
+        with self._lock:
+            entry = self._data.get(self._key(page_type, domain))
+            if not entry:
+                return list(selectors)
+
+            stats = entry.get('selectors', {})
+            preferred = entry.get('preferred')
+
+            def demoted(selector: str) -> bool:
+                return stats.get(selector, {}).get('consecutive_misses', 0) >= self.demote_after
+
+            ordered = [preferred] if preferred in selectors else []
+            ordered += [s for s in selectors if s not in ordered and not demoted(s)]
+            ordered += sorted(
+                (s for s in selectors if s not in ordered),
+                key=lambda s: stats.get(s, {}).get('consecutive_misses', 0)
+            )
+            return ordered
+
+    def record(self, page_type: str, domain: str, selector: str, hit: bool):
+        """
+        记录一次选择器尝试结果
+
+        Args:
+            page_type: 页面类型
+            domain: 页面域名
+            selector: CSS选择器
+            hit: 是否找到有效元素
+        """
+        with self._lock:
+            entry = self._data.setdefault(self._key(page_type, domain), {'preferred': None, 'selectors': {}})
+            stats = entry['selectors'].setdefault(selector, {'hits': 0, 'misses': 0, 'consecutive_misses': 0})
+            if hit:
+                stats['hits'] += 1
+                stats['consecutive_misses'] = 0
+                if entry.get('preferred') != selector:
+                    self.logger.info(f"选择器切换 {page_type}: '{selector}'")
+                entry['preferred'] = selector
+            else:
+                stats['misses'] += 1
+                stats['consecutive_misses'] += 1
+            self._dirty = True
+
+    def record_attempts(self, page_type: str, domain: str, tried: List[str], matched: Optional[str]):
+        """
+        根据一次页面解析结果记录命中和失败
+
+        只有在后面的选择器成功时，前面未命中的选择器才计为失败，
+        避免把空页面（如没有商品的商店）误判为选择器失效。
+
+        Args:
+            page_type: 页面类型
+            domain: 页面域名
+            tried: 按尝试顺序排列的选择器列表
+            matched: 最终成功的选择器，全部未命中时为None
+        """
+        if not matched or matched not in tried:
+            return
+        for selector in tried[:tried.index(matched)]:
+            self.record(page_type, domain, selector, False)
+        self.record(page_type, domain, matched, True)
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """
+        获取选择器统计
+
+        Returns:
+            {页面类型@域名: {'preferred': 首选选择器, 'selectors': {选择器: {'hits', 'misses', 'consecutive_misses'}}}}
+        """
+        with self._lock:
+            return json.loads(json.dumps(self._data))
+
+    def save(self) -> bool:
+        """
+        保存统计数据（没有变化时不写文件）
+
+        Returns:
+            是否保存成功
+        """
+        with self._lock:
+            if not self._dirty:
+                return True
+            try:
+                self.stats_file.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.stats_file, 'w', encoding='utf-8') as f:
+                    json.dump(self._data, f, indent=2, ensure_ascii=False)
+                self._dirty = False
+                return True
+            except Exception as e:
+                self.logger.error(f"保存选择器统计失败: {str(e)}")
+                return False
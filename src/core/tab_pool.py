@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+单窗口多标签页轮换模块
+
+在同一个比特浏览器窗口（同一套指纹和代理）中打开多个标签页，
+一个标签页加载时解析另一个标签页，提高单窗口的检查吞吐量。
+"""
+
+import time
+import logging
+from typing import Callable, Dict, List, Optional
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+
+from ..utils.helpers import is_same_page
+
+
+# 导航前在旧页面上打的标记，新页面加载后标记自然消失
+_NAVIGATE_SCRIPT = "window.__vintedTabPending = true; window.location.href = arguments[0];"
+# 新页面可以解析时返回当前地址，仍是旧页面或正在解析时返回null
+_READY_SCRIPT = "return (!window.__vintedTabPending && document.readyState !== 'loading') ? location.href : null;"
+# 加载超时：新页面已开始解析时停止加载，返回当前地址；仍是旧页面时返回null
+_STOP_IF_COMMITTED_SCRIPT = "if (window.__vintedTabPending) { return null; } window.stop(); return location.href;"
+
+
+class TabPool:
+    """单个WebDriver会话内的标签页池"""
+
+    def __init__(self, driver: webdriver.Chrome, size: int, page_load_timeout: float = 15):
+        """
+        初始化标签页池
+
+        Args:
+            driver: WebDriver实例
+            size: 标签页数量（包含当前标签页）
+            page_load_timeout: 单个标签页加载超时时间（秒）
+        """
+        self.driver = driver
+        self.size = max(1, size)
+        self.page_load_timeout = page_load_timeout
+        self.logger = logging.getLogger(__name__)
+        self.handles: List[str] = []
+        self._original_handle: Optional[str] = None
+        self._current_handle: Optional[str] = None
+        # 每个标签页正在加载的目标地址
+        self._targets: Dict[str, str] = {}
+        # 最近一次等待完成时标签页的地址
+        self.last_url: Optional[str] = None
+        # 最近一次等待是否加载超时后停止加载继续使用
+        self.last_soft_timeout = False
+        self.soft_timeouts = 0
+
+    def open(self) -> List[str]:
+        """
+        打开标签页，当前标签页作为第一个
+
+        Returns:
+            标签页句柄列表
+        """
+        self._original_handle = self.driver.current_window_handle
+        self._current_handle = self._original_handle
+        self.handles = [self._original_handle]
+
+        for _ in range(self.size - 1):
+            try:
+                self.driver.switch_to.new_window('tab')
+                self._current_handle = self.driver.current_window_handle
+                self.handles.append(self._current_handle)
+            except WebDriverException as e:
+                self.logger.warning(f"打开新标签页失败: {str(e)}")
+                break
+
+        self._switch(self._original_handle)
+        self.logger.info(f"已打开 {len(self.handles)} 个标签页")
+        return self.handles
+
+    def _switch(self, handle: str):
+        """切换到指定标签页（已在该标签页时不发送命令）"""
+        if handle != self._current_handle:
+            self.driver.switch_to.window(handle)
+            self._current_handle = handle
+
+    def navigate(self, handle: str, url: str, before_navigate: Optional[Callable[[], None]] = None):
+        """
+        在指定标签页中发起导航，不等待页面加载完成
+
+        Args:
+            handle: 标签页句柄
+            url: 目标URL
+            before_navigate: 切换到该标签页后、导航前调用（如设置该标签页的网络拦截）
+        """
+        # 导航失败时该标签页没有目标地址，on_target 不会把旧页面当成目标页面
+        self._targets.pop(handle, None)
+        self._switch(handle)
+        if before_navigate:
+            before_navigate()
+        self.driver.execute_script(_NAVIGATE_SCRIPT, url)
+        self._targets[handle] = url
+
+    def wait_ready(self, handle: str, poll_interval: float = 0.2) -> bool:
+        """
+        切换到指定标签页并等待导航完成
+
+        超时时如果目标页面已开始解析，停止加载并继续使用（软超时，last_soft_timeout为True）。
+
+        Args:
+            handle: 标签页句柄
+            poll_interval: 轮询间隔（秒）
+
+        Returns:
+            是否可以解析该标签页
+        """
+        self._switch(handle)
+        self.last_soft_timeout = False
+        self.last_url = None
+        deadline = time.time() + self.page_load_timeout
+        while time.time() < deadline:
+            try:
+                current_url = self.driver.execute_script(_READY_SCRIPT)
+                if current_url:
+                    self.last_url = current_url
+                    return True
+            except WebDriverException:
+                # 导航过程中执行脚本可能失败，继续轮询
+                pass
+            time.sleep(poll_interval)
+
+        try:
+            current_url = self.driver.execute_script(_STOP_IF_COMMITTED_SCRIPT)
+        except WebDriverException:
+            return False
+        target = self._targets.get(handle)
+        if isinstance(current_url, str) and target and is_same_page(current_url, target):
+            self.logger.warning(f"标签页加载超时，已停止加载并继续解析: {target}")
+            self.last_url = current_url
+            self.last_soft_timeout = True
+            self.soft_timeouts += 1
+            return True
+        return False
+
+    def on_target(self, handle: str) -> bool:
+        """
+        最近一次等待完成的页面是否为该标签页导航的目标页面
+
+        Args:
+            handle: 标签页句柄
+
+        Returns:
+            是否为目标页面（导航失败或停留在旧页面时返回False）
+        """
+        target = self._targets.get(handle)
+        return bool(target and isinstance(self.last_url, str) and is_same_page(self.last_url, target))
+
+    def close(self):
+        """关闭额外打开的标签页并切回原标签页"""
+        for handle in self.handles:
+            if handle == self._original_handle:
+                continue
+            try:
+                self._switch(handle)
+                self.driver.close()
+            except WebDriverException as e:
+                self.logger.debug(f"关闭标签页失败: {str(e)}")
+        self._current_handle = None
+        if self._original_handle:
+            try:
+                self._switch(self._original_handle)
+            except WebDriverException as e:
+                self.logger.warning(f"切回原标签页失败: {str(e)}")
+        self.handles = []
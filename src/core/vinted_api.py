@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+浏览器内Vinted JSON接口客户端
+
+在已登录的比特浏览器会话中通过fetch()调用Vinted的JSON接口，
+不需要渲染页面即可获取用户的商品数量和关注列表。
+"""
+
+import json
+import logging
+import urllib.parse
+from typing import Dict, Iterator, List
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+
+from .page_scripts import FETCH_JSON_SCRIPT
+
+
+class VintedApiError(Exception):
+    """Vinted接口调用失败"""
+    pass
+
+
+class InBrowserApiClient:
+    """通过页面内fetch()调用Vinted JSON接口的客户端"""
+
+    def __init__(self, driver: webdriver.Chrome, config: Dict):
+        """
+        初始化接口客户端
+
+        Args:
+            driver: WebDriver实例（需已打开Vinted页面以共享登录状态）
+            config: 配置信息
+        """
+        self.driver = driver
+        self.logger = logging.getLogger(__name__)
+        self.timeout = config.get('api_timeout', 10)
+        # 为空时使用用户主页URL的域名
+        self.base_url = (config.get('api_base_url') or '').rstrip('/')
+        self.wardrobe_path = config.get(
+            'api_wardrobe_path',
+            '/api/v2/wardrobe/{user_id}/items?page=1&per_page={per_page}&order=relevance'
+        )
+        self.following_path = config.get(
+            'api_following_path',
+            '/api/v2/users/{user_id}/followed_users?page={page}&per_page={per_page}'
+        )
+        # 接口允许的最大每页数量，越大需要的请求越少
+        self.following_per_page = config.get('api_following_per_page', 100)
+        self._script_timeout_set = False
+
+    def resolve_base_url(self, page_url: str) -> str:
+        """
+        获取接口基础地址
+
+        Args:
+            page_url: Vinted页面URL，用于推断域名
+
+        Returns:
+            接口基础地址，如 https://www.vinted.nl
+        """
+        if self.base_url:
+            return self.base_url
+        parsed = urllib.parse.urlparse(page_url)
+        return f"{parsed.scheme}://{parsed.netloc}"
+
+    def fetch_json(self, url: str) -> Dict:
+        """
+        在浏览器会话中请求JSON接口
+
+        Args:
+            url: 接口URL
+
+        Returns:
+            解析后的JSON数据
+
+        Raises:
+            VintedApiError: 请求失败、状态码异常或返回内容不是JSON
+        """
+        if not self._script_timeout_set:
+            # 异步脚本超时要比fetch自身的超时稍长
+            self.driver.set_script_timeout(self.timeout + 2)
+            self._script_timeout_set = True
+
+        try:
+            response = self.driver.execute_async_script(FETCH_JSON_SCRIPT, url, int(self.timeout * 1000))
+        except WebDriverException as e:
+            raise VintedApiError(f"接口脚本执行失败: {str(e)}")
+
+        if not isinstance(response, dict):
+            raise VintedApiError(f"接口脚本返回结果无效: {response!r}")
+        if not response.get('ok'):
+            raise VintedApiError(f"接口请求失败: HTTP {response.get('status')} {response.get('error', '')}".strip())
+
+        try:
+            return json.loads(response.get('body') or '')
+        except ValueError as e:
+            raise VintedApiError(f"接口返回内容不是JSON: {str(e)}")
+
+    def get_wardrobe_summary(self, user_id: str, page_url: str, per_page: int = 20) -> Dict:
+        """
+        获取用户衣橱的商品总数和前几个商品名称
+
+        Args:
+            user_id: 用户ID
+            page_url: 用户主页URL，用于推断接口域名
+            per_page: 返回的商品数量
+
+        Returns:
+            {'item_count': 商品总数, 'items': 商品名称列表}
+        """
+        path = self.wardrobe_path.format(user_id=user_id, per_page=per_page)
+        data = self.fetch_json(f"{self.resolve_base_url(page_url)}{path}")
+
+        items = data.get('items')
+        if not isinstance(items, list):
+            raise VintedApiError("接口返回中缺少items字段")
+
+        pagination = data.get('pagination') or {}
+        total = pagination.get('total_entries')
+        item_count = int(total) if total is not None else len(items)
+
+        titles: List[str] = [item.get('title') for item in items if isinstance(item, dict) and item.get('title')]
+        return {'item_count': item_count, 'items': titles}
+
+    def iter_following_pages(self, user_id: str, page_url: str) -> Iterator[List[Dict]]:
+        """
+        逐页获取用户的关注列表，每取到一页就返回一页
+
+        Args:
+            user_id: 管理员用户ID
+            page_url: 关注列表页面URL，用于推断接口域名
+
+        Returns:
+            每页的用户列表迭代器，元素格式：{'user_id', 'username', 'profile_url'}
+        """
+        base_url = self.resolve_base_url(page_url)
+        page = 1
+
+        while True:
+            path = self.following_path.format(user_id=user_id, page=page, per_page=self.following_per_page)
+            data = self.fetch_json(f"{base_url}{path}")
+
+            users = data.get('users')
+            if not isinstance(users, list):
+                raise VintedApiError("接口返回中缺少users字段")
+
+            page_users = []
+            for user in users:
+                if not isinstance(user, dict) or user.get('id') is None:
+                    continue
+                member_id = str(user['id'])
+                page_users.append({
+                    'user_id': member_id,
+                    'username': user.get('login') or f"User_{member_id}",
+                    'profile_url': user.get('profile_url') or f"{base_url}/member/{member_id}"
+                })
+
+            self.logger.debug(f"接口关注列表第{page}页: {len(page_users)} 个用户")
+            if page_users:
+                yield page_users
+
+            pagination = data.get('pagination') or {}
+            total_pages = pagination.get('total_pages')
+            if total_pages is not None:
+                if page >= int(total_pages):
+                    return
+            elif len(users) < self.following_per_page:
+                return
+            if not users:
+                return
+            page += 1
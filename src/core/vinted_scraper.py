@@ -9,7 +9,10 @@ Vinted网站数据采集引擎
 import time
 import logging
 import re
-from typing import List, Dict, Optional, Tuple, Callable
+import urllib.parse
+from typing import List, Dict, Optional, Tuple, Callable, Iterator
+from collections import deque
+from contextlib import nullcontext
 from dataclasses import dataclass
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -18,15 +21,138 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
 from bs4 import BeautifulSoup
 
+from .tab_pool import TabPool
+from .page_readiness import PageReadiness
+from .page_scripts import FOLLOWING_EXTRACT_SCRIPT, INVENTORY_PROBE_SCRIPT, BLOCK_PAGE_PROBE_SCRIPT
+from .vinted_api import InBrowserApiClient, VintedApiError
+from .selector_registry import SelectorRegistry
+from .observation_store import ObservationStore
+from .round_journal import RoundJournal
+from .round_user_index import RoundUserIndex
+from .rate_limiter import get_rate_limiter, classify_outcome, OUTCOME_CHALLENGE
+from .circuit_breaker import CircuitBreaker, STATE_CLOSED
+from .resource_blocker import ResourceBlocker
+from .round_diff import RoundDiffEngine, DiffEvent, EVENT_WENT_EMPTY, EVENT_RESTOCKED, EVENT_NEW_FOLLOW, EVENT_UNFOLLOWED
+from ..utils.alert_sound import get_alert_dispatcher, SOUND_ALERT
 from ..utils.helpers import (
     extract_user_id_from_url, 
+    extract_user_id_from_following_url,
     build_user_profile_url, 
     build_next_page_url,
     clean_text,
+    is_same_page,
     retry_on_exception
 )
 
 
+# 关注列表页面就绪：出现关注用户容器、用户名元素或空状态
+FOLLOWING_READY_SELECTORS = [
+    "div.followed-users__body",
+    "[data-testid='profile-username']",
+    ".web_ui__EmptyState__empty-state",
+]
+
+# 商店页面就绪：出现商品网格或空状态
+INVENTORY_READY_SELECTORS = [
+    ".feed-grid__item",
+    ".profile__items-wrapper .web_ui__EmptyState__empty-state",
+    ".web_ui__EmptyState__empty-state",
+    "[data-testid='item']",
+]
+
+# 各类页面的导航策略：driver.get按会话的页面加载策略（默认eager）在DOM解析完成后返回，
+# 不等待第三方脚本拖慢的load事件，再等待该类页面自己的完成条件
+NAVIGATION_POLICIES = {
+    'home': {'ready_selectors': ["body"]},
+    'following': {'ready_selectors': FOLLOWING_READY_SELECTORS},
+    'shop': {'ready_selectors': INVENTORY_READY_SELECTORS},
+}
+
+# 加载超时后停止加载，保留已解析的DOM
+_STOP_LOADING_SCRIPT = "window.stop(); return location.href;"
+
+# 验证/拦截页面的特征元素（Cloudflare、DataDome、PerimeterX等）
+CHALLENGE_PAGE_SELECTORS = [
+    "#challenge-form",
+    "#challenge-running",
+    "#cf-challenge-running",
+    "iframe[src*='challenges.cloudflare.com']",
+    "iframe[src*='captcha-delivery.com']",
+    "#px-captcha",
+    "#captcha-container",
+]
+
+# 验证/拦截页面的特征文本（小写，只在内容很少的页面中查找）
+CHALLENGE_PAGE_TEXTS = [
+    "just a moment...",
+    "attention required! | cloudflare",
+    "verify you are human",
+    "are you a robot",
+    "access denied",
+    "toegang geweigerd",
+    "accès refusé",
+    "too many requests",
+]
+
+# 登录页面路径前缀（会话失效时商店页面会跳转到这里）
+LOGIN_PAGE_PATHS = [
+    "/member/signup",
+    "/member/login",
+    "/session",
+    "/auth",
+]
+
+# 页面探测结果类型
+BLOCK_KIND_CHALLENGE = "challenge"  # 验证/拦截页面
+BLOCK_KIND_LOGIN = "login"          # 登录页面
+BLOCK_KIND_ERROR = "error"          # HTTP错误页面
+# 检查被熔断器跳过（没有加载页面）
+CHECK_SKIPPED = "skipped"
+
+
+# 关注列表用户链接选择器（默认尝试顺序）
+FOLLOWING_LINK_SELECTORS = [
+    "div.followed-users__body > div > div > a",  # 关注用户主容器中的链接
+    ".followed-users__body a[href*='/member/']",  # 关注用户容器中的成员链接
+    "[data-testid='profile-username']",  # 用户名元素（需要找到父级链接）
+    "a[href*='/member/']",  # 通用用户链接
+    ".web_ui__Cell a",  # Cell组件中的链接
+]
+
+# 商店页面空状态元素
+INVENTORY_EMPTY_STATE_SELECTOR = "#content > div > div.container > div > div:nth-child(3) > div.profile__items-wrapper > div.web_ui__EmptyState__empty-state"
+
+# 商品元素选择器，基于调试结果优先使用有效的选择器
+ITEM_SELECTORS = [
+    ".feed-grid__item",  # 调试验证有效
+    ".item-box",
+    "[data-testid='item']",
+    ".catalog-item",
+    ".product-item"
+]
+
+# 页面文本中的库存数量，如 "12 items"
+ITEM_COUNT_PATTERN = r'(\d+)\s+items?'
+
+# 每个用户最多提取的商品名称数量
+MAX_ITEM_TITLES = 20
+
+# "没有关注任何人"的提示文本
+NO_FOLLOWING_MESSAGES = [
+    "doesn't follow anyone yet",
+    "volgt nog niemand",
+    "ne suit personne",
+    "没有关注任何人",
+    "no sigue a nadie"
+]
+
+# 从链接文本提取用户名时跳过的常见非用户名文本
+USERNAME_SKIP_WORDS = [
+    'nog geen reviews', 'no reviews', 'reviews',
+    'heel goed', 'very good', 'good', 'excellent'
+]
+
+
 @dataclass
 class UserInfo:
     """用户信息数据类"""
@@ -39,6 +165,7 @@ class UserInfo:
     item_count: int = 0
     items: List[str] = None
     error_message: str = ""
+    check_duration: float = 0.0  # 本次库存检查耗时（秒）
 
     def __post_init__(self):
         if self.items is None:
@@ -56,22 +183,31 @@ class ScrapingResult:
     scraping_time: float
     timestamp: str
     admin_summary: Dict = None  # 新增：每个管理员的统计信息
+    diff_events: List[DiffEvent] = None  # 与上一轮对比产生的事件
 
     def __post_init__(self):
         if self.admin_summary is None:
             self.admin_summary = {}
+        if self.diff_events is None:
+            self.diff_events = []
 
 
 class VintedScraper:
     """Vinted网站数据采集器"""
     
-    def __init__(self, driver: webdriver.Chrome, config: Dict):
+    def __init__(self, driver: webdriver.Chrome, config: Dict, selector_registry: SelectorRegistry = None,
+                 observation_store: ObservationStore = None, diff_engine: RoundDiffEngine = None,
+                 round_journal: RoundJournal = None):
         """
         初始化采集器
         
         Args:
             driver: WebDriver实例
             config: 配置信息
+            selector_registry: 选择器注册表，多个窗口可共享同一个实例
+            observation_store: 检查记录存储，为None时不保存历史记录
+            diff_engine: 轮次对比引擎，为None时不与上一轮对比
+            round_journal: 轮次断点记录，为None时中断后从头开始
         """
         self.driver = driver
         self.config = config
@@ -79,10 +215,82 @@ class VintedScraper:
         self.wait = WebDriverWait(driver, config.get('element_wait_timeout', 10))
         self.page_load_timeout = config.get('page_load_timeout', 15)
         self.scroll_pause_time = config.get('scroll_pause_time', 2)
+        # 同一窗口内轮换使用的标签页数量，1表示不使用多标签页
+        self.tabs_per_window = max(1, int(config.get('tabs_per_window', 1)))
         
+        # 各类页面的加载超时（秒），未配置的类型使用page_load_timeout
+        navigation_timeouts = config.get('navigation_timeouts') or {}
+        self.navigation_timeouts = {
+            page_type: navigation_timeouts.get(page_type, self.page_load_timeout)
+            for page_type in NAVIGATION_POLICIES
+        }
+        # 本轮各类页面的导航耗时和超时统计
+        self.navigation_stats: Dict[str, Dict] = {}
+        # 最近一次导航满足的完成条件（选择器），未满足为None
+        self.last_ready_selector: Optional[str] = None
+        # 最近一次导航是否加载超时后停止加载继续解析
+        self.last_soft_timeout = False
+
         # 设置页面加载超时
         self.driver.set_page_load_timeout(self.page_load_timeout)
+        self._current_page_load_timeout = self.page_load_timeout
+
+        # 页面就绪检测（代替固定等待）
+        self.readiness = PageReadiness(driver, config)
+        # 本轮页面访问次数
+        self.navigation_count = 0
+        # 精简模式：拦截图片、字体、统计和广告请求
+        self.resource_blocker = ResourceBlocker(driver, config)
+
+        # 页面解析方式：script=单次注入脚本提取，dom=逐元素解析
+        self.extraction_mode = config.get('extraction_mode', 'script')
+
+        # 库存检查方式：dom=渲染商店页面，api=浏览器内调用JSON接口（失败时回退到dom）
+        self.inventory_strategy = config.get('inventory_strategy', 'dom')
+        # 关注列表提取方式：html=逐页渲染关注列表，api=浏览器内调用JSON接口（失败时回退到html）
+        self.following_strategy = config.get('following_strategy', 'html')
+        self.api_client = InBrowserApiClient(driver, config)
+
+        # 选择器命中统计：优先尝试上次成功的选择器
+        self.selector_registry = selector_registry or SelectorRegistry(
+            config.get('selector_stats_file'),
+            config.get('selector_demote_after', 3)
+        )
+
+        # 每次库存检查的历史记录
+        self.observation_store = observation_store
+        # 与上一轮的状态对比
+        self.diff_engine = diff_engine
+        # 轮次断点记录
+        self.round_journal = round_journal
+        # 请求限速：同一域名的所有窗口共用一个自适应限速器（delay_between_requests为0时不限速）
+        self.rate_limiter = None
+        if config.get('adaptive_rate_limit', True) and config.get('delay_between_requests', 1) > 0:
+            domain = urllib.parse.urlparse(config.get('base_url', 'https://www.vinted.nl')).netloc
+            self.rate_limiter = get_rate_limiter(domain, config)
+        # 单次检查超过多少秒视为加载缓慢，限速器退避
+        self.slow_check_seconds = config.get('rate_limit_slow_seconds', 8)
+
+        # 验证/登录/错误页面探测和窗口熔断
+        self.block_detection = config.get('block_detection', True)
+        self.circuit_breaker = CircuitBreaker(
+            base_cooldown=config.get('block_cooldown_seconds', 60),
+            max_cooldown=config.get('block_max_cooldown_seconds', 900),
+            failure_threshold=config.get('block_failure_threshold', 3)
+        )
+        # 最近一次导航遇到的拦截页面，以及最近一次检查的结果类型（CHECK_SKIPPED或BLOCK_KIND_*）
+        self.last_block_page: Optional[Dict] = None
+        self.last_check_outcome: Optional[str] = None
+
+        # 本轮按user_id索引的用户，多个管理员关注的账号只检查一次
+        self.user_index = RoundUserIndex()
+        # 当前轮次的管理员汇总和对比事件（由iter_checks填充）
+        self.round_summary: Dict[str, Dict] = {}
+        self.round_diff_events: List[DiffEvent] = []
         
+        # 提醒音效调度器（全局共享）
+        self.alert_sounds = get_alert_dispatcher()
+
         # 回调函数
         self.progress_callback: Optional[Callable] = None
         self.status_callback: Optional[Callable] = None
@@ -124,28 +332,160 @@ class VintedScraper:
             self.status_callback(message)
     
     @retry_on_exception(max_retries=3, delay=2.0)
-    def _safe_get_page(self, url: str) -> bool:
+    def _safe_get_page(self, url: str, page_type: str = 'home') -> bool:
         """
-        安全地访问页面
-        
+        安全地访问页面，并等待该类页面的完成条件
+
+        加载超时算软失败：主文档已到达时停止加载，用已解析的DOM继续解析。
+
         Args:
             url: 要访问的URL
-            
+            page_type: 页面类型（home/following/shop），决定加载超时和完成条件
+
         Returns:
             是否成功访问
         """
+        policy = NAVIGATION_POLICIES.get(page_type, NAVIGATION_POLICIES['home'])
+        timeout = self.navigation_timeouts.get(page_type, self.page_load_timeout)
+        started = time.time()
+        self.last_ready_selector = None
+        self.last_soft_timeout = False
+        self.last_block_page = None
         try:
-            self.driver.get(url)
-            # 等待页面基本加载完成
-            self.wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-            time.sleep(1)  # 额外等待时间确保页面稳定
+            self.navigation_count += 1
+            self.resource_blocker.prepare()
+            if timeout != self._current_page_load_timeout:
+                self.driver.set_page_load_timeout(timeout)
+                self._current_page_load_timeout = timeout
+
+            outcome = 'ok'
+            try:
+                self.driver.get(url)
+            except TimeoutException:
+                if not self._stop_loading(url):
+                    self.logger.warning(f"页面加载超时: {url}")
+                    self._record_navigation(page_type, started, 'failed')
+                    return False
+                self.logger.warning(f"页面加载超时，已停止加载并继续解析: {url}")
+                outcome = 'soft_timeout'
+                self.last_soft_timeout = True
+
+            # 先做一次探测：验证页面上等待完成条件只会白白超时
+            self.last_block_page = self._detect_block_page()
+            if not self.last_block_page:
+                self.last_ready_selector = self.readiness.wait_for_selector(policy['ready_selectors'])
+                if not self.last_ready_selector:
+                    # 验证页面也可能在脚本运行后才出现
+                    self.last_block_page = self._detect_block_page()
+            if self.last_block_page:
+                self.logger.warning(f"页面被拦截（{self.last_block_page['kind']}: {self.last_block_page['reason']}）: {url}")
+                self._record_navigation(page_type, started, 'blocked')
+                return False
+
+            if not self.last_ready_selector:
+                self.logger.warning(f"等待页面完成条件超时，继续尝试解析: {url}")
+            self._record_navigation(page_type, started, outcome)
             return True
-        except TimeoutException:
-            self.logger.warning(f"页面加载超时: {url}")
-            return False
         except WebDriverException as e:
             self.logger.error(f"访问页面失败: {url}, 错误: {str(e)}")
+            self._record_navigation(page_type, started, 'failed')
             return False
+
+    def _stop_loading(self, url: str) -> bool:
+        """
+        停止仍在加载的页面
+
+        Args:
+            url: 导航的目标URL
+
+        Returns:
+            当前页面是否已是目标页面（否则说明主文档还没到达）
+        """
+        try:
+            current_url = self.driver.execute_script(_STOP_LOADING_SCRIPT)
+        except WebDriverException:
+            return False
+        return isinstance(current_url, str) and is_same_page(current_url, url)
+
+    def _record_navigation(self, page_type: str, started: float, outcome: str):
+        """记录一次导航的耗时和结果（ok/soft_timeout/failed）"""
+        stats = self.navigation_stats.setdefault(
+            page_type, {'count': 0, 'total_time': 0.0, 'soft_timeouts': 0, 'failures': 0}
+        )
+        stats['count'] += 1
+        stats['total_time'] += time.time() - started
+        if outcome == 'soft_timeout':
+            stats['soft_timeouts'] += 1
+        elif outcome in ('failed', 'blocked'):
+            stats['failures'] += 1
+
+    def _detect_block_page(self) -> Optional[Dict]:
+        """
+        用一次脚本调用判断当前页面是否为验证、登录或错误页面
+
+        Returns:
+            探测结果 {kind, reason, status}，正常页面或探测失败时返回None
+        """
+        if not self.block_detection:
+            return None
+        try:
+            result = self.driver.execute_script(
+                BLOCK_PAGE_PROBE_SCRIPT,
+                CHALLENGE_PAGE_SELECTORS,
+                CHALLENGE_PAGE_TEXTS,
+                LOGIN_PAGE_PATHS
+            )
+        except Exception as e:
+            self.logger.debug(f"页面拦截探测失败: {str(e)}")
+            return None
+        if isinstance(result, dict) and result.get('kind'):
+            return result
+        return None
+
+    def _mark_blocked(self, user_info: UserInfo, block: Dict) -> UserInfo:
+        """
+        检查遇到拦截页面：记为检查出错（不是无库存），并更新窗口熔断器
+
+        Args:
+            user_info: 用户信息
+            block: 页面探测结果
+
+        Returns:
+            更新后的用户信息
+        """
+        kind = block['kind']
+        self.last_check_outcome = kind
+        user_info.status = "error"
+        if kind == BLOCK_KIND_LOGIN:
+            user_info.error_message = "会话已失效，跳转到登录页面"
+        elif kind == BLOCK_KIND_CHALLENGE:
+            user_info.error_message = f"遇到验证页面: {block.get('reason')}"
+        else:
+            user_info.error_message = f"错误页面: {block.get('reason')}"
+
+        if kind == BLOCK_KIND_ERROR:
+            self.circuit_breaker.record_failure(user_info.error_message)
+        else:
+            self.circuit_breaker.trip(user_info.error_message)
+            self._update_status(f"⚠️ 窗口遇到拦截，暂停检查: {user_info.error_message}")
+        return user_info
+
+    def _wait_for_circuit(self) -> bool:
+        """
+        窗口熔断冷却中时等待冷却结束（可随时停止）
+
+        Returns:
+            是否可以继续检查（收到停止信号时返回False）
+        """
+        remaining = self.circuit_breaker.remaining()
+        if remaining > 0:
+            self._update_status(f"窗口暂停中（{self.circuit_breaker.last_reason}），{remaining:.0f} 秒后试探恢复")
+        while not self.should_stop:
+            remaining = self.circuit_breaker.remaining()
+            if remaining <= 0:
+                return True
+            time.sleep(min(1.0, remaining))
+        return False
     
     def _check_browser_connection(self) -> bool:
         """检查浏览器连接状态"""
@@ -158,6 +498,16 @@ class VintedScraper:
             self.logger.error(f"浏览器连接已断开: {str(e)}")
             return False
 
+    def _current_domain(self) -> str:
+        """获取当前页面的域名，用于区分不同站点的选择器统计"""
+        try:
+            current_url = self.driver.current_url
+            if isinstance(current_url, str):
+                return urllib.parse.urlparse(current_url).netloc
+        except Exception:
+            pass
+        return ""
+
     def extract_following_users(self, following_url: str) -> List[UserInfo]:
         """
         提取关注列表中的用户信息
@@ -169,8 +519,10 @@ class VintedScraper:
             用户信息列表
         """
         users = []
+        seen_ids = set()
         current_url = following_url
         page_num = 1
+        first_page_size = 0
 
         self._update_status("开始提取关注列表...")
         self.logger.info(f"开始提取关注列表: {following_url}")
@@ -179,6 +531,13 @@ class VintedScraper:
         if not self._check_browser_connection():
             raise Exception("浏览器连接已断开，无法继续操作")
 
+        # 接口模式：大页数请求关注列表，不渲染页面
+        if self.following_strategy == 'api':
+            api_users = self._extract_following_via_api(following_url)
+            if api_users is not None:
+                self._update_status(f"关注列表提取完成，共找到 {len(api_users)} 个用户")
+                return api_users
+
         while current_url and not self.should_stop:
             self._update_status(f"正在处理关注列表第{page_num}页...")
             self.logger.info(f"处理第{page_num}页: {current_url}")
@@ -187,7 +546,13 @@ class VintedScraper:
             if not self._check_browser_connection():
                 raise Exception(f"在第{page_num}页处理过程中浏览器连接断开")
 
-            if not self._safe_get_page(current_url):
+            if not self._safe_get_page(current_url, 'following'):
+                if self.last_block_page:
+                    # 关注列表不完整时不能当作取消关注，整个管理员记为失败
+                    reason = f"{self.last_block_page['kind']}: {self.last_block_page.get('reason')}"
+                    if self.last_block_page['kind'] != BLOCK_KIND_ERROR:
+                        self.circuit_breaker.trip(f"关注列表页面被拦截（{reason}）")
+                    raise Exception(f"关注列表页面被拦截（{reason}）")
                 self.logger.error(f"无法访问关注列表页面: {current_url}")
                 # 再次检查浏览器连接状态
                 if not self._check_browser_connection():
@@ -200,39 +565,25 @@ class VintedScraper:
                 if not self._check_browser_connection():
                     raise Exception(f"第{page_num}页加载前浏览器连接断开")
 
-                # 等待页面完全加载 - 增加更长的等待时间和更好的检测
-                self.logger.info(f"等待第{page_num}页加载完成...")
-
-                # 等待页面基本元素加载
-                try:
-                    # 等待页面主体内容加载
-                    self.wait.until(EC.presence_of_element_located((By.TAG_NAME, "main")))
-                    self.logger.info("✓ main标签加载完成")
-                    time.sleep(2)
-                except TimeoutException:
-                    self.logger.warning("未找到main标签，尝试等待body加载")
-                    self.wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-                    self.logger.info("✓ body标签加载完成")
-                    time.sleep(3)
+                # 关注列表容器或空状态已在导航时等待
+                if self.last_ready_selector:
+                    self.logger.info(f"✓ 关注列表内容加载完成: {self.last_ready_selector}")
 
                 # 再次检查浏览器连接
                 if not self._check_browser_connection():
                     raise Exception(f"第{page_num}页基本元素加载后浏览器连接断开")
 
-                # 等待JavaScript执行完成
-                ready_state = self.driver.execute_script("return document.readyState")
-                self.logger.info(f"页面readyState: {ready_state}")
-                time.sleep(2)
+                # 等待页面请求完成
+                self.readiness.wait_for_network_idle()
 
                 # 滚动页面确保所有内容加载
                 self.logger.info("滚动页面加载内容...")
                 try:
                     self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                    time.sleep(self.scroll_pause_time)
+                    self.readiness.wait_for_dom_quiet(timeout=self.scroll_pause_time)
 
-                    # 再次滚动到顶部，确保所有内容都已渲染
+                    # 再次滚动到顶部
                     self.driver.execute_script("window.scrollTo(0, 0);")
-                    time.sleep(1)
                     self.logger.info("✓ 页面滚动完成")
                 except Exception as e:
                     self.logger.warning(f"页面滚动失败: {str(e)}")
@@ -240,326 +591,443 @@ class VintedScraper:
                     if not self._check_browser_connection():
                         raise Exception(f"第{page_num}页滚动时浏览器连接断开")
 
-                # 获取页面源码进行检测
-                try:
-                    page_source = self.driver.page_source.lower()
-                    self.logger.info(f"页面源码长度: {len(page_source)} 字符")
+                # 解析当前页面：优先单次脚本提取，失败时回退到逐元素解析
+                page_result = None
+                if self.extraction_mode == 'script':
+                    page_result = self._extract_following_page_script(page_num)
+                if page_result is None:
+                    page_result = self._extract_following_page_dom(page_num)
 
-                    # 检查页面是否包含Vinted相关内容
-                    if 'vinted' not in page_source:
-                        self.logger.warning("页面源码中未找到'vinted'关键词，可能不是正确的页面")
+                no_following, page_users = page_result
+                if no_following:
+                    break
 
-                except Exception as e:
-                    self.logger.error(f"获取页面源码失败: {str(e)}")
-                    if not self._check_browser_connection():
-                        raise Exception(f"第{page_num}页获取源码时浏览器连接断开")
-                    raise
-
-                # 首先检查是否显示"没有关注任何人"的消息
-                no_following_messages = [
-                    "doesn't follow anyone yet",
-                    "volgt nog niemand",
-                    "ne suit personne",
-                    "没有关注任何人",
-                    "no sigue a nadie"
-                ]
+                if not page_users:
+                    self.logger.info(f"第{page_num}页未找到用户，停止翻页")
+                    break
 
-                # 检查是否出现结束标志 - 更精确的检查
-                self.logger.info(f"第{page_num}页：检查是否有'没有关注任何人'的消息...")
-                found_no_following_msg = None
-                for msg in no_following_messages:
-                    if msg.lower() in page_source:
-                        found_no_following_msg = msg
-                        break
+                # 超出页数时网站可能重复返回最后一页
+                new_users = [user for user in page_users if user.user_id not in seen_ids]
+                if not new_users:
+                    self.logger.info(f"第{page_num}页用户均已出现过，停止翻页")
+                    break
+                seen_ids.update(user.user_id for user in new_users)
+                users.extend(new_users)
+                self._update_status(f"第{page_num}页找到 {len(new_users)} 个用户，总计 {len(users)} 个用户")
 
-                if found_no_following_msg:
-                    self.logger.info(f"第{page_num}页包含消息: '{found_no_following_msg}'")
+                # 根据已加载的当前页判断是否还有下一页，每页只访问一次
+                if first_page_size and len(page_users) < first_page_size:
+                    self.logger.info(f"第{page_num}页用户数少于首页（{len(page_users)} < {first_page_size}），已到达最后一页")
+                    break
+                first_page_size = first_page_size or len(page_users)
 
-                    # 更精确地检查这个消息是否真的表示没有关注任何人
-                    # 先检查是否有用户容器和用户名元素
-                    try:
-                        user_containers = self.driver.find_elements(By.CSS_SELECTOR, "div.followed-users__body")
-                        username_elements = self.driver.find_elements(By.CSS_SELECTOR, "[data-testid='profile-username']")
+                next_url = build_next_page_url(current_url)
+                if next_url == current_url:
+                    # URL没有变化，说明已经是最后一页
+                    self.logger.info("URL没有变化，已到达最后一页")
+                    break
 
-                        self.logger.info(f"第{page_num}页：用户容器数量: {len(user_containers)}")
-                        self.logger.info(f"第{page_num}页：用户名元素数量: {len(username_elements)}")
+                # 更新当前URL并继续
+                current_url = next_url
+                page_num += 1
+                self.logger.info(f"继续处理第{page_num}页")
 
-                        if len(username_elements) > 1:  # 大于1是因为页面主用户也有用户名元素
-                            self.logger.info(f"第{page_num}页：虽然包含结束消息，但发现了 {len(username_elements)} 个用户名元素，继续检测")
-                        else:
-                            self.logger.info(f"第{page_num}页：确认没有关注任何人，停止翻页")
-                            break
-                    except Exception as e:
-                        self.logger.warning(f"第{page_num}页：检查用户元素时出错: {str(e)}，继续检测")
-                else:
-                    self.logger.info(f"第{page_num}页：未发现结束消息，继续查找用户链接")
-
-                # 使用正确的CSS选择器来查找用户链接
-                self.logger.info(f"第{page_num}页：开始查找用户链接...")
-                user_links = []
-                user_link_selectors = [
-                    # 基于你提供的实际页面结构
-                    "div.followed-users__body > div > div > a",  # 关注用户主容器中的链接
-                    ".followed-users__body a[href*='/member/']",  # 关注用户容器中的成员链接
-                    "[data-testid='profile-username']",  # 用户名元素（需要找到父级链接）
-                    "a[href*='/member/']",  # 通用用户链接
-                    ".web_ui__Cell a",  # Cell组件中的链接
-                ]
+            except TimeoutException:
+                self.logger.error(f"关注列表页面加载超时: {current_url}")
+                break
+            except Exception as e:
+                self.logger.error(f"提取关注列表失败: {str(e)}")
+                break
+        
+        self._update_status(f"关注列表提取完成，共找到 {len(users)} 个用户")
+        return users
 
-                self.logger.info(f"第{page_num}页：将尝试 {len(user_link_selectors)} 个不同的选择器")
+    def iter_following_users(self, following_url: str) -> Iterator[UserInfo]:
+        """
+        通过浏览器内的JSON接口逐页获取关注用户，每页到达即返回
 
-                for i, selector in enumerate(user_link_selectors, 1):
-                    self.logger.info(f"第{page_num}页：尝试选择器 {i}/{len(user_link_selectors)}: '{selector}'")
-                    try:
-                        if selector == "[data-testid='profile-username']":
-                            # 对于用户名元素，需要找到父级链接
-                            username_elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                            self.logger.info(f"第{page_num}页：找到 {len(username_elements)} 个用户名元素")
-
-                            if username_elements:
-                                # 输出前几个用户名用于验证
-                                for j, elem in enumerate(username_elements[:3]):
-                                    try:
-                                        username = elem.text.strip()
-                                        self.logger.info(f"第{page_num}页：用户名 {j+1}: '{username}'")
-                                    except:
-                                        pass
-
-                            for username_elem in username_elements:
-                                # 向上查找包含链接的父元素
-                                try:
-                                    link_elem = username_elem.find_element(By.XPATH, "./ancestor::a[contains(@href, '/member/')]")
-                                    user_links.append(link_elem)
-                                except Exception as e:
-                                    self.logger.debug(f"查找父级链接失败: {str(e)}")
-                                    continue
-
-                            if user_links:
-                                self.logger.info(f"第{page_num}页：通过用户名元素找到 {len(user_links)} 个用户链接")
-                                break
-                            else:
-                                self.logger.warning(f"第{page_num}页：找到用户名元素但无法找到对应的链接")
-                        else:
-                            found_links = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                            self.logger.info(f"第{page_num}页：选择器 '{selector}' 找到 {len(found_links)} 个元素")
-
-                            if found_links:
-                                # 验证这些链接是否包含member
-                                valid_links = []
-                                for link in found_links:
-                                    href = link.get_attribute('href') or ''
-                                    if '/member/' in href:
-                                        valid_links.append(link)
-
-                                self.logger.info(f"第{page_num}页：其中 {len(valid_links)} 个是有效的member链接")
-
-                                if valid_links:
-                                    user_links = valid_links
-                                    self.logger.info(f"第{page_num}页：使用选择器 '{selector}' 成功找到 {len(valid_links)} 个用户链接")
-                                    break
-                    except Exception as e:
-                        self.logger.warning(f"第{page_num}页：选择器 '{selector}' 执行失败: {str(e)}")
-                        continue
+        Args:
+            following_url: 关注列表URL
 
-                # 如果还是没找到，尝试更宽泛的搜索
-                if not user_links:
-                    self.logger.warning("常规选择器未找到用户链接，尝试更宽泛的搜索...")
-                    try:
-                        # 查找所有包含member的链接
-                        all_links = self.driver.find_elements(By.TAG_NAME, "a")
-                        self.logger.info(f"页面总共有 {len(all_links)} 个链接")
+        Returns:
+            用户信息迭代器
 
-                        member_links = []
-                        for link in all_links:
-                            href = link.get_attribute('href')
-                            if href and '/member/' in href:
-                                member_links.append(href)
-                                if '/general/' not in href:
-                                    user_links.append(link)
+        Raises:
+            VintedApiError: 无法识别管理员ID或接口请求失败
+        """
+        admin_id = extract_user_id_from_following_url(following_url)
+        if not admin_id:
+            raise VintedApiError(f"无法从关注列表URL提取用户ID: {following_url}")
+
+        self._ensure_api_origin(following_url)
+
+        seen_ids = set()
+        for page_users in self.api_client.iter_following_pages(admin_id, following_url):
+            for user in page_users:
+                if user['user_id'] in seen_ids:
+                    continue
+                seen_ids.add(user['user_id'])
+                yield UserInfo(
+                    user_id=user['user_id'],
+                    username=user['username'],
+                    profile_url=user['profile_url']
+                )
+            if self.should_stop:
+                return
 
-                        self.logger.info(f"包含/member/的链接: {len(member_links)} 个")
-                        self.logger.info(f"过滤后的用户链接: {len(user_links)} 个")
+    def _extract_following_via_api(self, following_url: str) -> Optional[List[UserInfo]]:
+        """
+        通过接口提取完整的关注列表
 
-                        # 打印前几个链接作为调试信息
-                        if member_links:
-                            self.logger.info(f"前5个member链接示例: {member_links[:5]}")
+        Args:
+            following_url: 关注列表URL
 
-                    except Exception as e:
-                        self.logger.warning(f"遍历所有链接失败: {str(e)}")
+        Returns:
+            用户信息列表，接口不可用时返回None（由调用方回退到页面解析）
+        """
+        users = []
+        try:
+            for user in self.iter_following_users(following_url):
+                users.append(user)
+                if len(users) % 100 == 0:
+                    self._update_status(f"接口已获取 {len(users)} 个关注用户...")
+        except VintedApiError as e:
+            self.logger.warning(f"接口提取关注列表失败，改用页面解析: {str(e)}")
+            return None
+
+        self.logger.info(f"接口提取关注列表完成: {len(users)} 个用户")
+        return users
 
-                self.logger.info(f"第{page_num}页总共找到 {len(user_links)} 个潜在用户链接")
+    def _ensure_api_origin(self, page_url: str):
+        """
+        确保当前标签页位于接口所在域名，使fetch()带上登录Cookie且不受跨域限制
 
-                # 如果仍然没有找到用户链接，输出详细的页面调试信息
-                if not user_links:
-                    self.logger.error(f"第{page_num}页未找到任何用户链接！")
+        Args:
+            page_url: Vinted页面URL
+        """
+        base_url = self.api_client.resolve_base_url(page_url)
+        current_url = self.driver.current_url
+        if not isinstance(current_url, str) or current_url.startswith(base_url):
+            return
 
-                    # 检查浏览器连接状态
-                    if not self._check_browser_connection():
-                        raise Exception(f"第{page_num}页用户链接检测时浏览器连接断开")
+        self.logger.info(f"当前页面不在 {base_url}，先打开首页以共享登录状态")
+        if not self._safe_get_page(f"{base_url}/"):
+            raise VintedApiError(f"无法打开接口域名页面: {base_url}")
 
-                    try:
-                        current_url = self.driver.current_url
-                        page_title = self.driver.title
-                        self.logger.error(f"当前页面URL: {current_url}")
-                        self.logger.error(f"页面标题: {page_title}")
-
-                        # 检查关键容器是否存在
-                        containers_to_check = [
-                            "div.followed-users__body",
-                            ".body-content__content",
-                            "#content",
-                            "[data-testid='profile-username']",
-                            ".web_ui__Cell",
-                        ]
-
-                        for container in containers_to_check:
-                            try:
-                                elements = self.driver.find_elements(By.CSS_SELECTOR, container)
-                                self.logger.info(f"容器 '{container}': 找到 {len(elements)} 个元素")
-                                if elements:
-                                    # 输出第一个元素的HTML片段
-                                    html_snippet = elements[0].get_attribute('outerHTML')[:200]
-                                    self.logger.debug(f"容器HTML片段: {html_snippet}...")
-                            except Exception as e:
-                                self.logger.debug(f"检查容器 '{container}' 失败: {str(e)}")
+    def _extract_following_page_script(self, page_num: int) -> Optional[Tuple[bool, List[UserInfo]]]:
+        """
+        通过一次注入脚本解析当前关注列表页面
 
-                        # 检查页面是否包含关键词
-                        key_words = ["following", "member", "user", "profile", "volgt", "suivre", "followed-users"]
-                        found_keywords = []
-                        for word in key_words:
-                            if word in page_source:
-                                found_keywords.append(word)
+        Args:
+            page_num: 页码（用于日志）
 
-                        if found_keywords:
-                            self.logger.info(f"页面包含关键词: {found_keywords}")
-                        else:
-                            self.logger.warning("页面不包含任何预期关键词")
+        Returns:
+            (是否确认没有关注任何人, 本页用户列表)，脚本不可用时返回None
+        """
+        try:
+            data = self.driver.execute_script(
+                FOLLOWING_EXTRACT_SCRIPT,
+                [msg.lower() for msg in NO_FOLLOWING_MESSAGES],
+                USERNAME_SKIP_WORDS
+            )
+        except WebDriverException as e:
+            self.logger.warning(f"第{page_num}页：脚本提取失败，改用逐元素解析: {str(e)}")
+            return None
+
+        if not isinstance(data, dict) or not isinstance(data.get('members'), list):
+            self.logger.warning(f"第{page_num}页：脚本返回结果无效，改用逐元素解析")
+            return None
+
+        members = data['members']
+        username_count = data.get('username_count') or 0
+        no_following_message = data.get('no_following_message')
+
+        # 大于1是因为页面主用户也有用户名元素
+        if no_following_message and username_count <= 1:
+            self.logger.info(f"第{page_num}页包含消息: '{no_following_message}'，确认没有关注任何人，停止翻页")
+            return True, []
+
+        page_users = []
+        for member in members:
+            user_id = str(member.get('user_id') or '')
+            href = member.get('href') or ''
+            if not user_id or not href:
+                continue
+            username = clean_text(member.get('username') or '') or f"User_{user_id}"
+            page_users.append(UserInfo(
+                user_id=user_id,
+                username=username,
+                profile_url=href
+            ))
+
+        self.logger.info(
+            f"第{page_num}页：脚本提取到 {len(page_users)} 个用户"
+            f"（关注容器: {'有' if data.get('has_container') else '无'}，用户名元素: {username_count}）"
+        )
+
+        return False, page_users
+
+    def _extract_following_page_dom(self, page_num: int) -> Tuple[bool, List[UserInfo]]:
+        """
+        逐个元素解析当前关注列表页面（兼容模式，WebDriver往返次数较多）
 
-                        # 检查是否有任何链接
-                        all_links = self.driver.find_elements(By.TAG_NAME, "a")
-                        self.logger.info(f"页面总共有 {len(all_links)} 个链接")
+        Args:
+            page_num: 页码（用于日志）
 
-                        # 检查包含member的链接
-                        member_links = [link for link in all_links if 'member' in link.get_attribute('href') or '']
-                        self.logger.info(f"包含'member'的链接有 {len(member_links)} 个")
+        Returns:
+            (是否确认没有关注任何人, 本页用户列表)
+        """
+        # 获取页面源码进行检测
+        try:
+            page_source = self.driver.page_source.lower()
+            self.logger.info(f"页面源码长度: {len(page_source)} 字符")
 
-                        if member_links:
-                            for i, link in enumerate(member_links[:3]):  # 只显示前3个
-                                href = link.get_attribute('href')
-                                text = link.text.strip()
-                                self.logger.info(f"Member链接 {i+1}: {href} (文本: '{text}')")
+            # 检查页面是否包含Vinted相关内容
+            if 'vinted' not in page_source:
+                self.logger.warning("页面源码中未找到'vinted'关键词，可能不是正确的页面")
 
-                    except Exception as e:
-                        self.logger.error(f"获取页面调试信息失败: {str(e)}")
-                        if not self._check_browser_connection():
-                            raise Exception(f"第{page_num}页调试信息获取时浏览器连接断开")
+        except Exception as e:
+            self.logger.error(f"获取页面源码失败: {str(e)}")
+            if not self._check_browser_connection():
+                raise Exception(f"第{page_num}页获取源码时浏览器连接断开")
+            raise
 
-                page_users = []
-                for link in user_links:
-                    try:
-                        href = link.get_attribute('href')
-                        if href and '/member/' in href and '/general/' not in href:
-                            user_id = extract_user_id_from_url(href)
-                            if user_id:
-                                # 尝试获取用户名 - 优先使用data-testid='profile-username'
-                                username = "Unknown"
-                                try:
-                                    # 首先尝试使用精确的用户名选择器
-                                    username_element = link.find_element(By.CSS_SELECTOR, "[data-testid='profile-username']")
-                                    username = clean_text(username_element.text)
-                                    if username:
-                                        self.logger.debug(f"使用data-testid获取用户名: {username}")
-                                except NoSuchElementException:
-                                    try:
-                                        # 尝试其他用户名选择器
-                                        username_element = link.find_element(By.CSS_SELECTOR, ".user-name, .username, [data-testid='username']")
-                                        username = clean_text(username_element.text)
-                                        if username:
-                                            self.logger.debug(f"使用通用选择器获取用户名: {username}")
-                                    except NoSuchElementException:
-                                        # 如果找不到用户名元素，从链接文本中提取第一行
-                                        link_text = clean_text(link.text)
-                                        if link_text:
-                                            # 取第一行作为用户名，过滤掉"Nog geen reviews"等
-                                            lines = link_text.split('\n')
-                                            for line in lines:
-                                                line = line.strip()
-                                                # 跳过常见的非用户名文本
-                                                if line and not any(skip in line.lower() for skip in [
-                                                    'nog geen reviews', 'no reviews', 'reviews',
-                                                    'heel goed', 'very good', 'good', 'excellent'
-                                                ]):
-                                                    username = line
-                                                    self.logger.debug(f"从链接文本提取用户名: {username}")
-                                                    break
-
-                                        if username == "Unknown":
-                                            username = f"User_{user_id}"
-
-                                user_info = UserInfo(
-                                    user_id=user_id,
-                                    username=username,
-                                    profile_url=href
-                                )
-
-                                # 避免重复添加
-                                if not any(u.user_id == user_id for u in page_users):
-                                    page_users.append(user_info)
+        # 首先检查是否显示"没有关注任何人"的消息 - 更精确的检查
+        self.logger.info(f"第{page_num}页：检查是否有'没有关注任何人'的消息...")
+        found_no_following_msg = None
+        for msg in NO_FOLLOWING_MESSAGES:
+            if msg.lower() in page_source:
+                found_no_following_msg = msg
+                break
 
-                    except Exception as e:
-                        self.logger.warning(f"提取用户链接失败: {str(e)}")
-                        continue
-                
-                if page_users:
-                    users.extend(page_users)
-                    self._update_status(f"第{page_num}页找到 {len(page_users)} 个用户，总计 {len(users)} 个用户")
+        if found_no_following_msg:
+            self.logger.info(f"第{page_num}页包含消息: '{found_no_following_msg}'")
+
+            # 更精确地检查这个消息是否真的表示没有关注任何人
+            # 先检查是否有用户容器和用户名元素
+            try:
+                user_containers = self.driver.find_elements(By.CSS_SELECTOR, "div.followed-users__body")
+                username_elements = self.driver.find_elements(By.CSS_SELECTOR, "[data-testid='profile-username']")
+
+                self.logger.info(f"第{page_num}页：用户容器数量: {len(user_containers)}")
+                self.logger.info(f"第{page_num}页：用户名元素数量: {len(username_elements)}")
+
+                if len(username_elements) > 1:  # 大于1是因为页面主用户也有用户名元素
+                    self.logger.info(f"第{page_num}页：虽然包含结束消息，但发现了 {len(username_elements)} 个用户名元素，继续检测")
                 else:
-                    self.logger.info(f"第{page_num}页未找到用户，停止翻页")
-                    break
+                    self.logger.info(f"第{page_num}页：确认没有关注任何人，停止翻页")
+                    return True, []
+            except Exception as e:
+                self.logger.warning(f"第{page_num}页：检查用户元素时出错: {str(e)}，继续检测")
+        else:
+            self.logger.info(f"第{page_num}页：未发现结束消息，继续查找用户链接")
+
+        # 使用正确的CSS选择器来查找用户链接
+        self.logger.info(f"第{page_num}页：开始查找用户链接...")
+        user_links = []
+        domain = self._current_domain()
+        user_link_selectors = self.selector_registry.order('following_links', domain, FOLLOWING_LINK_SELECTORS)
+        tried_selectors = []
+        matched_selector = None
+
+        self.logger.debug(f"第{page_num}页：将尝试 {len(user_link_selectors)} 个不同的选择器")
+
+        for i, selector in enumerate(user_link_selectors, 1):
+            self.logger.debug(f"第{page_num}页：尝试选择器 {i}/{len(user_link_selectors)}: '{selector}'")
+            tried_selectors.append(selector)
+            try:
+                if selector == "[data-testid='profile-username']":
+                    # 对于用户名元素，需要找到父级链接
+                    username_elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
+                    self.logger.debug(f"第{page_num}页：找到 {len(username_elements)} 个用户名元素")
 
-                # 简化的分页检测逻辑
-                # 尝试构建下一页URL
-                next_url = build_next_page_url(current_url)
-                if next_url == current_url:
-                    # URL没有变化，说明已经是最后一页
-                    self.logger.info("URL没有变化，已到达最后一页")
-                    break
+                    for username_elem in username_elements:
+                        # 向上查找包含链接的父元素
+                        try:
+                            link_elem = username_elem.find_element(By.XPATH, "./ancestor::a[contains(@href, '/member/')]")
+                            user_links.append(link_elem)
+                        except Exception as e:
+                            self.logger.debug(f"查找父级链接失败: {str(e)}")
+                            continue
 
-                # 验证下一页是否存在且有内容
-                self.logger.info(f"尝试访问下一页: {next_url}")
-                if not self._safe_get_page(next_url):
-                    self.logger.info("无法访问下一页，停止翻页")
-                    break
+                    if user_links:
+                        matched_selector = selector
+                        self.logger.info(f"第{page_num}页：通过用户名元素找到 {len(user_links)} 个用户链接")
+                        break
+                    elif username_elements:
+                        self.logger.debug(f"第{page_num}页：找到用户名元素但无法找到对应的链接")
+                else:
+                    found_links = self.driver.find_elements(By.CSS_SELECTOR, selector)
+                    self.logger.debug(f"第{page_num}页：选择器 '{selector}' 找到 {len(found_links)} 个元素")
+
+                    if found_links:
+                        # 验证这些链接是否包含member
+                        valid_links = []
+                        for link in found_links:
+                            href = link.get_attribute('href') or ''
+                            if '/member/' in href:
+                                valid_links.append(link)
+
+                        if valid_links:
+                            user_links = valid_links
+                            matched_selector = selector
+                            self.logger.info(f"第{page_num}页：使用选择器 '{selector}' 成功找到 {len(valid_links)} 个用户链接")
+                            break
+            except Exception as e:
+                self.logger.debug(f"第{page_num}页：选择器 '{selector}' 执行失败: {str(e)}")
+                continue
 
-                # 检查下一页是否有实际的用户链接（更准确的检测）
-                time.sleep(2)
-                page_source = self.driver.page_source.lower()
+        self.selector_registry.record_attempts('following_links', domain, tried_selectors, matched_selector)
 
-                # 检查是否有关注用户的容器和用户链接
-                next_page_user_links = self.driver.find_elements(By.CSS_SELECTOR, "div.followed-users__body > div > div > a")
-                next_page_username_elements = self.driver.find_elements(By.CSS_SELECTOR, "[data-testid='profile-username']")
+        # 如果还是没找到，尝试更宽泛的搜索
+        if not user_links:
+            self.logger.warning("常规选择器未找到用户链接，尝试更宽泛的搜索...")
+            try:
+                # 查找所有包含member的链接
+                all_links = self.driver.find_elements(By.TAG_NAME, "a")
+                self.logger.info(f"页面总共有 {len(all_links)} 个链接")
 
-                self.logger.info(f"下一页预检：找到 {len(next_page_user_links)} 个用户链接，{len(next_page_username_elements)} 个用户名元素")
+                member_links = []
+                for link in all_links:
+                    href = link.get_attribute('href')
+                    if href and '/member/' in href:
+                        member_links.append(href)
+                        if '/general/' not in href:
+                            user_links.append(link)
 
-                # 如果没有用户链接，或者用户名元素<=1（只有页面主用户），则停止
-                if len(next_page_user_links) == 0 or len(next_page_username_elements) <= 1:
-                    self.logger.info("下一页确认没有关注用户，停止翻页")
-                    break
+                self.logger.info(f"包含/member/的链接: {len(member_links)} 个")
+                self.logger.info(f"过滤后的用户链接: {len(user_links)} 个")
 
-                # 更新当前URL并继续
-                current_url = next_url
-                page_num += 1
-                self.logger.info(f"继续处理第{page_num}页")
+                # 打印前几个链接作为调试信息
+                if member_links:
+                    self.logger.info(f"前5个member链接示例: {member_links[:5]}")
 
-            except TimeoutException:
-                self.logger.error(f"关注列表页面加载超时: {current_url}")
-                break
             except Exception as e:
-                self.logger.error(f"提取关注列表失败: {str(e)}")
-                break
-        
-        self._update_status(f"关注列表提取完成，共找到 {len(users)} 个用户")
-        return users
+                self.logger.warning(f"遍历所有链接失败: {str(e)}")
+
+        self.logger.info(f"第{page_num}页总共找到 {len(user_links)} 个潜在用户链接")
+
+        # 如果仍然没有找到用户链接，输出详细的页面调试信息
+        if not user_links:
+            self.logger.error(f"第{page_num}页未找到任何用户链接！")
+
+            # 检查浏览器连接状态
+            if not self._check_browser_connection():
+                raise Exception(f"第{page_num}页用户链接检测时浏览器连接断开")
+
+            try:
+                current_url = self.driver.current_url
+                page_title = self.driver.title
+                self.logger.error(f"当前页面URL: {current_url}")
+                self.logger.error(f"页面标题: {page_title}")
+
+                # 检查关键容器是否存在
+                containers_to_check = [
+                    "div.followed-users__body",
+                    ".body-content__content",
+                    "#content",
+                    "[data-testid='profile-username']",
+                    ".web_ui__Cell",
+                ]
+
+                for container in containers_to_check:
+                    try:
+                        elements = self.driver.find_elements(By.CSS_SELECTOR, container)
+                        self.logger.info(f"容器 '{container}': 找到 {len(elements)} 个元素")
+                        if elements:
+                            # 输出第一个元素的HTML片段
+                            html_snippet = elements[0].get_attribute('outerHTML')[:200]
+                            self.logger.debug(f"容器HTML片段: {html_snippet}...")
+                    except Exception as e:
+                        self.logger.debug(f"检查容器 '{container}' 失败: {str(e)}")
+
+                # 检查页面是否包含关键词
+                key_words = ["following", "member", "user", "profile", "volgt", "suivre", "followed-users"]
+                found_keywords = []
+                for word in key_words:
+                    if word in page_source:
+                        found_keywords.append(word)
+
+                if found_keywords:
+                    self.logger.info(f"页面包含关键词: {found_keywords}")
+                else:
+                    self.logger.warning("页面不包含任何预期关键词")
+
+                # 检查是否有任何链接
+                all_links = self.driver.find_elements(By.TAG_NAME, "a")
+                self.logger.info(f"页面总共有 {len(all_links)} 个链接")
+
+                # 检查包含member的链接
+                member_links = [link for link in all_links if 'member' in link.get_attribute('href') or '']
+                self.logger.info(f"包含'member'的链接有 {len(member_links)} 个")
+
+                if member_links:
+                    for i, link in enumerate(member_links[:3]):  # 只显示前3个
+                        href = link.get_attribute('href')
+                        text = link.text.strip()
+                        self.logger.info(f"Member链接 {i+1}: {href} (文本: '{text}')")
+
+            except Exception as e:
+                self.logger.error(f"获取页面调试信息失败: {str(e)}")
+                if not self._check_browser_connection():
+                    raise Exception(f"第{page_num}页调试信息获取时浏览器连接断开")
+
+        page_users = []
+        page_ids = set()
+        for link in user_links:
+            try:
+                href = link.get_attribute('href')
+                if href and '/member/' in href and '/general/' not in href:
+                    user_id = extract_user_id_from_url(href)
+                    if user_id:
+                        # 尝试获取用户名 - 优先使用data-testid='profile-username'
+                        username = "Unknown"
+                        try:
+                            # 首先尝试使用精确的用户名选择器
+                            username_element = link.find_element(By.CSS_SELECTOR, "[data-testid='profile-username']")
+                            username = clean_text(username_element.text)
+                            if username:
+                                self.logger.debug(f"使用data-testid获取用户名: {username}")
+                        except NoSuchElementException:
+                            try:
+                                # 尝试其他用户名选择器
+                                username_element = link.find_element(By.CSS_SELECTOR, ".user-name, .username, [data-testid='username']")
+                                username = clean_text(username_element.text)
+                                if username:
+                                    self.logger.debug(f"使用通用选择器获取用户名: {username}")
+                            except NoSuchElementException:
+                                # 如果找不到用户名元素，从链接文本中提取第一行
+                                link_text = clean_text(link.text)
+                                if link_text:
+                                    # 取第一行作为用户名，过滤掉"Nog geen reviews"等
+                                    lines = link_text.split('\n')
+                                    for line in lines:
+                                        line = line.strip()
+                                        # 跳过常见的非用户名文本
+                                        if line and not any(skip in line.lower() for skip in USERNAME_SKIP_WORDS):
+                                            username = line
+                                            self.logger.debug(f"从链接文本提取用户名: {username}")
+                                            break
+
+                                if username == "Unknown":
+                                    username = f"User_{user_id}"
+
+                        user_info = UserInfo(
+                            user_id=user_id,
+                            username=username,
+                            profile_url=href
+                        )
+
+                        # 避免重复添加
+                        if user_id not in page_ids:
+                            page_ids.add(user_id)
+                            page_users.append(user_info)
+
+            except Exception as e:
+                self.logger.warning(f"提取用户链接失败: {str(e)}")
+                continue
+
+        return False, page_users
 
     def _build_user_shop_url(self, profile_url: str) -> str:
         """
@@ -597,168 +1065,497 @@ class VintedScraper:
         Returns:
             更新后的用户信息
         """
+        self.last_check_outcome = None
+        if not self.circuit_breaker.allow():
+            # 冷却中不加载页面，由调用方稍后重试或交给其他窗口
+            self.last_check_outcome = CHECK_SKIPPED
+            user_info.status = "error"
+            user_info.error_message = f"窗口暂停中: {self.circuit_breaker.last_reason}"
+            return user_info
+
         try:
             self._update_status(f"正在检查用户 {user_info.username} 的库存...")
 
+            # 接口模式：不打开页面直接读取商品数量
+            if self.inventory_strategy == 'api':
+                api_result = self._check_inventory_via_api(user_info)
+                if api_result is not None:
+                    self.circuit_breaker.record_success()
+                    return api_result
+
             # 构建用户商店页面URL
             shop_url = self._build_user_shop_url(user_info.profile_url)
             self.logger.info(f"访问用户商店页面: {shop_url}")
 
-            if not self._safe_get_page(shop_url):
+            if not self._safe_get_page(shop_url, 'shop'):
+                if self.last_block_page:
+                    return self._mark_blocked(user_info, self.last_block_page)
                 user_info.status = "error"
                 user_info.error_message = "无法访问用户商店页面"
-                return user_info
+            else:
+                self.resource_blocker.record_page()
+                user_info = self._parse_inventory_page(user_info, wait_ready=False, soft_timeout=self.last_soft_timeout)
+
+        except Exception as e:
+            self.logger.error(f"检查用户库存失败: {str(e)}")
+            user_info.status = "error"
+            user_info.error_message = str(e)
+
+        self._record_check_result(user_info)
+        return user_info
+
+    def _record_check_result(self, user_info: UserInfo):
+        """
+        用一次检查结果更新窗口熔断器：成功时恢复，出错时计为一次错误（试探中出错则重新断开）
+
+        Args:
+            user_info: 已检查的用户信息
+        """
+        if user_info.status == "error":
+            self.circuit_breaker.record_failure(user_info.error_message)
+        else:
+            self.circuit_breaker.record_success()
+
+    def _check_inventory_via_api(self, user_info: UserInfo) -> Optional[UserInfo]:
+        """
+        通过浏览器内的JSON接口检查用户库存
+
+        Args:
+            user_info: 用户信息
+
+        Returns:
+            更新后的用户信息，接口不可用时返回None（由调用方回退到页面检查）
+        """
+        try:
+            self._ensure_api_origin(user_info.profile_url)
+            summary = self.api_client.get_wardrobe_summary(
+                user_info.user_id,
+                user_info.profile_url,
+                per_page=MAX_ITEM_TITLES
+            )
+        except VintedApiError as e:
+            self.logger.warning(f"接口检查用户 {user_info.username} 失败，改用页面检查: {str(e)}")
+            return None
+
+        item_count = summary['item_count']
+        user_info.item_count = item_count
+        user_info.items = summary['items']
+        if item_count > 0:
+            user_info.status = "has_inventory"
+            self._update_status(f"✅ {user_info.username} - 有库存 ({item_count}个商品)")
+        else:
+            user_info.status = "no_inventory"
+            self._update_status(f"❌ {user_info.username} - 无库存")
+
+        self.logger.info(f"接口检查用户 {user_info.username}: {item_count} 个商品")
+        return user_info
 
-            # 等待页面加载
-            time.sleep(3)
+    def _parse_inventory_page(self, user_info: UserInfo, wait_ready: bool = True,
+                              soft_timeout: bool = False) -> UserInfo:
+        """
+        解析当前已加载的用户商店页面，判断库存状态
+
+        Args:
+            user_info: 用户信息
+            wait_ready: 是否等待商品网格或空状态出现，为False时使用导航时的等待结果
+            soft_timeout: 页面是否加载超时后停止加载的
+
+        Returns:
+            更新后的用户信息
+        """
+        try:
+            # 等待商品网格或空状态出现
+            if wait_ready:
+                ready_selector = self.readiness.wait_for_selector(INVENTORY_READY_SELECTORS)
+            else:
+                ready_selector = self.last_ready_selector
+            if not ready_selector:
+                self.logger.warning(f"等待用户 {user_info.username} 的商品列表超时，继续尝试解析")
 
             # 滚动页面确保商品加载
             self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(2)
+            self.readiness.wait_for_dom_quiet()
             
             # 先检查实际的商品元素，而不是依赖文本消息
             self.logger.info(f"开始检测用户 {user_info.username} 的库存...")
 
-            # 获取页面源码用于调试
-            page_source = self.driver.page_source.lower()
-            
-            # 1. 首先检查库存数量显示
-            try:
-                import re
-                items_pattern = r'(\d+)\s+items?'
-                items_matches = re.findall(items_pattern, page_source)
-                if items_matches:
-                    # 取第一个匹配的数字作为库存数量
-                    item_count_from_text = int(items_matches[0])
-                    self.logger.info(f"从页面文本检测到库存数量: {item_count_from_text}")
-                else:
-                    item_count_from_text = None
-                    self.logger.info("未从页面文本检测到库存数量")
-            except Exception as e:
-                self.logger.warning(f"检测库存数量文本失败: {str(e)}")
-                item_count_from_text = None
+            # 优先单次脚本探测，失败时回退到逐元素探测
+            probe = None
+            if self.extraction_mode == 'script':
+                probe = self._probe_inventory_script()
+            if probe is None:
+                probe = self._probe_inventory_dom()
 
-            # 2. 检查是否有空状态元素
-            try:
-                empty_state_selector = "#content > div > div.container > div > div:nth-child(3) > div.profile__items-wrapper > div.web_ui__EmptyState__empty-state"
-                empty_elements = self.driver.find_elements(By.CSS_SELECTOR, empty_state_selector)
-                has_empty_state = len(empty_elements) > 0
-                self.logger.info(f"空状态元素检测: {'找到' if has_empty_state else '未找到'}")
-
-                if has_empty_state:
-                    # 确实是空状态，没有库存
-                    user_info.status = "no_inventory"
-                    user_info.item_count = 0
-                    self.logger.info(f"用户 {user_info.username} 确认无库存（空状态）")
-                    return user_info
+            if soft_timeout and not ready_selector and not probe.get('grid_count') and not probe.get('empty_state'):
+                # 页面加载超时且没有达到完成条件，既没有商品也没有空状态，不能当作无库存
+                user_info.status = "error"
+                user_info.error_message = "页面未加载完成，无法确认库存"
+                return user_info
 
-            except Exception as e:
-                self.logger.warning(f"检查空状态元素失败: {str(e)}")
-                has_empty_state = False
+            return self._apply_inventory_probe(user_info, probe)
 
-            # 3. 查找实际的商品元素
-            try:
-                # 基于调试结果，优先使用有效的选择器
-                item_selectors = [
-                    ".feed-grid__item",  # 调试验证有效
-                    ".item-box",
-                    "[data-testid='item']",
-                    ".catalog-item",
-                    ".product-item"
-                ]
+        except Exception as e:
+            self.logger.error(f"检查用户库存失败: {str(e)}")
+            user_info.status = "error"
+            user_info.error_message = str(e)
+        
+        return user_info
 
-                items_found = []
-                used_selector = None
-                for selector in item_selectors:
-                    try:
-                        item_elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                        if item_elements:
-                            items_found = item_elements
-                            used_selector = selector
-                            self.logger.info(f"使用选择器 '{selector}' 找到 {len(item_elements)} 个商品元素")
-                            break
-                    except Exception as e:
-                        self.logger.debug(f"选择器 '{selector}' 失败: {str(e)}")
-                        continue
-                
-                # 4. 根据检测结果判断库存状态
-                if items_found:
-                    # 找到了商品元素，有库存
-                    actual_item_count = len(items_found)
-
-                    # 提取商品信息 - 改进提取逻辑
-                    items = []
-                    for i, item_element in enumerate(items_found[:20]):  # 限制最多20个商品
+    def _probe_inventory_script(self) -> Optional[Dict]:
+        """
+        通过一次注入脚本探测商店页面的库存信息
+
+        Returns:
+            探测结果 {empty_state, header_count, grid_count, selector, item_texts}，脚本不可用时返回None
+        """
+        domain = self._current_domain()
+        item_selectors = self.selector_registry.order('inventory_items', domain, ITEM_SELECTORS)
+        try:
+            probe = self.driver.execute_script(
+                INVENTORY_PROBE_SCRIPT,
+                [INVENTORY_EMPTY_STATE_SELECTOR],
+                item_selectors,
+                MAX_ITEM_TITLES
+            )
+        except WebDriverException as e:
+            self.logger.warning(f"库存脚本探测失败，改用逐元素探测: {str(e)}")
+            return None
+
+        if not isinstance(probe, dict) or 'grid_count' not in probe:
+            self.logger.warning("库存脚本返回结果无效，改用逐元素探测")
+            return None
+
+        self.selector_registry.record_attempts('inventory_items', domain, item_selectors, probe.get('selector'))
+        return probe
+
+    def _probe_inventory_dom(self) -> Dict:
+        """
+        逐个元素探测商店页面的库存信息（兼容模式，WebDriver往返次数较多）
+
+        Returns:
+            探测结果 {empty_state, header_count, grid_count, selector, item_texts}
+        """
+        probe = {
+            'empty_state': False,
+            'header_count': None,
+            'grid_count': 0,
+            'selector': None,
+            'item_texts': []
+        }
+
+        # 1. 首先检查库存数量显示（只读取可见文本，不获取整页源码）
+        try:
+            body_text = self.driver.find_element(By.TAG_NAME, "body").text.lower()
+            items_matches = re.findall(ITEM_COUNT_PATTERN, body_text)
+            if items_matches:
+                # 取第一个匹配的数字作为库存数量
+                probe['header_count'] = int(items_matches[0])
+        except Exception as e:
+            self.logger.warning(f"检测库存数量文本失败: {str(e)}")
+
+        # 2. 检查是否有空状态元素
+        try:
+            empty_elements = self.driver.find_elements(By.CSS_SELECTOR, INVENTORY_EMPTY_STATE_SELECTOR)
+            probe['empty_state'] = len(empty_elements) > 0
+            if probe['empty_state']:
+                return probe
+        except Exception as e:
+            self.logger.warning(f"检查空状态元素失败: {str(e)}")
+
+        # 3. 查找实际的商品元素
+        domain = self._current_domain()
+        item_selectors = self.selector_registry.order('inventory_items', domain, ITEM_SELECTORS)
+        tried_selectors = []
+        for selector in item_selectors:
+            tried_selectors.append(selector)
+            try:
+                item_elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
+                if item_elements:
+                    probe['grid_count'] = len(item_elements)
+                    probe['selector'] = selector
+                    for i, item_element in enumerate(item_elements[:MAX_ITEM_TITLES]):
                         try:
-                            # 获取商品文本内容
-                            item_text = item_element.text.strip()
-                            self.logger.debug(f"商品 {i+1} 原始文本: '{item_text}'")
-
-                            if item_text:
-                                # 分析文本结构，提取商品名称
-                                lines = [line.strip() for line in item_text.split('\n') if line.strip()]
-
-                                # 查找商品名称 - 通常是第一个不包含数字、价格、评级的行
-                                title = "Unknown Item"
-                                for line in lines:
-                                    # 跳过纯数字、价格、评级等
-                                    if (line and
-                                        not line.isdigit() and  # 跳过纯数字
-                                        '€' not in line and     # 跳过价格
-                                        not any(rating in line.lower() for rating in ['heel goed', 'very good', 'good', 'excellent', 'fair']) and  # 跳过评级
-                                        not any(size in line for size in ['·', '•']) and  # 跳过包含分隔符的行
-                                        len(line) > 1):  # 跳过单字符
-                                        title = line
-                                        break
-
-                                if title != "Unknown Item":
-                                    items.append(title)
-                                    self.logger.debug(f"商品 {i+1} 提取标题: '{title}'")
-                                else:
-                                    # 如果没找到合适的标题，使用第一行
-                                    if lines:
-                                        items.append(lines[0])
-                                        self.logger.debug(f"商品 {i+1} 使用第一行: '{lines[0]}'")
+                            probe['item_texts'].append(item_element.text.strip())
                         except Exception as e:
                             self.logger.debug(f"提取商品 {i+1} 信息失败: {str(e)}")
-                            continue
+                    break
+            except Exception as e:
+                self.logger.debug(f"选择器 '{selector}' 失败: {str(e)}")
+                continue
 
-                    user_info.status = "has_inventory"
-                    user_info.item_count = actual_item_count
-                    user_info.items = items
+        self.selector_registry.record_attempts('inventory_items', domain, tried_selectors, probe['selector'])
+        return probe
 
-                    # 验证文本检测的数量和实际元素数量
-                    if item_count_from_text and item_count_from_text != actual_item_count:
-                        self.logger.info(f"库存数量差异: 文本显示{item_count_from_text}，实际元素{actual_item_count}")
+    @staticmethod
+    def _extract_item_title(item_text: str) -> Optional[str]:
+        """
+        从商品卡片文本中提取商品名称
 
-                    self.logger.info(f"用户 {user_info.username} 确认有库存: {actual_item_count} 个商品")
+        Args:
+            item_text: 商品卡片的文本内容
 
-                    # 更新状态显示检查结果
-                    status_msg = f"✅ {user_info.username} - 有库存 ({actual_item_count}个商品)"
-                    self._update_status(status_msg)
+        Returns:
+            商品名称，文本为空时返回None
+        """
+        # 分析文本结构，提取商品名称
+        lines = [line.strip() for line in (item_text or '').split('\n') if line.strip()]
+        if not lines:
+            return None
+
+        # 查找商品名称 - 通常是第一个不包含数字、价格、评级的行
+        for line in lines:
+            # 跳过纯数字、价格、评级等
+            if (line and
+                not line.isdigit() and  # 跳过纯数字
+                '€' not in line and     # 跳过价格
+                not any(rating in line.lower() for rating in ['heel goed', 'very good', 'good', 'excellent', 'fair']) and  # 跳过评级
+                not any(size in line for size in ['·', '•']) and  # 跳过包含分隔符的行
+                len(line) > 1):  # 跳过单字符
+                return line
+
+        # 如果没找到合适的标题，使用第一行
+        return lines[0]
+
+    def _apply_inventory_probe(self, user_info: UserInfo, probe: Dict) -> UserInfo:
+        """
+        根据探测结果判断库存状态
+
+        Args:
+            user_info: 用户信息
+            probe: 库存探测结果
+
+        Returns:
+            更新后的用户信息
+        """
+        item_count_from_text = probe.get('header_count')
+        if item_count_from_text is not None:
+            self.logger.info(f"从页面文本检测到库存数量: {item_count_from_text}")
+        else:
+            self.logger.info("未从页面文本检测到库存数量")
+
+        self.logger.info(f"空状态元素检测: {'找到' if probe.get('empty_state') else '未找到'}")
+        if probe.get('empty_state'):
+            # 确实是空状态，没有库存
+            user_info.status = "no_inventory"
+            user_info.item_count = 0
+            self.logger.info(f"用户 {user_info.username} 确认无库存（空状态）")
+            return user_info
+
+        actual_item_count = probe.get('grid_count') or 0
+        if actual_item_count > 0:
+            # 找到了商品元素，有库存
+            self.logger.info(f"使用选择器 '{probe.get('selector')}' 找到 {actual_item_count} 个商品元素")
+
+            items = []
+            for item_text in probe.get('item_texts') or []:
+                title = self._extract_item_title(item_text)
+                if title:
+                    items.append(title)
+
+            user_info.status = "has_inventory"
+            user_info.item_count = actual_item_count
+            user_info.items = items
+
+            # 验证文本检测的数量和实际元素数量
+            if item_count_from_text and item_count_from_text != actual_item_count:
+                self.logger.info(f"库存数量差异: 文本显示{item_count_from_text}，实际元素{actual_item_count}")
+
+            self.logger.info(f"用户 {user_info.username} 确认有库存: {actual_item_count} 个商品")
+
+            # 更新状态显示检查结果
+            self._update_status(f"✅ {user_info.username} - 有库存 ({actual_item_count}个商品)")
+        else:
+            # 没有找到商品元素，确认无库存
+            user_info.status = "no_inventory"
+            user_info.item_count = 0
+            self.logger.info(f"用户 {user_info.username} 确认无库存（未找到商品元素）")
+
+            # 更新状态显示检查结果
+            self._update_status(f"❌ {user_info.username} - 无库存")
 
-                else:
-                    # 没有找到商品元素，确认无库存
-                    user_info.status = "no_inventory"
-                    user_info.item_count = 0
-                    self.logger.info(f"用户 {user_info.username} 确认无库存（未找到商品元素）")
-
-                    # 更新状态显示检查结果
-                    status_msg = f"❌ {user_info.username} - 无库存"
-                    self._update_status(status_msg)
-                
-            except Exception as e:
-                self.logger.warning(f"查找商品列表失败: {str(e)}")
-                user_info.status = "error"
-                user_info.error_message = f"商品列表解析失败: {str(e)}"
-            
-        except Exception as e:
-            self.logger.error(f"检查用户库存失败: {str(e)}")
-            user_info.status = "error"
-            user_info.error_message = str(e)
-        
         return user_info
 
+    def _iter_checked_users(self, users: List[UserInfo]) -> Iterator[UserInfo]:
+        """
+        依次检查用户库存，配置了多个标签页时使用标签页流水线
+
+        Args:
+            users: 待检查的用户列表
+
+        Yields:
+            检查完成的用户信息（顺序与输入一致）
+        """
+        if self.tabs_per_window > 1 and len(users) > 1:
+            # 窗口暂停过时先逐个检查，试探成功后再用多标签页，冷却结束后只放行一次试探
+            while users and self.circuit_breaker.state != STATE_CLOSED:
+                if self.should_stop or not self._wait_for_circuit():
+                    return
+                yield self._check_user_safely(users[0])
+                users = users[1:]
+            if len(users) > 1:
+                yield from self._iter_checked_users_in_tabs(users)
+                return
+
+        yield from self._iter_checked_users_one_by_one(users)
+
+    def _iter_checked_users_one_by_one(self, users: List[UserInfo]) -> Iterator[UserInfo]:
+        """逐个检查用户库存，窗口熔断冷却中时先等待冷却结束"""
+        for user in users:
+            if self.should_stop or not self._wait_for_circuit():
+                return
+            yield self._check_user_safely(user)
+
+    def _mark_check_failed(self, user: UserInfo, error: Exception) -> UserInfo:
+        """
+        检查或处理检查结果时出现异常：把该用户记为检查出错
+
+        Args:
+            user: 用户信息
+            error: 异常
+
+        Returns:
+            更新后的用户信息
+        """
+        self.logger.error(f"检查用户 {user.username} 失败: {str(error)}")
+        user.status = "error"
+        user.error_message = str(error)
+        return user
+
+    def _check_user_safely(self, user: UserInfo) -> UserInfo:
+        """检查单个用户库存，异常时标记为错误而不是抛出"""
+        started = time.time()
+        try:
+            user = self.check_user_inventory(user)
+        except Exception as e:
+            self._mark_check_failed(user, e)
+        user.check_duration = time.time() - started
+        return user
+
+    def _iter_checked_users_in_tabs(self, users: List[UserInfo]) -> Iterator[UserInfo]:
+        """
+        多标签页流水线：每个标签页加载下一个用户的商店页面时，解析已加载完成的标签页
+
+        Args:
+            users: 待检查的用户列表
+
+        Yields:
+            检查完成的用户信息（顺序与输入一致）
+        """
+        tab_pool = TabPool(self.driver, min(self.tabs_per_window, len(users)), self.page_load_timeout)
+        try:
+            handles = tab_pool.open()
+        except Exception as e:
+            self.logger.warning(f"多标签页初始化失败，改为逐个检查: {str(e)}")
+            tab_pool.close()
+            yield from self._iter_checked_users_one_by_one(users)
+            return
+
+        pending = deque()
+        remaining = iter(users)
+        # 遇到拦截页面后剩余的用户改为逐个检查（先等待窗口冷却）
+        blocked_rest: List[UserInfo] = []
+        # 所有标签页都导航失败后剩余的用户
+        unchecked_rest: List[UserInfo] = []
+
+        def start_next(handle: str) -> bool:
+            user = next(remaining, None)
+            if user is None:
+                return False
+            shop_url = self._build_user_shop_url(user.profile_url)
+            started = time.time()
+            try:
+                tab_pool.navigate(handle, shop_url, before_navigate=lambda: self.resource_blocker.prepare(handle))
+            except Exception as e:
+                # 标签页仍停留在上一个用户的页面，不能解析；该标签页不再使用
+                self.logger.warning(f"标签页导航失败: {shop_url}, 错误: {str(e)}")
+                user.status = "error"
+                user.error_message = "无法访问用户商店页面"
+                pending.append((None, user, started))
+                return True
+            pending.append((handle, user, started))
+            return True
+
+        try:
+            self.logger.info(f"使用 {len(handles)} 个标签页流水线检查 {len(users)} 个用户")
+            if not self._wait_for_circuit():
+                return
+            for handle in handles:
+                if not start_next(handle):
+                    break
+
+            while pending and not self.should_stop:
+                handle, user, started = pending.popleft()
+                self._update_status(f"正在检查用户 {user.username} 的库存...")
+                self.last_check_outcome = None
+
+                if handle is None:
+                    # 导航失败，已记为出错
+                    self._record_navigation('shop', started, 'failed')
+                    updated_user = user
+                elif tab_pool.wait_ready(handle):
+                    block = self._detect_block_page()
+                    if block:
+                        self._record_navigation('shop', started, 'blocked')
+                        updated_user = self._mark_blocked(user, block)
+                        updated_user.check_duration = time.time() - started
+                        if self.circuit_breaker.state != STATE_CLOSED:
+                            # 其他标签页的页面同样不可信，停止流水线
+                            blocked_rest = [pending_user for _, pending_user, _ in pending] + list(remaining)
+                            pending.clear()
+                            yield updated_user
+                            break
+                        start_next(handle)
+                        yield updated_user
+                        continue
+                    if tab_pool.on_target(handle):
+                        self._record_navigation('shop', started, 'soft_timeout' if tab_pool.last_soft_timeout else 'ok')
+                        self.resource_blocker.record_page(handle)
+                        updated_user = self._parse_inventory_page(user, soft_timeout=tab_pool.last_soft_timeout)
+                    else:
+                        # 不是该用户的商店页面（如仍是上一个用户的页面），不能解析
+                        self._record_navigation('shop', started, 'failed')
+                        self.logger.warning(f"标签页未打开目标页面: {user.profile_url}，当前地址: {tab_pool.last_url}")
+                        user.status = "error"
+                        user.error_message = "无法访问用户商店页面"
+                        updated_user = user
+                else:
+                    self._record_navigation('shop', started, 'failed')
+                    self.logger.warning(f"标签页加载超时: {user.profile_url}")
+                    user.status = "error"
+                    user.error_message = "无法访问用户商店页面"
+                    updated_user = user
+                # 包含在后台加载的时间
+                updated_user.check_duration = time.time() - started
+
+                self._record_check_result(updated_user)
+                if self.circuit_breaker.state != STATE_CLOSED:
+                    # 连续出错导致窗口暂停，剩余用户等冷却结束后逐个检查
+                    blocked_rest = [pending_user for _, pending_user, _ in pending] + list(remaining)
+                    pending.clear()
+                    yield updated_user
+                    break
+
+                # 当前标签页解析完成后立即开始加载下一个用户
+                if handle is not None:
+                    start_next(handle)
+                yield updated_user
+
+            if not blocked_rest and not self.should_stop:
+                # 所有标签页都已导航失败时，剩余用户改为逐个检查
+                unchecked_rest = list(remaining)
+        finally:
+            tab_pool.close()
+            # 额外的标签页已关闭，原标签页的拦截在本轮结束时恢复
+            for handle in handles[1:]:
+                self.resource_blocker.forget_tab(handle)
+
+        if blocked_rest:
+            self.logger.info(f"窗口遇到拦截，剩余 {len(blocked_rest)} 个用户改为逐个检查")
+            yield from self._iter_checked_users_one_by_one(blocked_rest)
+        elif unchecked_rest:
+            self.logger.info(f"标签页不可用，剩余 {len(unchecked_rest)} 个用户改为逐个检查")
+            yield from self._iter_checked_users_one_by_one(unchecked_rest)
+
     def scrape_all_users(self, following_url: str) -> ScrapingResult:
         """
         采集所有用户的库存信息
@@ -808,9 +1605,8 @@ class VintedScraper:
                         users_with_errors.append(updated_user)
 
                     # 添加延迟避免请求过快
-                    delay = self.config.get('delay_between_requests', 1)
-                    if delay > 0:
-                        time.sleep(delay)
+                    self._report_check(updated_user)
+                    self._wait_between_requests()
 
                 except Exception as e:
                     self.logger.error(f"检查用户 {user.username} 失败: {str(e)}")
@@ -841,145 +1637,462 @@ class VintedScraper:
             self.logger.error(f"采集过程失败: {str(e)}")
             raise
 
-    def scrape_multiple_admins(self, admin_urls: List[Dict]) -> ScrapingResult:
+    def _extract_admin_users(self, admin_data: Dict) -> List[UserInfo]:
         """
-        采集多个管理员的关注列表和库存信息
+        提取单个管理员的关注用户，并标记所属管理员
 
         Args:
-            admin_urls: 管理员URL列表，格式：[{'admin_name': '管理员1', 'url': 'xxx'}, ...]
+            admin_data: 管理员信息，格式：{'admin_name': '管理员1', 'url': 'xxx', 'user_id': 'xxx'}
 
         Returns:
-            采集结果
+            过滤掉管理员自己后的用户列表
         """
-        start_time = time.time()
-        self.should_stop = False
+        admin_name = admin_data['admin_name']
+        admin_id = admin_data.get('user_id', '')  # 获取管理员ID
+
+        users = self.extract_following_users(admin_data['url'])
+
+        filtered_users = []
+        for user in users:
+            # 过滤掉管理员自己（避免检查管理员自己的库存）
+            if user.user_id != admin_id:
+                user.admin_name = admin_name
+                user.admin_id = admin_id
+                filtered_users.append(user)
+            else:
+                self.logger.info(f"过滤掉管理员自己: {user.username} (ID: {user.user_id})")
 
-        all_users = []
-        admin_summary = {}
+        self.logger.info(f"{admin_name} 关注了 {len(filtered_users)} 个用户")
+        return filtered_users
 
-        try:
-            # 简单流程：边提取边检查，单线程顺序处理
-            self._update_status(f"开始处理 {len(admin_urls)} 个管理员的关注列表...")
+    def _observe_follows(self, users: List[UserInfo]):
+        """与上一轮的关注列表对比"""
+        if self.diff_engine:
+            for user in users:
+                event = self.diff_engine.observe_follow(user)
+                if event:
+                    self._dispatch_diff_event(event)
 
-            users_with_inventory = []
-            users_without_inventory = []
-            users_with_errors = []
+    def _resolve_admin_users(self, admin_data: Dict, state_lock=None) -> List[UserInfo]:
+        """
+        获取管理员的关注用户：本轮断点记录中已有时直接使用，否则提取并记录
 
-            # 为每个管理员提取关注列表并立即检查库存
-            for i, admin_data in enumerate(admin_urls):
-                if self.should_stop:
-                    raise Exception("用户取消操作")
+        Args:
+            admin_data: 管理员信息
+            state_lock: 写入断点记录和对比关注列表时持有的锁（多窗口并行时由采集池传入），
+                        页面提取不持有该锁
 
-                admin_name = admin_data['admin_name']
-                admin_url = admin_data['url']
+        Returns:
+            过滤掉管理员自己后的用户列表
+        """
+        admin_name = admin_data['admin_name']
+        state_lock = state_lock or nullcontext()
+        if self.round_journal:
+            resolved = self.round_journal.resolved_users(admin_name)
+            if resolved is not None:
+                users = [UserInfo(**data) for data in resolved]
+                with state_lock:
+                    self._observe_follows(users)
+                self.logger.info(f"{admin_name} 的关注列表已在本轮提取过（{len(users)} 个用户），不再重复提取")
+                return users
+
+        users = self._extract_admin_users(admin_data)
+        with state_lock:
+            self._observe_follows(users)
+            if self.round_journal:
+                self.round_journal.record_admin(admin_name, users)
+        return users
 
-                self._update_status(f"正在处理 {admin_name} 的关注列表...")
+    def _restore_checked_user(self, user: UserInfo) -> Optional[UserInfo]:
+        """
+        取出本轮断点记录中已完成的检查结果（已提醒过，只参与对比不再提醒）
+
+        Args:
+            user: 待检查的用户信息
+
+        Returns:
+            已完成的检查结果，尚未检查时返回None
+        """
+        if not self.round_journal:
+            return None
+        data = self.round_journal.checked_user(user.admin_name, user.user_id)
+        if data is None:
+            return None
+        # 原地更新，管理员汇总中的用户对象同样带有检查结果
+        for key, value in data.items():
+            setattr(user, key, value)
+        if self.diff_engine:
+            event = self.diff_engine.observe(user)
+            if event:
+                self._dispatch_diff_event(event)
+        return user
+
+    def _handle_checked_user(self, updated_user: UserInfo,
+                             users_with_inventory: List[UserInfo],
+                             users_without_inventory: List[UserInfo],
+                             users_with_errors: List[UserInfo]):
+        """
+        处理检查结果并按状态归类用户
 
+        Args:
+            updated_user: 已检查的用户信息
+            users_with_inventory: 有库存用户列表
+            users_without_inventory: 无库存用户列表
+            users_with_errors: 检查出错用户列表
+        """
+        self._process_checked_user(updated_user)
+        self._classify_user(updated_user, users_with_inventory, users_without_inventory, users_with_errors)
+
+    @staticmethod
+    def _classify_user(user: UserInfo,
+                       users_with_inventory: List[UserInfo],
+                       users_without_inventory: List[UserInfo],
+                       users_with_errors: List[UserInfo]):
+        """按检查状态把用户放入对应列表"""
+        if user.status == "has_inventory":
+            users_with_inventory.append(user)
+        elif user.status == "no_inventory":
+            users_without_inventory.append(user)
+        else:
+            users_with_errors.append(user)
+
+    def _process_checked_user(self, updated_user: UserInfo):
+        """
+        记录检查结果并与上一轮对比，无库存时触发提醒
+
+        Args:
+            updated_user: 已检查的用户信息
+        """
+        if self.observation_store:
+            self.observation_store.record(updated_user)
+        if self.round_journal:
+            self.round_journal.record_check(updated_user)
+        if self.diff_engine:
+            event = self.diff_engine.observe(updated_user)
+            if event:
+                self._dispatch_diff_event(event)
+
+        if updated_user.status == "no_inventory":
+            # 无库存 = 已出库，发出声音提醒
+            self._play_notification_sound()
+            self._update_status(f"🔔 发现已出库账号: {updated_user.username} ({updated_user.admin_name})")
+
+            # 调用库存提醒回调
+            if self.inventory_callback:
                 try:
-                    # 提取关注用户
-                    users = self.extract_following_users(admin_url)
+                    # 传递更多信息：用户名、管理员名、profile_url、管理员ID
+                    self.inventory_callback(
+                        updated_user.username,
+                        updated_user.admin_name,
+                        updated_user.profile_url,
+                        updated_user.admin_id
+                    )
+                except Exception as e:
+                    self.logger.error(f"库存提醒回调失败: {str(e)}")
 
-                    # 为每个用户添加管理员信息，并过滤掉管理员自己
-                    admin_id = admin_data.get('user_id', '')  # 获取管理员ID
+    def _dispatch_diff_event(self, event: DiffEvent):
+        """
+        处理与上一轮对比产生的事件
 
-                    filtered_users = []
-                    for user in users:
-                        # 过滤掉管理员自己（避免检查管理员自己的库存）
-                        if user.user_id != admin_id:
-                            user.admin_name = admin_name
-                            user.admin_id = admin_id
-                            filtered_users.append(user)
-                        else:
-                            self.logger.info(f"过滤掉管理员自己: {user.username} (ID: {user.user_id})")
+        Args:
+            event: 对比事件
+        """
+        if event.kind == EVENT_RESTOCKED:
+            self._update_status(f"📦 账号已补货: {event.username} ({event.admin_name})")
+            if self.restocked_callback:
+                try:
+                    self.restocked_callback(event.username, event.admin_name, event.profile_url, event.admin_id)
+                except Exception as e:
+                    self.logger.error(f"补货回调失败: {str(e)}")
+        elif event.kind == EVENT_WENT_EMPTY:
+            # 出库提醒已由库存提醒回调处理，这里只记录状态变化
+            self.logger.info(f"账号由有库存变为无库存: {event.username} ({event.admin_name})")
+        elif event.kind == EVENT_NEW_FOLLOW:
+            self._update_status(f"➕ {event.admin_name} 新关注: {event.username}")
+        elif event.kind == EVENT_UNFOLLOWED:
+            self._update_status(f"➖ {event.admin_name} 取消关注: {event.username}")
+
+    def _finish_diff_round(self, admin_urls: List[Dict], admin_summary: Dict) -> List[DiffEvent]:
+        """
+        结束本轮对比，找出取消关注的用户
 
-                    users = filtered_users  # 使用过滤后的用户列表
+        Args:
+            admin_urls: 管理员URL列表
+            admin_summary: 每个管理员的统计信息（提取失败的管理员不参与取消关注判断）
 
-                    all_users.extend(users)
-                    admin_summary[admin_name] = {
-                        'url': admin_url,
-                        'following_count': len(users),
-                        'users': users
-                    }
+        Returns:
+            本轮全部对比事件
+        """
+        if not self.diff_engine:
+            return []
+
+        completed_admins = [
+            admin_data for admin_data in admin_urls
+            if 'error' not in admin_summary.get(admin_data['admin_name'], {'error': True})
+        ]
+        for event in self.diff_engine.finish_round(completed_admins):
+            self._dispatch_diff_event(event)
+
+        summary = self.diff_engine.get_summary()
+        self.logger.info(
+            f"与上一轮对比: 出库 {summary[EVENT_WENT_EMPTY]}，补货 {summary[EVENT_RESTOCKED]}，"
+            f"新关注 {summary[EVENT_NEW_FOLLOW]}，取消关注 {summary[EVENT_UNFOLLOWED]}"
+        )
+        return list(self.diff_engine.events)
+
+    def _wait_between_requests(self):
+        """两次检查之间的等待：自适应限速时等到下一次请求的时间，否则固定延迟"""
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
+            return
+        delay = self.config.get('delay_between_requests', 1)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _report_check(self, user: UserInfo):
+        """把检查耗时和结果反馈给限速器"""
+        if not self.rate_limiter or self.last_check_outcome == CHECK_SKIPPED:
+            return
+        if self.last_check_outcome in (BLOCK_KIND_CHALLENGE, BLOCK_KIND_LOGIN):
+            self.rate_limiter.record(OUTCOME_CHALLENGE)
+        else:
+            self.rate_limiter.record(classify_outcome(user.status, user.check_duration, self.slow_check_seconds))
+
+    def _reset_round_stats(self):
+        """清空本轮的页面访问和就绪等待统计"""
+        self.navigation_count = 0
+        self.navigation_stats = {}
+        self.readiness.reset_stats()
+        self.resource_blocker.reset_stats()
+        self.user_index.reset()
+        if self.rate_limiter:
+            self.rate_limiter.reset_stats()
+
+    def _log_round_stats(self):
+        """输出本轮页面访问次数和就绪等待的实际耗时统计"""
+        self.logger.info(f"本轮页面访问 {self.navigation_count} 次")
+        for page_type, stats in self.navigation_stats.items():
+            self.logger.info(
+                f"页面导航 {page_type}: {stats['count']} 次，平均 {stats['total_time'] / stats['count']:.2f} 秒，"
+                f"软超时 {stats['soft_timeouts']} 次，失败 {stats['failures']} 次"
+            )
+        for key, entry in self.selector_registry.get_stats().items():
+            self.logger.info(f"选择器 {key}: 首选 '{entry.get('preferred')}'")
+        for signal, stats in self.readiness.get_stats().items():
+            self.logger.info(
+                f"就绪等待 {signal}: {stats['count']} 次，平均 {stats['avg_time']:.2f} 秒，"
+                f"最长 {stats['max_time']:.2f} 秒，超时 {stats['timeouts']} 次"
+            )
+        if self.rate_limiter:
+            stats = self.rate_limiter.get_stats()
+            self.logger.info(
+                f"请求速率: 当前 {stats['rate']:.2f} 次/秒（本轮 {stats['min_rate']:.2f}-{stats['max_rate']:.2f}），"
+                f"请求 {stats['requests']} 次，退避 {stats['backoffs']} 次，累计等待 {stats['waited']:.1f} 秒"
+            )
+        breaker_stats = self.circuit_breaker.get_stats()
+        if breaker_stats['trips']:
+            self.logger.info(
+                f"{self.circuit_breaker.name} 遇到拦截暂停 {breaker_stats['trips']} 次，"
+                f"当前状态 {breaker_stats['state']}，最近原因: {breaker_stats['last_reason']}"
+            )
+        index_stats = self.user_index.get_stats()
+        if index_stats['shared']:
+            self.logger.info(
+                f"本轮 {index_stats['unique']} 个账号中有 {index_stats['shared']} 个被多个管理员关注，"
+                f"复用检查结果 {index_stats['reused']} 次"
+            )
+        if self.resource_blocker.enabled:
+            stats = self.resource_blocker.get_stats()
+            message = (
+                f"精简模式: {stats['lean_pages']} 个页面，拦截 {stats['blocked_requests']} 个请求，"
+                f"传输 {stats['lean_bytes'] / 1024:.0f} KB"
+            )
+            if stats['saved_bytes'] is not None:
+                message += (
+                    f"，相比 {stats['baseline_pages']} 个基准页面约节省 {stats['saved_bytes'] / 1024:.0f} KB、"
+                    f"{stats['saved_ms'] / 1000:.1f} 秒"
+                )
+            self.logger.info(message)
+
+    def iter_checks(self, admin_urls: List[Dict]) -> Iterator[UserInfo]:
+        """
+        逐个产出多个管理员关注用户的库存检查结果
 
-                    self.logger.info(f"{admin_name} 关注了 {len(users)} 个用户")
+        每个用户检查并归类后立即产出（已写入记录、完成对比和出库提醒），
+        调用方可以边检查边写报告、提醒和刷新界面，不需要等待整轮结束。
+        管理员汇总写入round_summary，全部产出后对比事件写入round_diff_events。
+        提前停止迭代时同样会恢复正常浏览并写入本轮记录。
 
-                    # 立即检查这些用户的库存（单线程顺序处理）
-                    if users:
-                        self._update_status(f"开始检查 {admin_name} 的 {len(users)} 个用户库存...")
+        Args:
+            admin_urls: 管理员URL列表，格式：[{'admin_name': '管理员1', 'url': 'xxx'}, ...]
 
-                        for j, user in enumerate(users):
-                            if self.should_stop:
-                                break
+        Yields:
+            检查完成的用户信息
+        """
+        self.should_stop = False
+        self._reset_round_stats()
+        self.round_summary = {}
+        self.round_diff_events = []
+        if self.observation_store:
+            self.observation_store.start_round()
+        if self.diff_engine:
+            self.diff_engine.begin_round()
+        if self.round_journal and self.round_journal.begin(admin_urls):
+            self._update_status("从上次中断处继续本轮采集...")
+
+        found_users = False
 
-                            self._update_progress(j + 1, len(users), f"检查 {admin_name} 的用户: {user.username}")
+        try:
+            # 简单流程：边提取边检查，单线程顺序处理
+            self._update_status(f"开始处理 {len(admin_urls)} 个管理员的关注列表...")
 
-                            try:
-                                # 使用原有的库存检查方法
-                                updated_user = self.check_user_inventory(user)
-
-                                if updated_user.status == "has_inventory":
-                                    users_with_inventory.append(updated_user)
-                                elif updated_user.status == "no_inventory":
-                                    users_without_inventory.append(updated_user)
-                                    # 无库存 = 已出库，发出声音提醒
-                                    self._play_notification_sound()
-                                    self._update_status(f"🔔 发现已出库账号: {updated_user.username} ({updated_user.admin_name})")
-
-                                    # 调用库存提醒回调
-                                    if self.inventory_callback:
-                                        try:
-                                            # 传递更多信息：用户名、管理员名、profile_url、管理员ID
-                                            self.inventory_callback(
-                                                updated_user.username,
-                                                updated_user.admin_name,
-                                                updated_user.profile_url,
-                                                updated_user.admin_id
-                                            )
-                                        except Exception as e:
-                                            self.logger.error(f"库存提醒回调失败: {str(e)}")
-                                else:
-                                    users_with_errors.append(updated_user)
-
-                                # 添加延迟避免请求过快
-                                delay = self.config.get('delay_between_requests', 1)
-                                if delay > 0:
-                                    time.sleep(delay)
+            # 为每个管理员提取关注列表并立即检查库存
+            for admin_data in admin_urls:
+                if self.should_stop:
+                    raise Exception("用户取消操作")
 
-                            except Exception as e:
-                                self.logger.error(f"检查用户 {user.username} 失败: {str(e)}")
-                                user.status = "error"
-                                user.error_message = str(e)
-                                users_with_errors.append(user)
+                admin_name = admin_data['admin_name']
+                admin_url = admin_data['url']
 
+                self._update_status(f"正在处理 {admin_name} 的关注列表...")
+
+                try:
+                    # 提取关注用户（已过滤管理员自己）
+                    users = self._resolve_admin_users(admin_data)
                 except Exception as e:
                     self.logger.error(f"处理 {admin_name} 失败: {str(e)}")
-                    admin_summary[admin_name] = {
+                    self.round_summary[admin_name] = {
                         'url': admin_url,
                         'following_count': 0,
                         'error': str(e),
                         'users': []
                     }
+                    continue
+
+                found_users = found_users or bool(users)
+                self.round_summary[admin_name] = {
+                    'url': admin_url,
+                    'following_count': len(users),
+                    'users': users
+                }
+
+                # 立即检查这些用户的库存（单线程顺序处理）
+                if users:
+                    self._update_status(f"开始检查 {admin_name} 的 {len(users)} 个用户库存...")
+
+                    # 本轮中断前已检查的用户直接使用记录的结果
+                    pending_users = []
+                    restored_users = []
+                    shared_users = []
+                    for user in users:
+                        self.user_index.add(user)
+                        if self._restore_checked_user(user) is not None:
+                            self.user_index.record(user)
+                            restored_users.append(user)
+                        elif self.user_index.apply_result(user):
+                            # 已在其他管理员下检查过的账号，结果同样归入本管理员并提醒
+                            shared_users.append(user)
+                        else:
+                            pending_users.append(user)
+                    if restored_users:
+                        self.logger.info(f"{admin_name} 已有 {len(restored_users)} 个用户在本轮检查过，跳过")
+                        yield from restored_users
+                    if shared_users:
+                        self.logger.info(f"{admin_name} 有 {len(shared_users)} 个用户已在其他管理员下检查过，直接使用结果")
+                        for user in shared_users:
+                            try:
+                                self._process_checked_user(user)
+                            except Exception as e:
+                                self._mark_check_failed(user, e)
+                            yield user
+
+                    checked = self._iter_checked_users(pending_users)
+                    done = len(restored_users) + len(shared_users)
+                    for k, user in enumerate(pending_users):
+                        if self.should_stop:
+                            break
+                        # 单个用户检查、记录或回调出错时只把该用户记为出错，继续检查剩余用户
+                        # （yield不放在try中，调用方的异常照常抛出）
+                        try:
+                            updated_user = next(checked)
+                        except StopIteration:
+                            break
+                        except Exception as e:
+                            updated_user = self._mark_check_failed(user, e)
+                            # 检查流程已中断，剩余用户重新开始逐个检查
+                            checked = self._iter_checked_users_one_by_one(pending_users[k + 1:])
+
+                        done += 1
+                        try:
+                            self._update_progress(done, len(users), f"检查 {admin_name} 的用户: {updated_user.username}")
+                            self._report_check(updated_user)
+                            self.user_index.record(updated_user)
+                            self._process_checked_user(updated_user)
+                        except Exception as e:
+                            self._mark_check_failed(updated_user, e)
+
+                        yield updated_user
 
-            if not all_users:
+                        # 添加延迟避免请求过快
+                        self._wait_between_requests()
+
+            if not found_users:
                 raise Exception("未找到任何关注用户")
 
+            if not self.should_stop:
+                self.round_diff_events = self._finish_diff_round(admin_urls, self.round_summary)
+                if self.round_journal:
+                    self.round_journal.finish()
+
+            self._log_round_stats()
+            self.selector_registry.save()
+
+        finally:
+            # 窗口在多轮之间保持，本轮结束后恢复正常浏览
+            self.resource_blocker.restore()
+            # 本轮的检查记录在一个事务中写入
+            if self.observation_store:
+                self.observation_store.flush()
+
+    def scrape_multiple_admins(self, admin_urls: List[Dict]) -> ScrapingResult:
+        """
+        采集多个管理员的关注列表和库存信息（收集iter_checks的全部结果）
+
+        Args:
+            admin_urls: 管理员URL列表，格式：[{'admin_name': '管理员1', 'url': 'xxx'}, ...]
+
+        Returns:
+            采集结果
+        """
+        start_time = time.time()
+        users_with_inventory = []
+        users_without_inventory = []
+        users_with_errors = []
+
+        try:
+            for updated_user in self.iter_checks(admin_urls):
+                self._classify_user(updated_user, users_with_inventory, users_without_inventory, users_with_errors)
+
+            total_users = sum(summary['following_count'] for summary in self.round_summary.values())
+
             # 创建结果对象
             scraping_time = time.time() - start_time
             timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
 
             result = ScrapingResult(
                 admin_urls=admin_urls,
-                total_users=len(all_users),
+                total_users=total_users,
                 users_with_inventory=users_with_inventory,
                 users_without_inventory=users_without_inventory,
                 users_with_errors=users_with_errors,
                 scraping_time=scraping_time,
                 timestamp=timestamp,
-                admin_summary=admin_summary
+                admin_summary=self.round_summary,
+                diff_events=self.round_diff_events
             )
 
             self._update_status(f"采集完成！耗时 {scraping_time:.1f} 秒")
-            self._update_progress(len(all_users), len(all_users), "采集完成")
+            self._update_progress(total_users, total_users, "采集完成")
 
             return result
 
@@ -987,38 +2100,6 @@ class VintedScraper:
             self.logger.error(f"多管理员采集过程失败: {str(e)}")
             raise
 
-
-
-
-
-
-
     def _play_notification_sound(self):
-        """播放通知声音 - 增强版本，更大声更明显"""
-        try:
-            import platform
-            import subprocess
-
-            system = platform.system()
-            if system == "Darwin":  # macOS
-                # 播放多次，更明显
-                for _ in range(3):
-                    subprocess.run(["afplay", "/System/Library/Sounds/Sosumi.aiff"], check=False)
-                    import time
-                    time.sleep(0.1)
-            elif system == "Windows":
-                import winsound
-                # 播放多次，更大声
-                for _ in range(3):
-                    winsound.Beep(1500, 300)  # 更高频率1500Hz，短促300ms
-                    import time
-                    time.sleep(0.1)
-            elif system == "Linux":
-                # 播放多次
-                for _ in range(3):
-                    subprocess.run(["paplay", "/usr/share/sounds/alsa/Front_Left.wav"], check=False)
-                    import time
-                    time.sleep(0.1)
-        except Exception as e:
-            self.logger.debug(f"播放通知声音失败: {str(e)}")
-            # 声音播放失败不影响主要功能，只记录调试日志
+        """请求播放出库提醒音效（由独立线程播放，连续多次提醒会合并，不阻塞采集）"""
+        self.alert_sounds.play(SOUND_ALERT)
@@ -13,6 +13,7 @@ import logging
 import os
 from ..core.bitbrowser_api import BitBrowserAPI
 from ..core.vinted_scraper import VintedScraper
+from ..utils.alert_sound import get_alert_dispatcher, SOUND_ALERT, SOUND_SUCCESS
 
 # 设置CustomTkinter主题
 ctk.set_appearance_mode("light")
@@ -43,10 +44,28 @@ class UltraSimpleVintedApp:
             # 浏览器管理器
             self.browser_manager = None
             self.scraper = None
+            # 连接测试时创建的API客户端，采集时复用其浏览器列表缓存
+            self.bitbrowser_api = None
+            # 库存检查历史记录（首次查询时创建）
+            self.observation_store = None
+            # 轮次对比引擎，跨轮次保留上一轮状态
+            self.diff_engine = None
+            # 轮次断点记录，中断后下一轮从未检查的用户继续
+            self.round_journal = None
 
             # 已出库账号列表（持久保存）
             self.persistent_out_of_stock = []
 
+            # 提醒音效在独立线程中播放，与采集器共用并合并连续的提醒
+            ui_config = self.config.get('ui', {})
+            self.alert_sounds = get_alert_dispatcher()
+            self.alert_sounds.configure(
+                repeats=ui_config.get('alert_repeats', 3),
+                repeat_gap=ui_config.get('alert_repeat_gap', 0.3),
+                coalesce_window=ui_config.get('alert_coalesce_seconds', 60),
+                max_queue=ui_config.get('alert_max_queue', 16)
+            )
+
             # 创建界面
             self.create_ui()
 
@@ -201,7 +220,12 @@ class UltraSimpleVintedApp:
         self.window_data = []
         self.url_entries = []
 
-        # 清理浏览器管理器
+        # 清理浏览器管理器（关闭上一次保留的窗口）
+        if getattr(self, 'browser_manager', None):
+            try:
+                self.browser_manager.cleanup()
+            except Exception as e:
+                self.logger.error(f"清理浏览器资源失败: {str(e)}")
         self.browser_manager = None
         self.scraper = None
 
@@ -497,8 +521,14 @@ class UltraSimpleVintedApp:
             api_url = "http://127.0.0.1:54345"
             print(f"正在测试连接: {api_url}")
 
-            # 使用改进的BitBrowser API
-            api = BitBrowserAPI(api_url)
+            # 使用改进的BitBrowser API（保留实例，采集时复用浏览器列表缓存）
+            bitbrowser_config = self._build_bitbrowser_config()
+            api = BitBrowserAPI(
+                api_url,
+                cache_ttl=bitbrowser_config.get('list_cache_ttl', 30),
+                pool_size=bitbrowser_config.get('max_parallel_startup', 10)
+            )
+            self.bitbrowser_api = api
             success, message = api.test_connection()
 
             print(f"API测试结果: {success}, 消息: {message}")
@@ -682,58 +712,17 @@ class UltraSimpleVintedApp:
         self.root.after(2000, self.show_window_selection)
 
     def _play_success_sound(self):
-        """播放成功音效"""
-        try:
-            import os
-            import platform
-
-            system = platform.system()
-            if system == "Darwin":  # macOS
-                # 播放更响亮的系统音效
-                os.system("afplay /System/Library/Sounds/Sosumi.aiff")
-            elif system == "Windows":
-                import winsound
-                winsound.MessageBeep(winsound.MB_ICONEXCLAMATION)
-            else:  # Linux
-                os.system("paplay /usr/share/sounds/alsa/Front_Left.wav")
-        except:
-            pass  # 忽略音效播放失败
+        """播放成功音效（不阻塞界面）"""
+        self.alert_sounds.play(SOUND_SUCCESS)
 
     def _play_alert_sound_sequence(self):
-        """播放待补货提醒音效序列"""
-        try:
-            import os
-            import platform
-
-            system = platform.system()
-            if system == "Darwin":  # macOS
-                # 连续播放3次更响亮的音效
-                for i in range(3):
-                    os.system("afplay /System/Library/Sounds/Sosumi.aiff")
-                    if i < 2:  # 不是最后一次
-                        import time
-                        time.sleep(0.3)
-            elif system == "Windows":
-                import winsound
-                for i in range(3):
-                    winsound.MessageBeep(winsound.MB_ICONEXCLAMATION)
-                    if i < 2:
-                        import time
-                        time.sleep(0.3)
-            else:  # Linux
-                for i in range(3):
-                    os.system("paplay /usr/share/sounds/alsa/Front_Left.wav")
-                    if i < 2:
-                        import time
-                        time.sleep(0.3)
-        except:
-            pass  # 忽略音效播放失败
+        """播放待补货提醒音效序列（与采集器的出库提醒合并）"""
+        self.alert_sounds.play(SOUND_ALERT)
 
     def _trigger_alert_effects(self):
         """触发待补货提醒效果"""
-        # 立即播放音效（不等待）
-        import threading
-        threading.Thread(target=self._play_alert_sound_sequence, daemon=True).start()
+        # 播放音效（由音效线程播放，不等待）
+        self._play_alert_sound_sequence()
 
         # 立即开始UI闪烁效果
         self._flash_ui()
@@ -951,12 +940,13 @@ class UltraSimpleVintedApp:
 
             self.logger.info("开始单轮库存查询任务")
 
-            # 获取当前窗口
-            current_window_id = self.selected_window_ids[self.current_window_index]
-            current_window_name = self.selected_windows[self.current_window_index]
+            # 获取本轮使用的窗口（并行窗口数由 scraping.max_concurrent_requests 决定）
+            round_indexes = self._get_round_window_indexes()
+            round_window_ids = [self.selected_window_ids[i] for i in round_indexes]
+            round_window_names = [self.selected_windows[i] for i in round_indexes]
 
-            self.root.after(0, lambda name=current_window_name:
-                self.current_window_label.configure(text=f"当前窗口: {name}"))
+            self.root.after(0, lambda names=", ".join(round_window_names):
+                self.current_window_label.configure(text=f"当前窗口: {names}"))
 
             try:
                 # 再次检查是否已停止
@@ -965,16 +955,13 @@ class UltraSimpleVintedApp:
                     return
 
                 # 执行一轮查询
-                self._run_single_round(current_window_id)
+                self._run_single_round(round_window_ids)
 
                 # 检查是否在查询过程中被停止
                 if not self.is_running:
                     self.logger.info("查询在执行后被停止")
                     return
 
-                # 切换到下一个窗口
-                self.current_window_index = (self.current_window_index + 1) % len(self.selected_window_ids)
-
                 # 如果还在运行，开始倒计时等待下一轮
                 if self.is_running:
                     self.logger.info(f"本轮查询完成，开始 {self.interval_minutes} 分钟倒计时")
@@ -987,6 +974,9 @@ class UltraSimpleVintedApp:
                 self.root.after(0, lambda error=str(e):
                     self.status_label.configure(text=f"查询失败: {error}"))
 
+                # 本组窗口无法完成查询时换下一组窗口
+                self.current_window_index = (self.current_window_index + len(round_window_ids)) % len(self.selected_window_ids)
+
                 # 等待一段时间后重试（如果还在运行）
                 if self.is_running:
                     self.logger.info("查询失败，等待1分钟后重试")
@@ -997,47 +987,96 @@ class UltraSimpleVintedApp:
             self.root.after(0, lambda error=str(e):
                 self.status_label.configure(text=f"查询任务失败: {error}"))
 
-    def _run_single_round(self, window_id):
-        """执行单轮查询"""
-        self.root.after(0, lambda: self.status_label.configure(text="正在初始化浏览器..."))
+    def _get_round_window_indexes(self):
+        """
+        获取本轮使用的窗口索引
+
+        同一组窗口在多轮之间保持不变，窗口和WebDriver会话直接复用；
+        只有一轮查询失败后才从下一个窗口开始换一组。
+
+        Returns:
+            窗口索引列表
+        """
+        window_count = len(self.selected_window_ids)
+        scraping_config = self.config.get('scraping', {})
+        pool_size = max(1, min(int(scraping_config.get('max_concurrent_requests', 1)), window_count))
+        return [(self.current_window_index + i) % window_count for i in range(pool_size)]
 
-        # 使用原来的配置结构
+    def _build_bitbrowser_config(self):
+        """构建比特浏览器配置"""
         bitbrowser_config = {
             'api_url': 'http://127.0.0.1:54345',
             'timeout': 30
         }
+        bitbrowser_config.update(self.config.get('bitbrowser', {}))
+        return bitbrowser_config
 
+    def _build_scraper_config(self):
+        """构建采集器配置：vinted节 + scraping节，缺省时使用原来的默认值"""
         vinted_config = {
             'element_wait_timeout': 10,
             'page_load_timeout': 15,
             'scroll_pause_time': 2
         }
+        vinted_config.update(self.config.get('vinted', {}))
+        vinted_config.update(self.config.get('scraping', {}))
+        return vinted_config
+
+    def _run_single_round(self, window_ids):
+        """执行单轮查询"""
+        self.root.after(0, lambda: self.status_label.configure(text="正在初始化浏览器..."))
+
+        bitbrowser_config = self._build_bitbrowser_config()
+        vinted_config = self._build_scraper_config()
 
-        # 初始化浏览器管理器
-        from ..core.bitbrowser_api import BitBrowserManager
-        browser_manager = BitBrowserManager(bitbrowser_config)
+        # 浏览器窗口池在多轮之间保持，只在停止查询或退出时关闭
+        from ..core.bitbrowser_api import BitBrowserPool
+        from ..core.scraper_pool import ScraperPool
+        from ..core.selector_registry import SelectorRegistry
+        if not isinstance(self.browser_manager, BitBrowserPool):
+            shared_api = self.bitbrowser_api
+            if shared_api is not None and shared_api.api_url != bitbrowser_config['api_url'].rstrip('/'):
+                shared_api = None
+            self.browser_manager = BitBrowserPool(bitbrowser_config, api=shared_api)
+        browser_manager = self.browser_manager
 
         try:
             # 初始化浏览器环境
-            self.logger.info(f"开始初始化浏览器窗口: {window_id}")
-            success, message = browser_manager.initialize(window_id)
+            self.logger.info(f"开始初始化浏览器窗口: {window_ids}")
+            success, message = browser_manager.initialize(window_ids)
             if not success:
                 self.logger.error(f"浏览器初始化失败: {message}")
                 raise Exception(f"浏览器初始化失败: {message}")
 
-            self.logger.info("浏览器初始化成功")
-            self.root.after(0, lambda: self.status_label.configure(text="浏览器初始化成功"))
+            self.logger.info(f"浏览器初始化成功: {message}")
+            self.root.after(0, lambda: self.status_label.configure(text=f"浏览器初始化成功: {message}"))
 
             # 获取WebDriver
-            driver = browser_manager.get_driver()
-            if not driver:
+            drivers = list(browser_manager.get_drivers().values())
+            if not drivers:
                 self.logger.error("无法获取WebDriver实例")
                 raise Exception("无法获取WebDriver")
 
-            self.logger.info("WebDriver获取成功")
+            self.logger.info(f"WebDriver获取成功，共 {len(drivers)} 个窗口")
 
-            # 创建Vinted采集器
-            scraper = VintedScraper(driver, vinted_config)
+            # 创建Vinted采集器：单窗口直接采集，多窗口并行采集
+            # 所有窗口共享同一份选择器统计
+            selector_registry = SelectorRegistry(
+                vinted_config.get('selector_stats_file'),
+                vinted_config.get('selector_demote_after', 3)
+            )
+            observation_store = self._get_observation_store(vinted_config)
+            diff_engine = self._get_diff_engine(observation_store)
+            round_journal = self._get_round_journal(vinted_config)
+            scrapers = [
+                VintedScraper(driver, vinted_config, selector_registry, observation_store, diff_engine, round_journal)
+                for driver in drivers
+            ]
+            if len(scrapers) == 1:
+                scraper = scrapers[0]
+            else:
+                scraper = ScraperPool(scrapers, vinted_config)
+            self.scraper = scraper
 
             # 设置简单的回调函数
             def simple_progress_callback(current, total, message):
@@ -1153,14 +1192,6 @@ class UltraSimpleVintedApp:
             self.logger.error(f"异常堆栈: {traceback.format_exc()}")
             self.root.after(0, lambda error=str(e): self.status_label.configure(text=f"查询失败: {error}"))
             raise
-        finally:
-            # 清理资源
-            try:
-                self.logger.info("开始清理浏览器资源")
-                browser_manager.cleanup()
-                self.logger.info("浏览器资源清理完成")
-            except Exception as e:
-                self.logger.error(f"清理浏览器资源失败: {str(e)}")
 
     def _start_countdown(self):
         """开始倒计时"""
@@ -1327,7 +1358,7 @@ class UltraSimpleVintedApp:
 
         # 立即停止采集器
         if hasattr(self, 'scraper') and self.scraper:
-            self.scraper.should_stop = True
+            self.scraper.stop_scraping()
             self.logger.info("已发送停止信号给采集器")
 
         # 立即强制清理浏览器资源
@@ -1381,6 +1412,47 @@ class UltraSimpleVintedApp:
             self.logger.error("没有保存的URL，无法重新开始查询")
             self.root.after(0, lambda: self.status_label.configure(text="错误：没有保存的URL"))
         
+    def _get_observation_store(self, vinted_config):
+        """获取库存检查历史记录存储，打开失败时不记录历史"""
+        from ..core.observation_store import ObservationStore
+
+        if self.observation_store is None and vinted_config.get('observation_store_enabled', True):
+            try:
+                self.observation_store = ObservationStore(
+                    vinted_config.get('observation_db_file'),
+                    vinted_config.get('observation_batch_size', 500)
+                )
+            except Exception as e:
+                self.logger.error(f"打开历史记录数据库失败: {str(e)}")
+        return self.observation_store
+
+    def _get_round_journal(self, vinted_config):
+        """获取轮次断点记录，打开失败时中断后从头开始"""
+        from ..core.round_journal import RoundJournal
+
+        if self.round_journal is None and vinted_config.get('round_journal_enabled', True):
+            try:
+                self.round_journal = RoundJournal(
+                    vinted_config.get('round_journal_file'),
+                    vinted_config.get('round_journal_max_age_minutes', 30) * 60
+                )
+            except Exception as e:
+                self.logger.error(f"打开轮次断点记录失败: {str(e)}")
+        return self.round_journal
+
+    def _get_diff_engine(self, observation_store):
+        """获取轮次对比引擎，首次创建时用历史记录恢复上一轮状态"""
+        from ..core.round_diff import RoundDiffEngine
+
+        if self.diff_engine is None:
+            self.diff_engine = RoundDiffEngine()
+            if observation_store:
+                try:
+                    self.diff_engine.seed(observation_store.get_latest_by_admin(), observation_store.get_last_round())
+                except Exception as e:
+                    self.logger.warning(f"加载上一轮状态失败: {str(e)}")
+        return self.diff_engine
+
     def on_closing(self):
         """窗口关闭事件"""
         try:
@@ -1397,10 +1469,25 @@ class UltraSimpleVintedApp:
             # 停止采集器
             if hasattr(self, 'scraper') and self.scraper:
                 try:
-                    self.scraper.should_stop = True
+                    self.scraper.stop_scraping()
                 except:
                     pass
 
+            # 关闭历史记录数据库
+            if getattr(self, 'observation_store', None):
+                try:
+                    self.observation_store.close()
+                except:
+                    pass
+
+            # 关闭轮次断点记录（未完成的轮次保留，下次继续）
+            if getattr(self, 'round_journal', None):
+                self.round_journal.close()
+
+            # 停止音效线程
+            if getattr(self, 'alert_sounds', None):
+                self.alert_sounds.close(timeout=0.5)
+
             # 销毁窗口
             self.root.quit()
             self.root.destroy()
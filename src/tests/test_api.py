@@ -4,16 +4,29 @@
 比特浏览器API测试模块
 """
 
-import unittest
-from unittest.mock import Mock, patch, MagicMock
+import os
 import sys
+import time
+import shutil
+import tempfile
+import unittest
+import subprocess
+import urllib.parse
+from typing import Optional
+from unittest.mock import Mock, patch, MagicMock, PropertyMock, AsyncMock
 from pathlib import Path
 
 # 添加项目根目录到路径
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from src.core.bitbrowser_api import BitBrowserAPI, BitBrowserManager
+from src.core.bitbrowser_api import BitBrowserAPI, BitBrowserManager, BitBrowserPool
+from src.core.bitbrowser_async import AsyncBitBrowserAPI
+from src.core.cdp_driver import CDPDriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
 
 
 class TestBitBrowserAPI(unittest.TestCase):
@@ -103,6 +116,50 @@ class TestBitBrowserAPI(unittest.TestCase):
             self.assertIsNone(result)
 
 
+class TestBitBrowserListCache(unittest.TestCase):
+    """浏览器列表缓存测试类"""
+
+    def setUp(self):
+        """测试前设置"""
+        self.api = BitBrowserAPI("http://127.0.0.1:54345", cache_ttl=30)
+        response = Mock(status_code=200)
+        response.json.return_value = {
+            'success': True,
+            'data': {'list': [{'id': 'a1', 'name': 'window1'}, {'id': 'b2', 'name': 'window2'}]}
+        }
+        self.response = response
+
+    def test_connection_and_lookup_share_one_request(self):
+        """测试连接测试和按ID查找只请求一次列表"""
+        with patch.object(self.api.session, 'post', return_value=self.response) as mock_post:
+            self.assertTrue(self.api.test_connection()[0])
+            self.assertEqual(self.api.get_browser_by_id('b2')['name'], 'window2')
+            self.assertEqual(len(self.api.get_browser_list()), 2)
+            self.assertTrue(self.api.test_connection()[0])
+
+        self.assertEqual(mock_post.call_count, 1)
+
+    def test_invalidate_and_ttl(self):
+        """测试手动失效和过期后重新请求"""
+        with patch.object(self.api.session, 'post', return_value=self.response) as mock_post:
+            self.api.get_browser_list()
+            self.api.invalidate_cache()
+            self.api.get_browser_list()
+            self.assertEqual(mock_post.call_count, 2)
+
+            self.api.cache_ttl = 0
+            self.api.get_browser_list()
+            self.assertEqual(mock_post.call_count, 3)
+
+    def test_unknown_id_refreshes_once(self):
+        """测试缓存中没有的ID会刷新一次列表"""
+        with patch.object(self.api.session, 'post', return_value=self.response) as mock_post:
+            self.api.get_browser_list()
+            self.assertIsNone(self.api.get_browser_by_id('missing'))
+
+        self.assertEqual(mock_post.call_count, 2)
+
+
 class TestBitBrowserManager(unittest.TestCase):
     """比特浏览器管理器测试类"""
     
@@ -172,6 +229,355 @@ class TestBitBrowserManager(unittest.TestCase):
             self.assertIsNone(self.manager.driver)
             self.assertIsNone(self.manager.browser_info)
 
+    def test_is_alive(self):
+        """测试会话健康检查"""
+        self.assertFalse(self.manager.is_alive())
+
+        self.manager.driver = Mock()
+        self.manager.browser_info = {'id': 'test'}
+        self.assertTrue(self.manager.is_alive())
+
+        type(self.manager.driver).current_url = PropertyMock(side_effect=Exception("session deleted"))
+        self.assertFalse(self.manager.is_alive())
+
+
+    @patch('src.core.bitbrowser_api.webdriver.Chrome')
+    @patch('src.core.bitbrowser_api.CDPDriver')
+    def test_initialize_cdp_backend(self, mock_cdp, mock_chrome):
+        """测试CDP后端不启动chromedriver"""
+        self.manager.driver_backend = 'cdp'
+        with patch.object(self.manager.api, 'test_connection', return_value=(True, "连接成功")), \
+             patch.object(self.manager.api, 'get_browser_by_id', return_value={'id': 'w1'}), \
+             patch.object(self.manager.api, 'open_browser', return_value={'http': '127.0.0.1:9222', 'driver': '/path/chromedriver'}), \
+             patch.object(self.manager, '_wait_for_debugger', return_value=(True, "调试端口就绪")):
+            success, message = self.manager.initialize('w1')
+
+        self.assertTrue(success)
+        mock_cdp.assert_called_once_with('127.0.0.1:9222', page_load_strategy='eager')
+        mock_chrome.assert_not_called()
+        self.assertEqual(self.manager.driver, mock_cdp.return_value)
+
+    @patch('src.core.bitbrowser_api.time.sleep')
+    def test_wait_for_debugger_polls_until_page_target(self, mock_sleep):
+        """测试轮询调试端口直到出现页面目标"""
+        import requests
+
+        not_ready = Mock(status_code=200)
+        not_ready.json.return_value = [{'type': 'service_worker'}]
+        ready = Mock(status_code=200)
+        ready.json.return_value = [{'type': 'page', 'url': 'about:blank'}]
+
+        with patch.object(self.manager.api.session, 'get',
+                          side_effect=[requests.exceptions.ConnectionError(), not_ready, ready]) as mock_get:
+            success, message = self.manager._wait_for_debugger('127.0.0.1:9222')
+
+        self.assertTrue(success)
+        self.assertEqual(mock_get.call_count, 3)
+        self.assertEqual(mock_sleep.call_count, 2)
+        self.assertIsNotNone(self.manager.startup_time)
+
+    def test_wait_for_debugger_deadline(self):
+        """测试超过启动期限后返回失败"""
+        import requests
+
+        self.manager.startup_timeout = 0
+        with patch.object(self.manager.api.session, 'get', side_effect=requests.exceptions.ConnectionError("refused")):
+            success, message = self.manager._wait_for_debugger('127.0.0.1:9222')
+
+        self.assertFalse(success)
+        self.assertIn("refused", message)
+
+
+class TestBitBrowserPool(unittest.TestCase):
+    """比特浏览器多窗口池测试类"""
+
+    def setUp(self):
+        """测试前设置"""
+        self.pool = BitBrowserPool({'api_url': 'http://127.0.0.1:54345'})
+        self.pool.async_api = Mock()
+        self.pool.async_api.get_browser_list = AsyncMock(return_value=[{'id': f"w{i}"} for i in range(8)])
+        self.pool.async_api.open_browser = AsyncMock(return_value={'http': '127.0.0.1:9222'})
+        self.pool.async_api.close_browser = AsyncMock(return_value=True)
+
+    def _manager(self, alive=True, window_id="w"):
+        manager = Mock()
+        manager.is_alive.return_value = alive
+        manager.is_ready.return_value = alive
+        manager.browser_info = {'id': window_id}
+        return manager
+
+    def test_async_client_shares_session(self):
+        """测试异步客户端与同步客户端共用保持连接的会话"""
+        pool = BitBrowserPool({'api_url': 'http://127.0.0.1:54345'})
+        self.assertIs(pool.async_api.session, pool.api.session)
+
+    def test_reuses_live_sessions(self):
+        """测试下一轮复用仍然可用的窗口，只重新打开失效的窗口"""
+        live, dead, unused = self._manager(window_id='w1'), self._manager(False, 'w2'), self._manager(window_id='w3')
+        self.pool.managers = {'w1': live, 'w2': dead, 'w3': unused}
+
+        new_manager = Mock()
+        new_manager.attach.return_value = (True, "浏览器环境初始化成功")
+        new_manager.startup_time = 1.2
+        with patch('src.core.bitbrowser_api.BitBrowserManager', return_value=new_manager) as mock_cls:
+            success, message = self.pool.initialize(['w1', 'w2'])
+
+        self.assertTrue(success)
+        mock_cls.assert_called_once()
+        new_manager.attach.assert_called_once_with('w2', {'id': 'w2'}, {'http': '127.0.0.1:9222'})
+        live.quit_driver.assert_not_called()
+        dead.quit_driver.assert_called_once()
+        unused.quit_driver.assert_called_once()
+        closed = sorted(c.args[0] for c in self.pool.async_api.close_browser.await_args_list)
+        self.assertEqual(closed, ['w2', 'w3'])
+        self.assertEqual(self.pool.managers, {'w1': live, 'w2': new_manager})
+
+    def test_opens_windows_concurrently(self):
+        """测试多个窗口在一个事件循环中并发打开，总耗时接近单个窗口"""
+        import asyncio
+
+        async def open_browser(window_id):
+            await asyncio.sleep(0.3)
+            return {'http': '127.0.0.1:9222'}
+        self.pool.async_api.open_browser = AsyncMock(side_effect=open_browser)
+
+        def make_manager(config, api=None):
+            manager = Mock()
+            manager.startup_time = 0.3
+
+            def attach(window_id, browser_info, open_result):
+                time.sleep(0.3)
+                manager.is_ready.return_value = True
+                manager.get_driver.return_value = f"driver-{window_id}"
+                return True, "浏览器环境初始化成功"
+
+            manager.attach.side_effect = attach
+            return manager
+
+        window_ids = [f"w{i}" for i in range(8)]
+        started = time.time()
+        with patch('src.core.bitbrowser_api.BitBrowserManager', side_effect=make_manager):
+            success, message = self.pool.initialize(window_ids)
+        elapsed = time.time() - started
+
+        self.assertTrue(success)
+        self.assertLess(elapsed, 1.2)
+        self.assertEqual(self.pool.get_drivers(), {wid: f"driver-{wid}" for wid in window_ids})
+
+    def test_failed_attach_closes_window(self):
+        """测试连接失败的窗口被关闭，不影响其余窗口"""
+        def make_manager(config, api=None):
+            manager = Mock()
+            manager.startup_time = None
+            manager.attach.side_effect = lambda window_id, info, result: (
+                (False, "调试端口连接失败") if window_id == 'w1' else (True, "浏览器环境初始化成功"))
+            return manager
+
+        with patch('src.core.bitbrowser_api.BitBrowserManager', side_effect=make_manager):
+            success, message = self.pool.initialize(['w0', 'w1', 'missing'])
+
+        self.assertTrue(success)
+        self.assertEqual(list(self.pool.managers), ['w0'])
+        self.pool.async_api.close_browser.assert_awaited_once_with('w1')
+        opened = sorted(c.args[0] for c in self.pool.async_api.open_browser.await_args_list)
+        self.assertEqual(opened, ['w0', 'w1'])
+
+    def test_cleanup_closes_all(self):
+        """测试停止时关闭所有窗口"""
+        managers = [self._manager(window_id='w1'), self._manager(window_id='w2')]
+        self.pool.managers = {'w1': managers[0], 'w2': managers[1]}
+
+        self.pool.cleanup()
+
+        for manager in managers:
+            manager.quit_driver.assert_called_once()
+        self.assertEqual(self.pool.async_api.close_browser.await_count, 2)
+        self.assertEqual(self.pool.managers, {})
+
+
+class TestAsyncBitBrowserAPI(unittest.TestCase):
+    """测试异步API客户端"""
+
+    def setUp(self):
+        """启动本地模拟的比特浏览器服务，每个接口第一次请求返回503"""
+        import json
+        import threading
+        from http.server import BaseHTTPRequestHandler, HTTPServer
+
+        hits = self.hits = {}
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                payload = json.loads(self.rfile.read(length) or b'{}')
+                key = (self.path, payload.get('id'))
+                hits[key] = hits.get(key, 0) + 1
+                if hits[key] == 1:
+                    self.send_response(503)
+                    self.end_headers()
+                    return
+                if self.path == '/browser/list':
+                    body = {'success': True, 'data': {'list': [{'id': 'w1'}, {'id': 'w2'}]}}
+                else:
+                    body = {'success': True, 'data': {'http': f"127.0.0.1:{payload.get('id')}"}}
+                data = json.dumps(body).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = HTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.api_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_retry_and_batch_open(self):
+        """测试503后重试成功，以及批量打开窗口"""
+        import asyncio
+
+        async def run():
+            async with AsyncBitBrowserAPI(self.api_url, retry_delay=0.01) as api:
+                browsers = await api.get_browser_list()
+                opened = await api.open_browsers(['w1', 'w2'])
+                return browsers, opened
+
+        browsers, opened = asyncio.run(run())
+
+        self.assertEqual([b['id'] for b in browsers], ['w1', 'w2'])
+        self.assertEqual(opened, {'w1': {'http': '127.0.0.1:w1'}, 'w2': {'http': '127.0.0.1:w2'}})
+        self.assertEqual(self.hits[('/browser/list', None)], 2)
+        self.assertEqual(self.hits[('/browser/open', 'w1')], 2)
+
+    def test_retries_exhausted(self):
+        """测试重试次数用完后返回失败结果"""
+        import asyncio
+
+        async def run():
+            async with AsyncBitBrowserAPI(self.api_url, max_retries=1, retry_delay=0.01) as api:
+                return await api.close_browser('w1')
+
+        self.assertFalse(asyncio.run(run()))
+        self.assertEqual(self.hits[('/browser/close', 'w1')], 1)
+
+
+
+    def test_reused_across_event_loops(self):
+        """测试同一个客户端可以在多个事件循环中使用（信号量在当前事件循环中创建）"""
+        import asyncio
+
+        api = AsyncBitBrowserAPI(self.api_url, pool_size=1, retry_delay=0.01)
+
+        async def run():
+            return await api.open_browsers(['w1', 'w2'])
+
+        try:
+            first = asyncio.run(run())
+            second = asyncio.run(run())
+        finally:
+            api.close()
+
+        self.assertEqual(first, {'w1': {'http': '127.0.0.1:w1'}, 'w2': {'http': '127.0.0.1:w2'}})
+        self.assertEqual(second, first)
+
+
+def _find_chromium() -> Optional[str]:
+    """查找本地可用的Chromium（可用CHROME_BINARY环境变量指定）"""
+    candidates = [os.environ.get('CHROME_BINARY')] + [
+        shutil.which(name) for name in ('chromium', 'chromium-browser', 'google-chrome', 'chrome-headless-shell')
+    ]
+    for path in candidates:
+        if path and os.path.exists(path):
+            return path
+    return None
+
+
+@unittest.skipUnless(_find_chromium(), "未找到本地Chromium")
+class TestCDPDriver(unittest.TestCase):
+    """在本地无头Chromium上测试CDP驱动"""
+
+    @classmethod
+    def setUpClass(cls):
+        """启动无头Chromium并连接调试端口"""
+        cls.profile_dir = tempfile.mkdtemp()
+        cls.process = subprocess.Popen(
+            [_find_chromium(), '--headless=new', '--no-sandbox', '--disable-gpu',
+             '--remote-debugging-port=0', f'--user-data-dir={cls.profile_dir}', 'about:blank'],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        port_file = Path(cls.profile_dir) / 'DevToolsActivePort'
+        deadline = time.time() + 20
+        while not port_file.exists() or not port_file.read_text().strip():
+            if time.time() > deadline:
+                cls.process.kill()
+                raise unittest.SkipTest("Chromium未能启动调试端口")
+            time.sleep(0.1)
+        port = port_file.read_text().splitlines()[0]
+        cls.driver = CDPDriver(f"127.0.0.1:{port}", page_load_timeout=10)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.driver.quit()
+        cls.process.kill()
+        cls.process.wait()
+        shutil.rmtree(cls.profile_dir, ignore_errors=True)
+
+    def _load(self, body: str):
+        self.driver.get("data:text/html;charset=utf-8," + urllib.parse.quote(
+            f"<html><head><title>CDP</title></head><body>{body}</body></html>"))
+
+    def test_navigate_and_find_elements(self):
+        """测试导航、查找元素和读取属性"""
+        self._load('<div class="list"><a href="/member/1-alice"><span data-testid="profile-username">alice</span></a>'
+                   '<a href="/member/2-bob">bob</a></div>')
+
+        self.assertEqual(self.driver.title, "CDP")
+        self.assertTrue(self.driver.current_url.startswith("data:text/html"))
+        self.assertIn("profile-username", self.driver.page_source)
+
+        links = self.driver.find_elements(By.CSS_SELECTOR, "div.list a")
+        self.assertEqual([link.text for link in links], ["alice", "bob"])
+        self.assertEqual(links[1].get_attribute('data-missing'), None)
+
+        username = self.driver.find_element(By.CSS_SELECTOR, "[data-testid='profile-username']")
+        ancestor = username.find_element(By.XPATH, "./ancestor::a[contains(@href, '/member/')]")
+        self.assertIn("/member/1-alice", ancestor.get_attribute('href'))
+
+        with self.assertRaises(NoSuchElementException):
+            self.driver.find_element(By.CSS_SELECTOR, ".missing")
+        WebDriverWait(self.driver, 2).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+
+    def test_execute_scripts(self):
+        """测试同步和异步脚本"""
+        self._load('<p>scripts</p>')
+
+        self.assertEqual(self.driver.execute_script("return arguments[0] + arguments[1].length;", 1, [1, 2]), 3)
+        self.assertEqual(
+            self.driver.execute_async_script("var done = arguments[arguments.length - 1]; setTimeout(function() { done(arguments.length || 'ok'); }, 10);"),
+            'ok'
+        )
+        with self.assertRaises(WebDriverException):
+            self.driver.execute_script("throw new Error('boom');")
+
+    def test_tabs(self):
+        """测试新建、切换和关闭标签页"""
+        original = self.driver.current_window_handle
+        self.driver.switch_to.new_window('tab')
+        new_handle = self.driver.current_window_handle
+        self.assertNotEqual(new_handle, original)
+        self.assertIn(new_handle, self.driver.window_handles)
+
+        self.driver.close()
+        self.driver.switch_to.window(original)
+        self.assertNotIn(new_handle, self.driver.window_handles)
+        self.assertEqual(self.driver.current_window_handle, original)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -4,8 +4,13 @@
 Vinted采集器测试模块
 """
 
+import queue
+import tempfile
+import threading
+import time
 import unittest
 from unittest.mock import Mock, patch, MagicMock
+from selenium.common.exceptions import WebDriverException
 import sys
 from pathlib import Path
 
@@ -14,6 +19,16 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from src.core.vinted_scraper import VintedScraper, UserInfo, ScrapingResult
+from src.core.scraper_pool import ScraperPool
+from src.core.page_readiness import PageReadiness
+from src.core.selector_registry import SelectorRegistry
+from src.core.observation_store import ObservationStore
+from src.core.resource_blocker import ResourceBlocker
+from src.core.round_journal import RoundJournal
+from src.core.circuit_breaker import CircuitBreaker, STATE_OPEN, STATE_HALF_OPEN, STATE_CLOSED
+from src.core.rate_limiter import AdaptiveRateLimiter, get_rate_limiter, classify_outcome, OUTCOME_OK, OUTCOME_SLOW, OUTCOME_ERROR, OUTCOME_CHALLENGE
+from src.utils.alert_sound import AlertSoundDispatcher, SOUND_ALERT, SOUND_SUCCESS
+from src.core.round_diff import RoundDiffEngine, EVENT_WENT_EMPTY, EVENT_RESTOCKED, EVENT_NEW_FOLLOW, EVENT_UNFOLLOWED
 
 
 class TestUserInfo(unittest.TestCase):
@@ -112,6 +127,49 @@ class TestVintedScraper(unittest.TestCase):
         
         self.assertFalse(result)
     
+    def test_safe_get_page_soft_timeout(self):
+        """测试加载超时但已到达目标页面时停止加载并继续"""
+        from selenium.common.exceptions import TimeoutException
+
+        self.mock_driver.get.side_effect = TimeoutException("Timeout")
+        self.mock_driver.execute_script.return_value = "https://www.vinted.nl/member/123-alice"
+
+        result = self.scraper._safe_get_page("https://www.vinted.nl/member/123", 'shop')
+
+        self.assertTrue(result)
+        self.mock_driver.execute_script.assert_any_call("window.stop(); return location.href;")
+        self.assertEqual(self.scraper.navigation_stats['shop']['soft_timeouts'], 1)
+
+    def test_challenge_page_is_error_and_pauses_window(self):
+        """测试验证页面记为检查出错而不是无库存，并暂停窗口"""
+        user = UserInfo('123', 'alice', 'https://www.vinted.nl/member/123')
+        block = {'kind': 'challenge', 'reason': '#challenge-form', 'status': 403}
+
+        with patch.object(self.scraper, '_detect_block_page', return_value=block):
+            result = self.scraper.check_user_inventory(user)
+
+        self.assertEqual(result.status, "error")
+        self.assertIn("#challenge-form", result.error_message)
+        self.assertEqual(self.scraper.circuit_breaker.state, STATE_OPEN)
+
+        # 冷却中不再加载页面
+        self.mock_driver.get.reset_mock()
+        other = self.scraper.check_user_inventory(UserInfo('456', 'bob', 'https://www.vinted.nl/member/456'))
+        self.assertEqual(other.status, "error")
+        self.mock_driver.get.assert_not_called()
+
+    def test_unready_empty_page_is_error(self):
+        """测试加载超时的页面没有商品也没有空状态时标记为错误而不是无库存"""
+        user = UserInfo('123', 'alice', 'https://www.vinted.nl/member/123')
+        self.scraper.last_ready_selector = None
+
+        with patch.object(self.scraper.readiness, 'wait_for_dom_quiet'), \
+             patch.object(self.scraper, '_probe_inventory_script',
+                          return_value={'empty_state': False, 'grid_count': 0, 'item_texts': []}):
+            result = self.scraper._parse_inventory_page(user, wait_ready=False, soft_timeout=True)
+
+        self.assertEqual(result.status, "error")
+
     def test_update_progress(self):
         """测试更新进度"""
         progress_callback = Mock()
@@ -189,6 +247,847 @@ class TestVintedScraper(unittest.TestCase):
         self.assertEqual(result.status, "error")
         self.assertEqual(result.error_message, "无法访问用户主页")
 
+    def test_extract_following_page_script(self):
+        """测试单次脚本提取关注列表页面"""
+        self.mock_driver.execute_script.return_value = {
+            'no_following_message': None,
+            'username_count': 3,
+            'has_container': True,
+            'members': [
+                {'user_id': '111', 'href': 'https://www.vinted.nl/member/111-alice', 'username': ' alice '},
+                {'user_id': '222', 'href': 'https://www.vinted.nl/member/222-bob', 'username': ''}
+            ]
+        }
+
+        no_following, users = self.scraper._extract_following_page_script(1)
+
+        self.assertFalse(no_following)
+        self.assertEqual([u.user_id for u in users], ['111', '222'])
+        self.assertEqual(users[0].username, 'alice')
+        self.assertEqual(users[1].username, 'User_222')
+        self.mock_driver.find_elements.assert_not_called()
+
+    def test_extract_following_page_script_no_following(self):
+        """测试脚本识别"没有关注任何人"页面"""
+        self.mock_driver.execute_script.return_value = {
+            'no_following_message': 'volgt nog niemand',
+            'username_count': 1,
+            'members': []
+        }
+
+        self.assertEqual(self.scraper._extract_following_page_script(2), (True, []))
+
+    def test_extract_following_page_script_invalid_result(self):
+        """测试脚本结果无效时返回None以回退到逐元素解析"""
+        self.mock_driver.execute_script.return_value = None
+
+        self.assertIsNone(self.scraper._extract_following_page_script(1))
+
+    def test_extract_following_users_loads_each_page_once(self):
+        """测试关注列表翻页时每页只访问一次"""
+        def page(start, count):
+            users = [UserInfo(str(i), f"user{i}", f"https://www.vinted.nl/member/{i}") for i in range(start, start + count)]
+            return False, users
+
+        pages = [page(0, 20), page(20, 20), page(40, 5)]
+
+        with patch.object(self.scraper, '_extract_following_page_script', side_effect=pages):
+            users = self.scraper.extract_following_users('https://www.vinted.nl/member/general/following/500?page=1')
+
+        self.assertEqual(len(users), 45)
+        self.assertEqual(self.scraper.navigation_count, 3)
+        visited = [c.args[0] for c in self.mock_driver.get.call_args_list]
+        self.assertEqual(visited, [
+            'https://www.vinted.nl/member/general/following/500?page=1',
+            'https://www.vinted.nl/member/general/following/500?page=2',
+            'https://www.vinted.nl/member/general/following/500?page=3'
+        ])
+
+    def test_parse_inventory_page_script_probe(self):
+        """测试单次脚本探测商店页面库存"""
+        user = UserInfo(
+            user_id="12345",
+            username="test_user",
+            profile_url="https://www.vinted.nl/member/12345"
+        )
+        probe = {
+            'empty_state': False,
+            'header_count': 2,
+            'grid_count': 2,
+            'selector': '.feed-grid__item',
+            'item_texts': ["€ 12,00\nNike trui\nM · Heel goed", ""]
+        }
+
+        with patch.object(self.scraper.readiness, 'wait_for_selector', return_value='.feed-grid__item'), \
+             patch.object(self.scraper.readiness, 'wait_for_dom_quiet', return_value=True), \
+             patch.object(self.scraper, '_probe_inventory_script', return_value=probe):
+            result = self.scraper._parse_inventory_page(user)
+
+        self.assertEqual(result.status, "has_inventory")
+        self.assertEqual(result.item_count, 2)
+        self.assertEqual(result.items, ["Nike trui"])
+
+    def test_parse_inventory_page_empty_state(self):
+        """测试空状态判定为无库存"""
+        user = UserInfo("12345", "test_user", "https://www.vinted.nl/member/12345")
+        probe = {'empty_state': True, 'header_count': None, 'grid_count': 0, 'selector': None, 'item_texts': []}
+
+        result = self.scraper._apply_inventory_probe(user, probe)
+
+        self.assertEqual(result.status, "no_inventory")
+        self.assertEqual(result.item_count, 0)
+
+    def test_iter_checks_streams_results(self):
+        """测试逐个产出检查结果，提前停止迭代也会写入本轮记录"""
+        store = Mock()
+        scraper = VintedScraper(Mock(), dict(self.config, delay_between_requests=0), observation_store=store)
+        users = [
+            UserInfo(str(i), f"user{i}", f"https://www.vinted.nl/member/{i}")
+            for i in range(3)
+        ]
+        checked = []
+
+        def check(user):
+            user.status = "has_inventory"
+            checked.append(user.user_id)
+            return user
+
+        admin_urls = [{'admin_name': '管理员1', 'url': 'https://www.vinted.nl/member/500/following'}]
+        with patch.object(scraper, '_extract_admin_users', return_value=users), \
+             patch.object(scraper, 'check_user_inventory', side_effect=check):
+            results = scraper.iter_checks(admin_urls)
+            first = next(results)
+            # 第一个结果产出时后面的用户还没有检查
+            self.assertEqual(first.user_id, "0")
+            self.assertEqual(checked, ["0"])
+            store.record.assert_called_once_with(first)
+            results.close()
+
+        store.flush.assert_called_once()
+        self.assertEqual(scraper.round_summary['管理员1']['following_count'], 3)
+
+    def test_iter_checks_checks_shared_account_once(self):
+        """测试顺序采集时多个管理员关注的账号只检查一次，每个管理员都会提醒"""
+        scraper = VintedScraper(Mock(), dict(self.config, delay_between_requests=0))
+        scraper._play_notification_sound = Mock()
+        inventory_callback = Mock()
+        scraper.set_callbacks(inventory_callback=inventory_callback)
+
+        def extract(admin_data):
+            return [
+                UserInfo(user_id, f"user{user_id}", f"https://www.vinted.nl/member/{user_id}",
+                         admin_name=admin_data['admin_name'])
+                for user_id in admin_data['ids']
+            ]
+
+        checked = []
+
+        def check(user):
+            checked.append(user.user_id)
+            user.status = "no_inventory"
+            return user
+
+        admin_urls = [
+            {'admin_name': '管理员1', 'url': 'url1', 'ids': ["1", "2"]},
+            {'admin_name': '管理员2', 'url': 'url2', 'ids': ["2", "3"]},
+        ]
+        with patch.object(scraper, '_extract_admin_users', side_effect=extract), \
+             patch.object(scraper, 'check_user_inventory', side_effect=check):
+            result = scraper.scrape_multiple_admins(admin_urls)
+
+        self.assertEqual(checked, ["1", "2", "3"])
+        self.assertEqual(len(result.users_without_inventory), 4)
+        self.assertEqual(inventory_callback.call_count, 4)
+        self.assertEqual(scraper.user_index.get_stats(), {'unique': 3, 'shared': 1, 'reused': 1})
+
+    def test_iter_checks_continues_after_user_failure(self):
+        """测试单个用户的检查或记录出错时记为出错，继续检查同一管理员的其余用户"""
+        def record(user):
+            if user.user_id == "0":
+                raise Exception("数据库已锁定")
+        store = Mock()
+        store.record.side_effect = record
+        scraper = VintedScraper(Mock(), dict(self.config, delay_between_requests=0), observation_store=store)
+        scraper._play_notification_sound = Mock()
+        users = [
+            UserInfo(str(i), f"user{i}", f"https://www.vinted.nl/member/{i}", admin_name='管理员1')
+            for i in range(4)
+        ]
+
+        def check(user):
+            user.status = "no_inventory"
+            return user
+
+        def checked_users(pending):
+            for user in pending:
+                if user.user_id == "1":
+                    raise Exception("标签页崩溃")
+                yield check(user)
+
+        admin_urls = [{'admin_name': '管理员1', 'url': 'url'}]
+        with patch.object(scraper, '_extract_admin_users', return_value=users), \
+             patch.object(scraper, '_iter_checked_users', side_effect=checked_users), \
+             patch.object(scraper, 'check_user_inventory', side_effect=check):
+            result = scraper.scrape_multiple_admins(admin_urls)
+
+        self.assertEqual(sorted(u.user_id for u in result.users_with_errors), ["0", "1"])
+        self.assertEqual(sorted(u.user_id for u in result.users_without_inventory), ["2", "3"])
+        self.assertEqual(result.users_with_errors[1].error_message, "标签页崩溃")
+        self.assertNotIn('error', result.admin_summary['管理员1'])
+
+    def _tab_driver(self, fail_url=None):
+        """模拟多标签页的WebDriver：记录每个标签页的地址，导航到fail_url时抛出异常"""
+        class FakeSwitchTo:
+            def __init__(self, driver):
+                self.driver = driver
+
+            def new_window(self, kind):
+                self.driver.handle_count += 1
+                self.driver.current_window_handle = f"tab-{self.driver.handle_count}"
+
+            def window(self, handle):
+                self.driver.current_window_handle = handle
+
+        driver = Mock()
+        driver.handle_count = 1
+        driver.current_window_handle = "tab-1"
+        driver.switch_to = FakeSwitchTo(driver)
+        urls = {}
+
+        def execute_script(script, *args):
+            if script.startswith("window.__vintedTabPending = true"):
+                if args[0] == fail_url:
+                    raise WebDriverException("标签页已崩溃")
+                urls[driver.current_window_handle] = args[0]
+                return None
+            if "location.href : null" in script:
+                return urls.get(driver.current_window_handle, "about:blank")
+            return True
+        driver.execute_script.side_effect = execute_script
+        return driver
+
+    def test_check_users_in_tabs_keeps_order(self):
+        """测试多标签页流水线按输入顺序返回结果"""
+        driver = self._tab_driver()
+        scraper = VintedScraper(driver, dict(self.config, tabs_per_window=3))
+        users = [
+            UserInfo(str(i), f"user{i}", f"https://www.vinted.nl/member/{i}")
+            for i in range(5)
+        ]
+
+        def parse(user, **kwargs):
+            user.status = "has_inventory"
+            return user
+
+        with patch.object(scraper, '_parse_inventory_page', side_effect=parse):
+            checked = list(scraper._iter_checked_users(users))
+
+        self.assertEqual([u.user_id for u in checked], ["0", "1", "2", "3", "4"])
+        self.assertTrue(all(u.status == "has_inventory" for u in checked))
+        navigated = [c.args[1] for c in driver.execute_script.call_args_list if len(c.args) == 2]
+        self.assertEqual(len(navigated), 5)
+        # 额外打开的两个标签页在结束后关闭
+        self.assertEqual(driver.close.call_count, 2)
+
+    def test_failed_tab_navigation_is_not_parsed(self):
+        """测试标签页导航失败时记为出错，不解析该标签页上一个用户的页面"""
+        driver = self._tab_driver(fail_url="https://www.vinted.nl/member/3")
+        scraper = VintedScraper(driver, dict(self.config, tabs_per_window=3))
+        users = [
+            UserInfo(str(i), f"user{i}", f"https://www.vinted.nl/member/{i}")
+            for i in range(6)
+        ]
+        parsed = []
+
+        def parse(user, **kwargs):
+            parsed.append(user.user_id)
+            user.status = "has_inventory"
+            return user
+
+        with patch.object(scraper, '_parse_inventory_page', side_effect=parse):
+            checked = list(scraper._iter_checked_users(users))
+
+        self.assertEqual([u.user_id for u in checked], ["0", "1", "2", "3", "4", "5"])
+        self.assertEqual(parsed, ["0", "1", "2", "4", "5"])
+        self.assertEqual(checked[3].status, "error")
+        self.assertEqual(checked[3].error_message, "无法访问用户商店页面")
+
+
+class TestPageReadiness(unittest.TestCase):
+    """页面就绪检测测试类"""
+
+    def setUp(self):
+        """测试前设置"""
+        self.driver = Mock()
+        self.readiness = PageReadiness(self.driver, {'readiness_poll_interval': 0.01})
+
+    def test_wait_for_selector_returns_first_match(self):
+        """测试返回首个出现的选择器"""
+        self.driver.find_elements.side_effect = lambda by, selector: [Mock()] if selector == ".b" else []
+
+        matched = self.readiness.wait_for_selector([".a", ".b"], timeout=1)
+
+        self.assertEqual(matched, ".b")
+        self.assertEqual(self.readiness.get_stats()['selector']['timeouts'], 0)
+
+    def test_wait_for_selector_timeout_is_recorded(self):
+        """测试超时被记录"""
+        self.driver.find_elements.return_value = []
+
+        matched = self.readiness.wait_for_selector([".a"], timeout=0.05)
+
+        self.assertIsNone(matched)
+        self.assertEqual(self.readiness.get_stats()['selector']['timeouts'], 1)
+
+    def test_wait_for_dom_quiet(self):
+        """测试DOM静止后结束等待"""
+        self.driver.execute_script.side_effect = [
+            {'dom_idle_ms': 50, 'network_idle_ms': 0},
+            {'dom_idle_ms': 400, 'network_idle_ms': 0},
+        ]
+
+        self.assertTrue(self.readiness.wait_for_dom_quiet(timeout=1))
+        self.assertEqual(self.driver.execute_script.call_count, 2)
+        self.assertEqual(self.readiness.timings[-1].signal, 'dom_quiet')
+
+
+class TestSelectorRegistry(unittest.TestCase):
+    """选择器注册表测试类"""
+
+    def setUp(self):
+        """测试前设置"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.stats_file = str(Path(self.temp_dir.name) / "selector_stats.json")
+        self.registry = SelectorRegistry(self.stats_file, demote_after=2)
+        self.selectors = ['.a', '.b', '.c']
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_converges_on_working_selector(self):
+        """测试一页之后优先尝试成功的选择器"""
+        self.registry.record_attempts('items', 'www.vinted.nl', ['.a', '.b', '.c'], '.c')
+
+        self.assertEqual(self.registry.order('items', 'www.vinted.nl', self.selectors), ['.c', '.a', '.b'])
+        # 其他域名不受影响
+        self.assertEqual(self.registry.order('items', 'www.vinted.fr', self.selectors), self.selectors)
+
+    def test_failing_selector_is_demoted(self):
+        """测试连续失败的选择器排到最后"""
+        for _ in range(2):
+            self.registry.record_attempts('items', 'www.vinted.nl', ['.a', '.b'], '.b')
+        self.registry.record('items', 'www.vinted.nl', '.b', False)
+
+        self.assertEqual(self.registry.order('items', 'www.vinted.nl', self.selectors), ['.b', '.c', '.a'])
+
+    def test_no_match_records_nothing(self):
+        """测试全部未命中（如空商店）时不计为失败"""
+        self.registry.record_attempts('items', 'www.vinted.nl', self.selectors, None)
+
+        self.assertEqual(self.registry.get_stats(), {})
+
+    def test_stats_are_persisted(self):
+        """测试统计数据保存后重新加载"""
+        self.registry.record_attempts('items', 'www.vinted.nl', ['.a', '.b'], '.b')
+        self.assertTrue(self.registry.save())
+
+        reloaded = SelectorRegistry(self.stats_file)
+        stats = reloaded.get_stats()['items@www.vinted.nl']
+        self.assertEqual(stats['preferred'], '.b')
+        self.assertEqual(stats['selectors']['.a']['misses'], 1)
+        self.assertEqual(stats['selectors']['.b']['hits'], 1)
+
+
+class TestObservationStore(unittest.TestCase):
+    """检查记录存储测试类"""
+
+    def setUp(self):
+        """测试前设置"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_file = str(Path(self.temp_dir.name) / "observations.db")
+        self.store = ObservationStore(self.db_file, batch_size=1000)
+
+    def tearDown(self):
+        self.store.close()
+        self.temp_dir.cleanup()
+
+    def _user(self, user_id, status, item_count=0):
+        user = UserInfo(user_id, f"user{user_id}", f"https://www.vinted.nl/member/{user_id}",
+                        admin_name="管理员1", admin_id="500", status=status, item_count=item_count)
+        user.check_duration = 1.5
+        return user
+
+    def test_uses_wal_mode(self):
+        """测试数据库使用WAL模式"""
+        mode = self.store._conn.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode.lower(), 'wal')
+
+    def test_records_are_batched(self):
+        """测试记录先缓存，flush时一次写入"""
+        self.store.start_round()
+        for i in range(50):
+            self.store.record(self._user(str(i), 'has_inventory', 3))
+
+        count = self.store._conn.execute("SELECT COUNT(*) FROM observations").fetchone()[0]
+        self.assertEqual(count, 0)
+
+        self.assertEqual(self.store.flush(), 50)
+        history = self.store.get_history('7')
+        self.assertEqual(len(history), 1)
+        self.assertEqual(history[0]['admin_id'], '500')
+        self.assertEqual(history[0]['item_count'], 3)
+        self.assertEqual(history[0]['duration'], 1.5)
+
+    def test_get_latest_excludes_current_round(self):
+        """测试获取上一轮的最新记录"""
+        self.store.start_round()
+        self.store.record(self._user('1', 'has_inventory', 2))
+        current = self.store.start_round()
+        self.store.record(self._user('1', 'no_inventory'))
+
+        latest = self.store.get_latest(exclude_round=current)
+        self.assertEqual(latest['1']['status'], 'has_inventory')
+        self.assertEqual(self.store.get_latest()['1']['status'], 'no_inventory')
+
+    def test_get_latest_by_admin(self):
+        """测试按管理员获取最新的有效记录"""
+        self.store.start_round()
+        self.store.record(self._user('1', 'no_inventory'))
+        other = self._user('1', 'has_inventory', 4)
+        other.admin_name, other.admin_id = "管理员2", "600"
+        self.store.record(other)
+        self.store.record(self._user('1', 'error'))
+
+        latest = {row['admin_id']: row['status'] for row in self.store.get_latest_by_admin()}
+        self.assertEqual(latest, {'500': 'no_inventory', '600': 'has_inventory'})
+
+    def test_scraper_records_checked_users(self):
+        """测试采集器归类结果时写入记录"""
+        scraper = VintedScraper(Mock(), {}, observation_store=self.store)
+        scraper._play_notification_sound = Mock()
+
+        scraper._handle_checked_user(self._user('9', 'no_inventory'), [], [], [])
+
+        self.assertEqual(self.store.get_history('9')[0]['status'], 'no_inventory')
+
+
+class TestRoundDiffEngine(unittest.TestCase):
+    """轮次对比引擎测试类"""
+
+    def setUp(self):
+        """测试前设置"""
+        self.engine = RoundDiffEngine()
+        self.admin = {'admin_name': '管理员1', 'user_id': '500'}
+
+    def _user(self, user_id, status="unknown"):
+        return UserInfo(user_id, f"user{user_id}", f"https://www.vinted.nl/member/{user_id}",
+                        admin_name="管理员1", admin_id="500", status=status)
+
+    def _run_round(self, statuses):
+        self.engine.begin_round()
+        events = []
+        for user_id in statuses:
+            events.append(self.engine.observe_follow(self._user(user_id)))
+        for user_id, status in statuses.items():
+            events.append(self.engine.observe(self._user(user_id, status)))
+        events.extend(self.engine.finish_round([self.admin]))
+        return [(e.kind, e.user_id) for e in events if e]
+
+    def test_first_round_has_no_events(self):
+        """测试第一轮没有可对比的状态"""
+        self.assertEqual(self._run_round({'1': 'has_inventory', '2': 'no_inventory'}), [])
+
+    def test_status_flips_and_follow_changes(self):
+        """测试库存翻转和关注变化事件"""
+        self._run_round({'1': 'has_inventory', '2': 'no_inventory', '3': 'has_inventory'})
+
+        events = self._run_round({'1': 'no_inventory', '2': 'has_inventory', '4': 'has_inventory'})
+
+        self.assertEqual(sorted(events), sorted([
+            (EVENT_NEW_FOLLOW, '4'),
+            (EVENT_WENT_EMPTY, '1'),
+            (EVENT_RESTOCKED, '2'),
+            (EVENT_UNFOLLOWED, '3'),
+        ]))
+
+    def test_error_keeps_previous_status(self):
+        """测试检查出错不改变已知状态"""
+        self._run_round({'1': 'no_inventory'})
+        self._run_round({'1': 'error'})
+
+        self.assertEqual(self._run_round({'1': 'has_inventory'}), [(EVENT_RESTOCKED, '1')])
+
+    def test_failed_admin_is_not_unfollowed(self):
+        """测试关注列表提取失败的管理员不产生取消关注事件"""
+        self._run_round({'1': 'has_inventory'})
+
+        self.engine.begin_round()
+        self.assertEqual(self.engine.finish_round([]), [])
+
+    def test_restocked_for_every_admin_following_account(self):
+        """测试多个管理员关注同一账号时每个管理员都收到补货事件"""
+        other = UserInfo('1', 'user1', 'https://www.vinted.nl/member/1',
+                         admin_name="管理员2", admin_id="600", status="no_inventory")
+        self.engine.observe(self._user('1', 'no_inventory'))
+        self.engine.observe(other)
+
+        first = self.engine.observe(self._user('1', 'has_inventory'))
+        other.status = "has_inventory"
+        second = self.engine.observe(other)
+
+        self.assertEqual((first.kind, first.admin_name), (EVENT_RESTOCKED, '管理员1'))
+        self.assertEqual((second.kind, second.admin_name), (EVENT_RESTOCKED, '管理员2'))
+
+    def test_seed_keeps_status_per_admin(self):
+        """测试从历史记录恢复时按管理员区分状态"""
+        self.engine.seed([
+            {'user_id': '1', 'admin_id': '500', 'admin_name': '管理员1', 'status': 'no_inventory'},
+            {'user_id': '1', 'admin_id': '600', 'admin_name': '管理员2', 'status': 'has_inventory'},
+        ])
+
+        restocked = self.engine.observe(self._user('1', 'has_inventory'))
+        unchanged = self.engine.observe(UserInfo('1', 'user1', 'https://www.vinted.nl/member/1',
+                                                 admin_name="管理员2", admin_id="600", status="has_inventory"))
+
+        self.assertEqual(restocked.kind, EVENT_RESTOCKED)
+        self.assertIsNone(unchanged)
+
+    def test_scraper_fires_restocked_callback(self):
+        """测试采集器在补货时调用补货回调"""
+        self.engine.observe(self._user('1', 'no_inventory'))
+        scraper = VintedScraper(Mock(), {}, diff_engine=self.engine)
+        restocked_callback = Mock()
+        scraper.set_callbacks(restocked_callback=restocked_callback)
+
+        scraper._handle_checked_user(self._user('1', 'has_inventory'), [], [], [])
+
+        restocked_callback.assert_called_once_with('user1', '管理员1', 'https://www.vinted.nl/member/1', '500')
+
+
+class TestRoundJournal(unittest.TestCase):
+    """轮次断点记录测试类"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.journal_file = str(Path(self.temp_dir.name) / "round_journal.jsonl")
+        self.admin_urls = [{'admin_name': '管理员1', 'url': 'https://www.vinted.nl/member/500/following'}]
+        self.extracted = 0
+        self.checked = []
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _users(self):
+        self.extracted += 1
+        return [
+            UserInfo(str(i), f"user{i}", f"https://www.vinted.nl/member/{i}", admin_name='管理员1')
+            for i in range(3)
+        ]
+
+    def _check(self, user):
+        user.status = "has_inventory"
+        self.checked.append(user.user_id)
+        return user
+
+    def _scraper(self, max_age=1800):
+        journal = RoundJournal(self.journal_file, max_age)
+        scraper = VintedScraper(Mock(), {'delay_between_requests': 0}, round_journal=journal)
+        scraper._extract_admin_users = lambda admin_data: self._users()
+        scraper.check_user_inventory = self._check
+        return scraper, journal
+
+    def _crash_after(self, count):
+        """检查count个用户后中断（不结束本轮）"""
+        scraper, journal = self._scraper()
+        results = scraper.iter_checks(self.admin_urls)
+        for _ in range(count):
+            next(results)
+        results.close()
+        journal.close()
+
+    def test_resume_from_first_unchecked_user(self):
+        """测试中断后从第一个未检查的用户继续"""
+        self._crash_after(2)
+        self.checked = []
+
+        scraper, journal = self._scraper()
+        result = scraper.scrape_multiple_admins(self.admin_urls)
+
+        self.assertEqual(self.extracted, 1)
+        self.assertEqual(self.checked, ["2"])
+        self.assertEqual(len(result.users_with_inventory), 3)
+        self.assertTrue(all(u.status == "has_inventory" for u in result.admin_summary['管理员1']['users']))
+
+        # 整轮完成后下一轮重新开始
+        self.checked = []
+        scraper.scrape_multiple_admins(self.admin_urls)
+        self.assertEqual(self.checked, ["0", "1", "2"])
+
+    def test_stale_journal_starts_over(self):
+        """测试超过有效期的记录不再继续"""
+        self._crash_after(2)
+        self.checked = []
+
+        scraper, journal = self._scraper(max_age=-1)
+        scraper.scrape_multiple_admins(self.admin_urls)
+
+        self.assertEqual(self.extracted, 2)
+        self.assertEqual(self.checked, ["0", "1", "2"])
+
+
+class TestAdaptiveRateLimiter(unittest.TestCase):
+    """自适应请求限速测试类"""
+
+    def test_additive_increase_multiplicative_decrease(self):
+        """测试正常时逐步提速，退避时速率减半"""
+        limiter = AdaptiveRateLimiter(initial_rate=1.0, min_rate=0.1, max_rate=2.0, increase=0.25, decrease=0.5)
+
+        for _ in range(10):
+            limiter.record(OUTCOME_OK)
+        self.assertEqual(limiter.rate, 2.0)
+
+        limiter.record(OUTCOME_CHALLENGE)
+        self.assertEqual(limiter.rate, 1.0)
+        for _ in range(10):
+            limiter.record(OUTCOME_ERROR)
+        self.assertEqual(limiter.rate, 0.1)
+
+        stats = limiter.get_stats()
+        self.assertEqual(stats['backoffs'], 11)
+        self.assertEqual(stats['max_rate'], 2.0)
+        self.assertEqual(stats['min_rate'], 0.1)
+
+    def test_shared_slots_are_spaced(self):
+        """测试多个线程共用时请求按当前速率依次间隔"""
+        limiter = AdaptiveRateLimiter(initial_rate=20.0, max_rate=20.0)
+        started = []
+        lock = threading.Lock()
+
+        def worker():
+            for _ in range(3):
+                limiter.acquire()
+                with lock:
+                    started.append(time.monotonic())
+
+        threads = [threading.Thread(target=worker) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        started.sort()
+        self.assertEqual(len(started), 9)
+        # 9次请求至少跨越8个间隔
+        self.assertGreaterEqual(started[-1] - started[0], 8 * 0.05 - 0.02)
+
+    def test_shared_limiter_follows_config_changes(self):
+        """测试同一域名共用限速器，配置变化后按新参数调整"""
+        domain = "config-test.vinted.nl"
+        limiter = get_rate_limiter(domain, {'delay_between_requests': 1})
+        limiter.record(OUTCOME_OK)
+
+        self.assertIs(get_rate_limiter(domain, {'delay_between_requests': 1}), limiter)
+        self.assertAlmostEqual(limiter.rate, 1.05)
+
+        self.assertIs(get_rate_limiter(domain, {'delay_between_requests': 2, 'rate_limit_max_rate': 3}), limiter)
+        self.assertAlmostEqual(limiter.rate, 0.5)
+        self.assertEqual(limiter.max_rate, 3)
+
+    def test_classify_outcome(self):
+        """测试按检查状态和耗时判断结果类型"""
+        self.assertEqual(classify_outcome("has_inventory", 1.0, 8), OUTCOME_OK)
+        self.assertEqual(classify_outcome("no_inventory", 9.0, 8), OUTCOME_SLOW)
+        self.assertEqual(classify_outcome("error", 0.5, 8), OUTCOME_ERROR)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """窗口熔断测试类"""
+
+    def test_cooldown_doubles_until_success(self):
+        """测试冷却结束后放行一次试探，试探失败时冷却时间加倍"""
+        breaker = CircuitBreaker(base_cooldown=0.05, max_cooldown=1.0)
+
+        breaker.trip("验证页面")
+        self.assertFalse(breaker.allow())
+        self.assertGreater(breaker.remaining(), 0)
+
+        time.sleep(0.06)
+        self.assertEqual(breaker.state, STATE_HALF_OPEN)
+        self.assertTrue(breaker.allow())
+
+        breaker.record_failure("验证页面")
+        self.assertEqual(breaker.state, STATE_OPEN)
+        self.assertGreater(breaker.remaining(), 0.06)
+
+        time.sleep(0.11)
+        breaker.record_success()
+        self.assertEqual(breaker.state, STATE_CLOSED)
+        self.assertEqual(breaker.get_stats()['trips'], 2)
+
+    def test_consecutive_errors_trip(self):
+        """测试连续错误页面达到阈值才断开"""
+        breaker = CircuitBreaker(base_cooldown=10, failure_threshold=3)
+
+        breaker.record_failure("HTTP 502")
+        breaker.record_failure("HTTP 502")
+        breaker.record_success()
+        breaker.record_failure("HTTP 502")
+        breaker.record_failure("HTTP 502")
+        self.assertTrue(breaker.allow())
+
+        breaker.record_failure("HTTP 502")
+        self.assertFalse(breaker.allow())
+
+    def test_half_open_allows_single_probe(self):
+        """测试半开状态只放行一次试探，试探成功后恢复"""
+        breaker = CircuitBreaker(base_cooldown=0.01)
+        breaker.trip("验证页面")
+        time.sleep(0.02)
+
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())
+
+        breaker.record_success()
+        self.assertTrue(breaker.allow())
+        self.assertTrue(breaker.allow())
+
+    def _half_open_scraper(self, config):
+        scraper = VintedScraper(Mock(), dict(config, delay_between_requests=0))
+        scraper.circuit_breaker.base_cooldown = 0.01
+        scraper.circuit_breaker.trip("验证页面")
+        time.sleep(0.02)
+        return scraper
+
+    def test_probe_error_reopens_breaker(self):
+        """测试试探时出现普通错误重新断开，不会一直停在半开状态"""
+        scraper = self._half_open_scraper({})
+        scraper._safe_get_page = Mock(return_value=False)
+        scraper.last_block_page = None
+
+        user = scraper.check_user_inventory(UserInfo("1", "user1", "https://www.vinted.nl/member/1"))
+
+        self.assertEqual(user.status, "error")
+        self.assertEqual(scraper.circuit_breaker.state, STATE_OPEN)
+
+    def test_api_check_closes_breaker(self):
+        """测试接口检查成功同样恢复窗口"""
+        scraper = self._half_open_scraper({'inventory_strategy': 'api'})
+
+        def via_api(user):
+            user.status = "no_inventory"
+            return user
+        scraper._check_inventory_via_api = via_api
+
+        scraper.check_user_inventory(UserInfo("1", "user1", "https://www.vinted.nl/member/1"))
+
+        self.assertEqual(scraper.circuit_breaker.state, STATE_CLOSED)
+
+
+class TestResourceBlocker(unittest.TestCase):
+    """精简模式资源拦截测试类"""
+
+    def setUp(self):
+        self.driver = Mock()
+        self.blocker = ResourceBlocker(self.driver, {'lean_mode': True, 'lean_mode_baseline_pages': 1})
+
+    def test_baseline_then_block(self):
+        """测试先采集基准页面，再为每个标签页开启一次拦截"""
+        self.driver.execute_script.side_effect = [
+            {'bytes': 100000, 'load_ms': 2000, 'blocked': 0},
+            {'bytes': 20000, 'load_ms': 500, 'blocked': 30},
+            {'bytes': 20000, 'load_ms': 500, 'blocked': 30},
+        ]
+
+        self.blocker.prepare()
+        self.driver.execute_cdp_cmd.assert_not_called()
+        self.blocker.record_page()
+
+        self.blocker.prepare()
+        self.blocker.prepare()
+        self.assertEqual(self.driver.execute_cdp_cmd.call_count, 2)
+        self.driver.execute_cdp_cmd.assert_called_with('Network.setBlockedURLs', {'urls': self.blocker.patterns})
+        self.blocker.record_page()
+        self.blocker.record_page()
+
+        stats = self.blocker.get_stats()
+        self.assertEqual(stats['baseline_pages'], 1)
+        self.assertEqual(stats['lean_pages'], 2)
+        self.assertEqual(stats['blocked_requests'], 60)
+        self.assertEqual(stats['saved_bytes'], 160000)
+        self.assertEqual(stats['saved_ms'], 3000)
+
+        self.driver.execute_cdp_cmd.reset_mock()
+        self.blocker.restore()
+        self.driver.execute_cdp_cmd.assert_any_call('Network.setBlockedURLs', {'urls': []})
+        self.blocker.restore()
+        self.assertEqual(self.driver.execute_cdp_cmd.call_count, 2)
+
+    def test_disabled_by_default(self):
+        """测试默认不拦截也不读取页面流量"""
+        blocker = ResourceBlocker(self.driver, {})
+        blocker.prepare()
+        blocker.record_page()
+        blocker.restore()
+        self.driver.execute_cdp_cmd.assert_not_called()
+        self.driver.execute_script.assert_not_called()
+
+
+class TestAlertSoundDispatcher(unittest.TestCase):
+    """提醒音效调度器测试类"""
+
+    def setUp(self):
+        self.release = threading.Event()
+        self.calls = []
+
+        def player():
+            self.calls.append(time.monotonic())
+            self.release.wait(5)
+
+        self.dispatcher = AlertSoundDispatcher(repeats=3, repeat_gap=0, coalesce_window=60,
+                                               max_queue=4, player=player)
+
+    def tearDown(self):
+        self.release.set()
+        self.dispatcher.close()
+
+    def test_burst_is_coalesced_and_non_blocking(self):
+        """测试连续的出库提醒立即返回，并合并为一次提醒节奏"""
+        started = time.monotonic()
+        self.dispatcher.play(SOUND_ALERT)
+        # 等待播放线程取走第一个请求并开始播放
+        while not self.calls and time.monotonic() - started < 5:
+            time.sleep(0.01)
+
+        results = [self.dispatcher.play(SOUND_ALERT) for _ in range(29)]
+        self.assertLess(time.monotonic() - started, 1)
+        # 播放期间队列已满的请求被丢弃
+        self.assertEqual(results.count(True), 4)
+        self.assertEqual(self.dispatcher.stats['dropped'], 25)
+
+        self.release.set()
+        self.dispatcher.close()
+        self.assertEqual(len(self.calls), 3)
+        self.assertEqual(self.dispatcher.stats['played'], 1)
+        self.assertEqual(self.dispatcher.stats['coalesced'], 4)
+
+    def test_configure_queue_size(self):
+        """测试按配置调整队列长度上限"""
+        self.dispatcher.configure(max_queue=2)
+        self.dispatcher._ensure_started = Mock()
+
+        results = [self.dispatcher.play(SOUND_ALERT) for _ in range(5)]
+
+        self.assertEqual(results.count(True), 2)
+        self.assertEqual(self.dispatcher.stats['dropped'], 3)
+
+    def test_success_sound_plays_once(self):
+        """测试成功提示只播放一次，且不占用出库提醒的合并窗口"""
+        self.release.set()
+        self.dispatcher.play(SOUND_SUCCESS)
+        self.dispatcher.close()
+        self.assertEqual(len(self.calls), 1)
+        self.assertIsNone(self.dispatcher._last_alert)
+
 
 class TestScrapingResult(unittest.TestCase):
     """采集结果测试类"""
@@ -225,5 +1124,209 @@ class TestScrapingResult(unittest.TestCase):
         self.assertEqual(result.scraping_time, 120.5)
 
 
+class TestScraperPool(unittest.TestCase):
+    """多窗口并行采集测试类"""
+
+    def setUp(self):
+        """测试前设置"""
+        self.config = {'delay_between_requests': 0}
+        self.scrapers = [VintedScraper(Mock(), self.config) for _ in range(3)]
+        self.pool = ScraperPool(self.scrapers, self.config)
+
+    def _fake_extract(self, admin_data):
+        users = []
+        for i in range(4):
+            user_id = f"{admin_data['user_id']}{i}"
+            users.append(UserInfo(
+                user_id=user_id,
+                username=f"user_{user_id}",
+                profile_url=f"https://www.vinted.nl/member/{user_id}",
+                admin_name=admin_data['admin_name'],
+                admin_id=admin_data['user_id']
+            ))
+        return users
+
+    def _fake_check(self, user):
+        user.status = "no_inventory" if user.user_id.endswith("0") else "has_inventory"
+        return user
+
+    def test_scrape_multiple_admins_merges_results(self):
+        """测试多个窗口的结果合并为一个ScrapingResult"""
+        admin_urls = [
+            {'admin_name': '管理员1', 'url': 'https://www.vinted.nl/member/general/following/1', 'user_id': '1'},
+            {'admin_name': '管理员2', 'url': 'https://www.vinted.nl/member/general/following/2', 'user_id': '2'}
+        ]
+        inventory_callback = Mock()
+        self.pool.set_callbacks(inventory_callback=inventory_callback)
+
+        used_scrapers = set()
+        for scraper in self.scrapers:
+            scraper._extract_admin_users = self._fake_extract
+            scraper._play_notification_sound = Mock()
+
+            def check(user, scraper=scraper):
+                used_scrapers.add(id(scraper))
+                return self._fake_check(user)
+            scraper.check_user_inventory = check
+
+        result = self.pool.scrape_multiple_admins(admin_urls)
+
+        self.assertEqual(result.total_users, 8)
+        self.assertEqual(len(result.users_with_inventory), 6)
+        self.assertEqual(len(result.users_without_inventory), 2)
+        self.assertEqual(list(result.admin_summary.keys()), ['管理员1', '管理员2'])
+        self.assertEqual(inventory_callback.call_count, 2)
+        self.assertGreaterEqual(len(used_scrapers), 1)
+
+    def test_shared_account_checked_once(self):
+        """测试多个管理员关注的账号只检查一次，结果归入每个管理员"""
+        admin_urls = [
+            {'admin_name': '管理员1', 'url': 'https://www.vinted.nl/member/general/following/1', 'user_id': '1'},
+            {'admin_name': '管理员2', 'url': 'https://www.vinted.nl/member/general/following/2', 'user_id': '2'}
+        ]
+        inventory_callback = Mock()
+        self.pool.set_callbacks(inventory_callback=inventory_callback)
+
+        def extract(admin_data):
+            # 两个管理员都关注了900和901
+            users = self._fake_extract(admin_data)
+            for user_id in ("900", "901"):
+                users.append(UserInfo(user_id, f"user_{user_id}", f"https://www.vinted.nl/member/{user_id}",
+                                      admin_name=admin_data['admin_name'], admin_id=admin_data['user_id']))
+            return users
+
+        checked = []
+        lock = threading.Lock()
+
+        def check(user):
+            with lock:
+                checked.append(user.user_id)
+            return self._fake_check(user)
+
+        for scraper in self.scrapers:
+            scraper._extract_admin_users = extract
+            scraper._play_notification_sound = Mock()
+            scraper.check_user_inventory = check
+
+        result = self.pool.scrape_multiple_admins(admin_urls)
+
+        self.assertEqual(checked.count("900"), 1)
+        self.assertEqual(checked.count("901"), 1)
+        self.assertEqual(len(checked), 10)
+        self.assertEqual(len(result.users_without_inventory), 4)
+        self.assertEqual(len(result.users_with_inventory), 8)
+        self.assertEqual(inventory_callback.call_count, 4)
+        for summary in result.admin_summary.values():
+            shared = [u for u in summary['users'] if u.user_id == "900"][0]
+            self.assertEqual(shared.status, "no_inventory")
+
+    def test_shared_account_rechecked_after_error(self):
+        """测试共享账号检查出错时由下一个管理员重新检查"""
+        admin_urls = [
+            {'admin_name': '管理员1', 'url': 'url1', 'user_id': '1'},
+            {'admin_name': '管理员2', 'url': 'url2', 'user_id': '2'}
+        ]
+        attempts = []
+
+        def extract(admin_data):
+            return [UserInfo("900", "user_900", "https://www.vinted.nl/member/900",
+                             admin_name=admin_data['admin_name'], admin_id=admin_data['user_id'])]
+
+        def check(user):
+            attempts.append(user.admin_name)
+            if len(attempts) == 1:
+                raise Exception("连接断开")
+            user.status = "has_inventory"
+            return user
+
+        for scraper in self.scrapers:
+            scraper._extract_admin_users = extract
+            scraper.check_user_inventory = check
+
+        result = self.pool.scrape_multiple_admins(admin_urls)
+
+        self.assertEqual(attempts, ['管理员1', '管理员2'])
+        self.assertEqual(len(result.users_with_errors), 1)
+        self.assertEqual(len(result.users_with_inventory), 1)
+
+    def test_blocked_window_reroutes_to_healthy_windows(self):
+        """测试被拦截的窗口暂停，任务转给其他窗口"""
+        admin_urls = [{'admin_name': '管理员1', 'url': 'url', 'user_id': '1'}]
+        blocked = self.scrapers[0]
+        blocked_checks = []
+
+        for scraper in self.scrapers:
+            scraper._extract_admin_users = self._fake_extract
+            scraper._play_notification_sound = Mock()
+            scraper._build_user_shop_url = lambda url: url
+            scraper._parse_inventory_page = lambda user, **kwargs: self._fake_check(user)
+            scraper._safe_get_page = Mock(return_value=True)
+        blocked._safe_get_page = Mock(return_value=False)
+        blocked.last_block_page = {'kind': 'challenge', 'reason': '#challenge-form', 'status': 403}
+
+        def track(user):
+            blocked_checks.append(user.user_id)
+            return VintedScraper.check_user_inventory(blocked, user)
+        blocked.check_user_inventory = track
+
+        result = self.pool.scrape_multiple_admins(admin_urls)
+
+        self.assertLessEqual(len(blocked_checks), 1)
+        self.assertEqual(len(result.users_with_errors), 0)
+        self.assertEqual(len(result.users_with_inventory) + len(result.users_without_inventory), 4)
+
+    def test_callbacks_run_outside_pool_lock(self):
+        """测试提醒回调在采集池的锁外执行"""
+        admin_urls = [{'admin_name': '管理员1', 'url': 'url', 'user_id': '1'}]
+        lock_held = []
+
+        def inventory_callback(*args):
+            lock_held.append(self.pool._lock.locked())
+        self.pool.set_callbacks(inventory_callback=inventory_callback)
+
+        for scraper in self.scrapers:
+            scraper._extract_admin_users = self._fake_extract
+            scraper._play_notification_sound = Mock()
+            scraper.check_user_inventory = lambda user: self._fake_check(user)
+        self.pool.scrapers = self.scrapers[:1]
+
+        self.pool.scrape_multiple_admins(admin_urls)
+
+        self.assertEqual(lock_held, [False])
+
+    def test_requeued_task_reaches_idle_window(self):
+        """测试队列暂时为空时空闲窗口不退出，转回队列的任务由其他窗口处理"""
+        task_queue = queue.Queue()
+        task_queue.put("first")
+        handled = []
+
+        def handler(scraper, task):
+            handled.append((task, scraper))
+            if task == "first":
+                # 其他窗口此时看到的是空队列；本窗口被拦截后把任务转回队列
+                time.sleep(0.3)
+                scraper.circuit_breaker.trip("验证页面")
+                task_queue.put("retry")
+
+        started = time.time()
+        self.pool._run_workers(task_queue, handler, "test-worker")
+
+        self.assertLess(time.time() - started, 5)
+        self.assertEqual([task for task, _ in handled], ["first", "retry"])
+        self.assertIsNot(handled[0][1], handled[1][1])
+
+    def test_check_error_is_recorded(self):
+        """测试单个用户检查异常时记录为错误"""
+        admin_urls = [{'admin_name': '管理员1', 'url': 'url', 'user_id': '1'}]
+        for scraper in self.scrapers:
+            scraper._extract_admin_users = self._fake_extract
+            scraper.check_user_inventory = Mock(side_effect=Exception("连接断开"))
+
+        result = self.pool.scrape_multiple_admins(admin_urls)
+
+        self.assertEqual(len(result.users_with_errors), 4)
+        self.assertEqual(result.users_with_errors[0].error_message, "连接断开")
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+浏览器内Vinted接口测试模块
+
+使用本地HTTP服务返回录制的接口JSON，模拟浏览器会话中的fetch()请求。
+"""
+
+import json
+import threading
+import unittest
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest.mock import Mock, patch
+import sys
+from pathlib import Path
+
+# 添加项目根目录到路径
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.core.vinted_api import InBrowserApiClient, VintedApiError
+from src.core.vinted_scraper import VintedScraper, UserInfo
+
+
+# 录制的接口返回
+RECORDED_RESPONSES = {
+    '/api/v2/wardrobe/111/items': {
+        'items': [
+            {'id': 1, 'title': 'Nike trui'},
+            {'id': 2, 'title': 'Levi 501'}
+        ],
+        'pagination': {'current_page': 1, 'total_pages': 4, 'total_entries': 37, 'per_page': 20}
+    },
+    '/api/v2/wardrobe/222/items': {
+        'items': [],
+        'pagination': {'current_page': 1, 'total_pages': 0, 'total_entries': 0, 'per_page': 20}
+    },
+    '/api/v2/users/500/followed_users?page=1&per_page=2': {
+        'users': [
+            {'id': 111, 'login': 'alice', 'profile_url': 'https://www.vinted.nl/member/111-alice'},
+            {'id': 222, 'login': 'bob', 'profile_url': 'https://www.vinted.nl/member/222-bob'}
+        ],
+        'pagination': {'current_page': 1, 'total_pages': 2, 'total_entries': 3, 'per_page': 2}
+    },
+    '/api/v2/users/500/followed_users?page=2&per_page=2': {
+        'users': [
+            {'id': 333, 'login': 'carol', 'profile_url': 'https://www.vinted.nl/member/333-carol'}
+        ],
+        'pagination': {'current_page': 2, 'total_pages': 2, 'total_entries': 3, 'per_page': 2}
+    }
+}
+
+
+class RecordedApiHandler(BaseHTTPRequestHandler):
+    """返回录制JSON的本地接口服务"""
+
+    def do_GET(self):
+        path = self.path if self.path in RECORDED_RESPONSES else self.path.split('?')[0]
+        self.server.requested_paths.append(self.path)
+        if path in RECORDED_RESPONSES:
+            body = json.dumps(RECORDED_RESPONSES[path]).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+        else:
+            body = b'<html>Not found</html>'
+            self.send_response(404)
+            self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FetchingDriver(Mock):
+    """在Python中执行fetch脚本的替身驱动"""
+
+    def execute_async_script(self, script, url, timeout_ms):
+        try:
+            with urllib.request.urlopen(url, timeout=timeout_ms / 1000) as response:
+                return {'ok': True, 'status': response.status, 'body': response.read().decode('utf-8')}
+        except urllib.error.HTTPError as e:
+            return {'ok': False, 'status': e.code, 'body': e.read().decode('utf-8')}
+        except Exception as e:
+            return {'ok': False, 'status': 0, 'error': str(e)}
+
+
+class TestInBrowserApiClient(unittest.TestCase):
+    """浏览器内接口客户端测试类"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = HTTPServer(('127.0.0.1', 0), RecordedApiHandler)
+        cls.server.requested_paths = []
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_port}"
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        """测试前设置"""
+        self.driver = FetchingDriver()
+        self.config = {'api_base_url': self.base_url, 'api_timeout': 5, 'delay_between_requests': 0}
+        self.server.requested_paths.clear()
+
+    def test_get_wardrobe_summary(self):
+        """测试读取商品总数和商品名称"""
+        client = InBrowserApiClient(self.driver, self.config)
+
+        summary = client.get_wardrobe_summary('111', 'https://www.vinted.nl/member/111')
+
+        self.assertEqual(summary['item_count'], 37)
+        self.assertEqual(summary['items'], ['Nike trui', 'Levi 501'])
+
+    def test_http_error_raises(self):
+        """测试接口返回错误状态码"""
+        client = InBrowserApiClient(self.driver, self.config)
+
+        with self.assertRaises(VintedApiError):
+            client.get_wardrobe_summary('999', 'https://www.vinted.nl/member/999')
+
+    def test_base_url_from_profile_url(self):
+        """测试未配置接口地址时使用主页域名"""
+        client = InBrowserApiClient(self.driver, {})
+
+        self.assertEqual(client.resolve_base_url('https://www.vinted.nl/member/111-abc'), 'https://www.vinted.nl')
+
+    def test_scraper_api_strategy(self):
+        """测试采集器使用接口模式判断库存，不打开页面"""
+        scraper = VintedScraper(self.driver, dict(self.config, inventory_strategy='api'))
+        with_items = UserInfo('111', 'alice', 'https://www.vinted.nl/member/111')
+        empty = UserInfo('222', 'bob', 'https://www.vinted.nl/member/222')
+
+        with patch.object(scraper, '_safe_get_page') as mock_get_page:
+            self.assertEqual(scraper.check_user_inventory(with_items).status, 'has_inventory')
+            self.assertEqual(scraper.check_user_inventory(empty).status, 'no_inventory')
+            mock_get_page.assert_not_called()
+
+        self.assertEqual(with_items.item_count, 37)
+
+    def test_scraper_api_strategy_falls_back_to_dom(self):
+        """测试接口失败时回退到页面检查"""
+        scraper = VintedScraper(self.driver, dict(self.config, inventory_strategy='api'))
+        user = UserInfo('999', 'carol', 'https://www.vinted.nl/member/999')
+
+        with patch.object(scraper, '_safe_get_page', return_value=True) as mock_get_page, \
+             patch.object(scraper, '_parse_inventory_page', side_effect=lambda u, **kwargs: u) as mock_parse:
+            scraper.check_user_inventory(user)
+
+        mock_get_page.assert_called_once_with('https://www.vinted.nl/member/999', 'shop')
+        mock_parse.assert_called_once()
+
+    def test_iter_following_pages(self):
+        """测试按页获取关注列表直到最后一页"""
+        client = InBrowserApiClient(self.driver, dict(self.config, api_following_per_page=2))
+
+        pages = list(client.iter_following_pages('500', 'https://www.vinted.nl/member/general/following/500'))
+
+        self.assertEqual([len(page) for page in pages], [2, 1])
+        self.assertEqual(pages[0][0], {
+            'user_id': '111',
+            'username': 'alice',
+            'profile_url': 'https://www.vinted.nl/member/111-alice'
+        })
+        self.assertEqual(len(self.server.requested_paths), 2)
+
+    def test_scraper_api_following_strategy(self):
+        """测试采集器通过接口提取关注列表，不渲染关注列表页面"""
+        config = dict(self.config, following_strategy='api', api_following_per_page=2)
+        scraper = VintedScraper(self.driver, config)
+
+        with patch.object(scraper, '_safe_get_page') as mock_get_page:
+            users = scraper.extract_following_users('https://www.vinted.nl/member/general/following/500?page=1')
+            mock_get_page.assert_not_called()
+
+        self.assertEqual([u.user_id for u in users], ['111', '222', '333'])
+        self.assertEqual(users[2].username, 'carol')
+
+    def test_scraper_api_following_falls_back_to_html(self):
+        """测试接口失败时回退到逐页解析关注列表"""
+        scraper = VintedScraper(self.driver, dict(self.config, following_strategy='api'))
+
+        with patch.object(scraper, '_safe_get_page', return_value=False) as mock_get_page:
+            users = scraper.extract_following_users('https://www.vinted.nl/member/general/following/999?page=1')
+
+        self.assertEqual(users, [])
+        mock_get_page.assert_called_once_with('https://www.vinted.nl/member/general/following/999?page=1', 'following')
+
+
+if __name__ == '__main__':
+    unittest.main()
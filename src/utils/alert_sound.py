@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+提醒音效模块
+
+所有提醒音效由一个独立线程播放：调用方只把请求放入有界队列，立即返回，
+采集线程不会因为播放声音而停顿。短时间内的多次出库提醒合并为一次提醒节奏。
+"""
+
+import os
+import queue
+import shutil
+import logging
+import platform
+import threading
+import subprocess
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+
+# 声音类型
+SOUND_ALERT = "alert"      # 出库/待补货提醒：连续播放几次
+SOUND_SUCCESS = "success"  # 操作成功提示：播放一次
+
+_STOP = object()
+
+
+def load_default_player() -> Optional[Callable[[], None]]:
+    """
+    按当前系统预先确定播放方式并加载音效（Windows读入内存）
+
+    Returns:
+        播放一次提示音的函数，系统不支持时返回None
+    """
+    system = platform.system()
+    if system == "Darwin":  # macOS
+        path = "/System/Library/Sounds/Sosumi.aiff"
+        if shutil.which("afplay") and os.path.exists(path):
+            return lambda: subprocess.run(["afplay", path], check=False,
+                                          stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    elif system == "Windows":
+        import winsound
+        wav = Path(os.environ.get("SystemRoot", r"C:\Windows")) / "Media" / "Windows Exclamation.wav"
+        if wav.exists():
+            data = wav.read_bytes()
+            return lambda: winsound.PlaySound(data, winsound.SND_MEMORY)
+        return lambda: winsound.Beep(1500, 300)  # 高频短促提示音
+    else:  # Linux
+        path = "/usr/share/sounds/alsa/Front_Left.wav"
+        if os.path.exists(path):
+            for command in ("paplay", "aplay"):
+                if shutil.which(command):
+                    return lambda command=command: subprocess.run([command, path], check=False,
+                                                                  stdout=subprocess.DEVNULL,
+                                                                  stderr=subprocess.DEVNULL)
+    return None
+
+
+class AlertSoundDispatcher:
+    """在独立线程中播放提醒音效的调度器"""
+
+    def __init__(self, repeats: int = 3, repeat_gap: float = 0.3, coalesce_window: float = 60.0,
+                 max_queue: int = 16, player: Callable[[], None] = None):
+        """
+        初始化音效调度器
+
+        Args:
+            repeats: 一次提醒节奏中提示音的播放次数
+            repeat_gap: 两次提示音之间的间隔（秒）
+            coalesce_window: 合并窗口（秒），窗口内的多次提醒只播放一次提醒节奏
+            max_queue: 队列长度上限，队列满时丢弃新请求
+            player: 播放一次提示音的函数，默认按系统自动选择
+        """
+        self.logger = logging.getLogger(__name__)
+        self.repeats = max(1, repeats)
+        self.repeat_gap = repeat_gap
+        self.coalesce_window = coalesce_window
+
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, max_queue))
+        self._player = player
+        self._player_loaded = player is not None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._last_alert: Optional[float] = None
+        self.stats: Dict[str, int] = {'played': 0, 'coalesced': 0, 'dropped': 0}
+
+    def configure(self, repeats: int = None, repeat_gap: float = None, coalesce_window: float = None,
+                  max_queue: int = None):
+        """
+        修改提醒节奏设置
+
+        Args:
+            repeats: 一次提醒节奏中提示音的播放次数
+            repeat_gap: 两次提示音之间的间隔（秒）
+            coalesce_window: 合并窗口（秒）
+            max_queue: 队列长度上限
+        """
+        if repeats is not None:
+            self.repeats = max(1, repeats)
+        if repeat_gap is not None:
+            self.repeat_gap = repeat_gap
+        if coalesce_window is not None:
+            self.coalesce_window = coalesce_window
+        if max_queue is not None:
+            with self._queue.mutex:
+                self._queue.maxsize = max(1, max_queue)
+
+    def play(self, kind: str = SOUND_ALERT) -> bool:
+        """
+        请求播放音效，立即返回
+
+        Args:
+            kind: 声音类型（SOUND_ALERT/SOUND_SUCCESS）
+
+        Returns:
+            是否已加入播放队列（队列满时丢弃）
+        """
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(kind)
+            return True
+        except queue.Full:
+            with self._lock:
+                self.stats['dropped'] += 1
+            return False
+
+    def _ensure_started(self):
+        """首次请求时启动播放线程"""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="alert-sound", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        """播放线程：合并积压的请求后播放"""
+        if not self._player_loaded:
+            # 在播放线程中加载音效，调用方不需要等待
+            try:
+                self._player = load_default_player()
+            except Exception as e:
+                self.logger.debug(f"加载提示音失败: {str(e)}")
+            self._player_loaded = True
+
+        while True:
+            kinds = [self._queue.get()]
+            # 一次取出所有积压的请求
+            while True:
+                try:
+                    kinds.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = any(kind is _STOP for kind in kinds)
+            alerts = sum(1 for kind in kinds if kind == SOUND_ALERT)
+            if alerts:
+                self._play_alert(alerts)
+            elif any(kind == SOUND_SUCCESS for kind in kinds):
+                self._play_times(1)
+            if stop:
+                return
+
+    def _play_alert(self, requests: int):
+        """播放一次提醒节奏；合并窗口内已播放过时只计数"""
+        now = time.monotonic()
+        with self._lock:
+            if self._last_alert is not None and now - self._last_alert < self.coalesce_window:
+                self.stats['coalesced'] += requests
+                return
+            self._last_alert = now
+            self.stats['coalesced'] += requests - 1
+
+        self._play_times(self.repeats)
+
+    def _play_times(self, times: int):
+        """连续播放几次提示音"""
+        if self._player is None:
+            return
+        for i in range(times):
+            try:
+                self._player()
+            except Exception as e:
+                self.logger.debug(f"播放提示音失败: {str(e)}")
+                return
+            if i < times - 1:
+                time.sleep(self.repeat_gap)
+        with self._lock:
+            self.stats['played'] += 1
+
+    def close(self, timeout: float = 2.0):
+        """
+        停止播放线程（等待正在播放的声音结束）
+
+        Args:
+            timeout: 最长等待时间（秒）
+        """
+        with self._lock:
+            thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            return
+        thread.join(timeout)
+
+
+_dispatcher: Optional[AlertSoundDispatcher] = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_alert_dispatcher() -> AlertSoundDispatcher:
+    """
+    获取全局共享的音效调度器（采集器和界面共用，提醒统一合并）
+
+    Returns:
+        音效调度器
+    """
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = AlertSoundDispatcher()
+        return _dispatcher
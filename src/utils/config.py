@@ -41,17 +41,49 @@ class ConfigManager:
                 "api_url": "http://127.0.0.1:54345",
                 "window_name": "vinted_inventory_script",
                 "timeout": 30,
-                "retry_count": 3
+                "retry_count": 3,
+                "startup_timeout": 20,
+                "max_parallel_startup": 10,
+                "list_cache_ttl": 30,
+                "driver_backend": "chromedriver",
+                "page_load_strategy": "eager"
             },
             "vinted": {
                 "base_url": "https://www.vinted.nl",
                 "page_load_timeout": 15,
                 "element_wait_timeout": 10,
-                "scroll_pause_time": 2
+                "scroll_pause_time": 2,
+                "network_idle_timeout": 5,
+                "dom_quiet_timeout": 3,
+                "extraction_mode": "script",
+                "inventory_strategy": "dom",
+                "following_strategy": "html",
+                "api_timeout": 10,
+                "api_following_per_page": 100,
+                "selector_demote_after": 3,
+                "observation_store_enabled": True,
+                "observation_batch_size": 500,
+                "round_journal_enabled": True,
+                "round_journal_max_age_minutes": 30,
+                "block_detection": True,
+                "block_cooldown_seconds": 60,
+                "block_max_cooldown_seconds": 900,
+                "block_failure_threshold": 3,
+                "lean_mode": False,
+                "lean_mode_baseline_pages": 2,
+                "lean_mode_blocked_urls": [],
+                "navigation_timeouts": {}
             },
             "scraping": {
                 "max_concurrent_requests": 3,
+                "tabs_per_window": 1,
                 "delay_between_requests": 1,
+                "adaptive_rate_limit": True,
+                "rate_limit_min_rate": 0.1,
+                "rate_limit_max_rate": 5.0,
+                "rate_limit_increase": 0.05,
+                "rate_limit_decrease": 0.5,
+                "rate_limit_slow_seconds": 8,
                 "max_retries": 3,
                 "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
             },
@@ -68,7 +100,11 @@ class ConfigManager:
             },
             "ui": {
                 "window_size": "900x1000",
-                "theme": "default"
+                "theme": "default",
+                "alert_repeats": 3,
+                "alert_repeat_gap": 0.3,
+                "alert_coalesce_seconds": 60,
+                "alert_max_queue": 16
             }
         }
     
@@ -285,6 +285,38 @@ def build_next_page_url(url: str) -> str:
         return url
 
 
+def is_same_page(current_url: str, target_url: str) -> bool:
+    """
+    判断浏览器当前地址是否已是目标页面（允许重定向补全路径，如 /member/123 -> /member/123-name）
+
+    Args:
+        current_url: 浏览器当前地址
+        target_url: 导航的目标地址
+
+    Returns:
+        是否为同一页面
+    """
+    try:
+        current = urllib.parse.urlparse(current_url)
+        target = urllib.parse.urlparse(target_url)
+        if current.netloc != target.netloc:
+            return False
+
+        current_path = current.path.rstrip('/')
+        target_path = target.path.rstrip('/')
+        if current_path != target_path:
+            shorter, longer = sorted((current_path, target_path), key=len)
+            if not shorter or not longer.startswith(shorter) or longer[len(shorter)] not in '-/':
+                return False
+
+        # 目标地址的查询参数（如分页page）必须都在当前地址中
+        current_query = urllib.parse.parse_qs(current.query)
+        target_query = urllib.parse.parse_qs(target.query)
+        return all(current_query.get(key) == value for key, value in target_query.items())
+    except Exception:
+        return False
+
+
 def clean_text(text: str) -> str:
     """
     清理文本，移除多余的空白字符